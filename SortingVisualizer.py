@@ -1,34 +1,167 @@
-import matplotlib
-import platform
 import os
-
-# Set appropriate backend based on operating system
-if platform.system() == 'Darwin':  # macOS
-    matplotlib.use('MacOSX')
-elif platform.system() == 'Windows':  # Windows
-    matplotlib.use('TkAgg')
-elif platform.system() == 'Linux':  # Linux
-    matplotlib.use('TkAgg')
-else:
-    # Let matplotlib choose the best backend
-    pass
-
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
+import sys
+import csv
+import json
 import random
+import struct
+import string
 import time
-from typing import List, Tuple, Generator, Optional
+from array import array
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import accumulate, islice
+from typing import (TYPE_CHECKING, Callable, Iterable, Iterator, List, MutableSequence, NamedTuple, Tuple,
+                    Generator, Optional)
 import math
 
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
 # --- Constants ---
 BAR_COLOR_NORMAL = '#00FF00'      # Green bars
 BAR_COLOR_SELECTED = '#000000'    # Black for selected bars
 BACKGROUND_COLOR = '#000000'      # Black background
 FIGURE_SIZE = (16, 8)
+DEFAULT_KEYFRAME_INTERVAL = 4096  # Operations between full array snapshots in a trace
+RASTER_THRESHOLD = 1000  # Above this many elements, draw one image instead of one bar each
+KEYFRAME_MEMORY_BUDGET = 64 * 1024 * 1024  # Bytes of snapshots per trace before spacing widens
+TRACE_PROGRESS_INTERVAL = 1 << 16  # Operations between progress reports while recording
+TRACE_CACHE_MAX_BYTES = 1 << 30  # Disk space the trace cache may use before evicting old traces
+PARALLEL_RECORDING_MIN_SIZE = 256  # Below this, recording in-process beats starting workers
+STREAM_CHUNK_SIZE = 1024  # Operations per hand-off from a streaming producer
+STREAM_QUEUE_CHUNKS = 64  # Chunks a producer may run ahead before it blocks
+STREAM_OPS_PER_BAR = 20  # Default streaming rate, in operations per second per bar
+PARALLEL_SAMPLE_OVERSAMPLING = 32  # Sample sort draws this many candidates per splitter
+EXTERNAL_MEMORY_BUDGET = 256 * 1024 * 1024  # Default bytes an external sort may hold in memory
+EXTERNAL_BYTES_PER_VALUE = 48  # Rough memory cost of one integer while a chunk is sorted
+EXTERNAL_BUFFER_VALUES = 1 << 13  # Values per buffered read or write while merging runs
+EXTERNAL_SECONDS_PER_PASS = 2  # Default streaming pace for an external sort's view
+NUMPY_RADIX = 1 << 8  # Values per digit of the NumPy radix sort
+NUMPY_COUNTING_RANGE_FACTOR = 4  # NumPy counting sort accepts value ranges up to this many times n
+NUMPY_BUCKET_SIZE = 1024  # Target elements per bucket of the NumPy bucket sort
+TIMSORT_MIN_GALLOP = 7  # Consecutive wins before a Timsort merge starts galloping
+INTROSORT_CUTOFF = 16  # Introsort insertion-sorts ranges this small
+PDQSORT_CUTOFF = 24  # pdqsort insertion-sorts ranges smaller than this
+PDQSORT_NINTHER_THRESHOLD = 128  # pdqsort uses a ninther pivot above this size
+PDQSORT_PARTIAL_LIMIT = 8  # Elements pdqsort's optimistic insertion sort may move before giving up
+SELECTION_K_DIVISOR = 10  # Top-k and partial sort gather the smallest n / this elements
+SORTEDNESS_EXACT_MAX = 64  # Arrays up to this size track every inversion exactly
+SORTEDNESS_SAMPLE_STRIDES = (0.6180339887, 0.4142135624)  # Multipliers (x n) of the sampled pair permutations
+BATCH_NETWORK_MAX_WIDTH = 256  # Widest rows sort_rows sorts with a sorting network by default
+BATCH_BLOCK_ROWS = 4096  # Rows sort_rows sorts together in one block
+TIMING_REPEATS = 5                # Timed runs per measurement (winner decision and benchmarks)
+TIMING_WARMUP = 1                 # Untimed runs before timing starts
+MEMORY_REGRESSION_TOLERANCE = 0.10  # Peak memory growth over a baseline that counts as a regression
+MEMORY_REGRESSION_SLACK = 4096      # Bytes of growth always tolerated, for allocator noise on small inputs
+AUTO_SAMPLE_SIZE = 256  # Most neighbourhoods and pairs the auto selector probes (2√n on smaller inputs)
+AUTO_INSERTION_MAX = 16  # Auto picks Insertion Sort for inputs this small
+AUTO_NEARLY_SORTED_MAX = 4096  # Largest input Auto insertion-sorts when the sample finds no disorder
+AUTO_MAX_RUNS = 16  # Auto picks Tim Sort when it estimates at most this many monotone runs
+AUTO_DUPLICATE_RATIO = 0.5  # Share of repeated sampled values above which Auto picks pdqsort
+AUTO_DENSE_RANGE_FACTOR = 4  # Integer ranges up to this many times n count as dense (Bucket Sort)
+AUTO_PRESORTED_INVERSIONS = 0.05  # Sampled inversion share below which Auto picks pdqsort
+AUTO_FIXED_CHOICE = '13'  # Algorithm the selector benchmark compares Auto against by default
+
+ALGORITHM_NAMES = {
+    '1': 'Bubble Sort',
+    '2': 'Selection Sort',
+    '3': 'Insertion Sort',
+    '4': 'Quick Sort',
+    '5': 'Heap Sort',
+    '6': 'Shell Sort',
+    '7': 'Comb Sort',
+    '8': 'Radix Sort',
+    '9': 'Bucket Sort',
+    '10': 'Bogo Sort',
+    '11': 'Merge Sort',
+    '12': 'Tim Sort',
+    '13': 'Intro Sort',
+    '14': 'PDQ Sort',
+    '15': 'Quickselect',
+    '16': 'Heap Top-K',
+    '17': 'Partial Sort',
+}
+
+# Algorithms that order only part of their output (see selection_k)
+SELECTION_ALGORITHMS = ('15', '16', '17')
+BOUNDED_ALGORITHMS = ('10',)  # Give up after a fixed number of tries, so they may return unsorted
+AUTO_CHOICE = 'auto'  # Menu and command-line token that lets select_algorithm pick per input
+
+# Average-case complexity as listed in the README, for comparison with fitted exponents
+ALGORITHM_COMPLEXITY = {
+    '1': 'O(n²)',
+    '2': 'O(n²)',
+    '3': 'O(n²)',
+    '4': 'O(n log n)',
+    '5': 'O(n log n)',
+    '6': 'O(n^1.25)',
+    '7': 'O(n²)',
+    '8': 'O(nk)',
+    '9': 'O(n+k)',
+    '10': 'O((n+1)!)',
+    '11': 'O(n log n)',
+    '12': 'O(n log n)',
+    '13': 'O(n log n)',
+    '14': 'O(n log n)',
+    '15': 'O(n)',
+    '16': 'O(n log k)',
+    '17': 'O(n + k log k)',
+}
+
+# Auxiliary space, as claimed in the README's Space column
+ALGORITHM_SPACE = {
+    '1': 'O(1)',
+    '2': 'O(1)',
+    '3': 'O(1)',
+    '4': 'O(log n)',
+    '5': 'O(1)',
+    '6': 'O(1)',
+    '7': 'O(1)',
+    '8': 'O(n+k)',
+    '9': 'O(n)',
+    '10': 'O(1)',
+    '11': 'O(n)',
+    '12': 'O(n)',
+    '13': 'O(log n)',
+    '14': 'O(log n)',
+    '15': 'O(1)',
+    '16': 'O(1)',
+    '17': 'O(1)',
+}
+
+# Input distributions for the visualizer and benchmark (see generate_workload)
+WORKLOAD_NAMES = {
+    'random': 'Uniform shuffle of 1..n',
+    'sorted': 'Already sorted',
+    'reversed': 'Sorted in reverse',
+    'k-sorted': 'Nearly sorted: every element within √n places of its spot',
+    'organ-pipe': 'Ascending then descending',
+    'sawtooth': 'Repeated ascending runs of length √n',
+    'few-unique': 'Eight distinct values',
+    'zipf': 'Zipf-distributed duplicates (a few values dominate)',
+    'quick-killer': 'Adversarial input that makes Quick Sort quadratic',
+}
+# Workloads that draw no random numbers, so the same n always gives the same input
+SEEDLESS_WORKLOADS = ('sorted', 'reversed', 'organ-pipe', 'sawtooth', 'quick-killer')
+# What sweeps over every distribution run; quick-killer costs a quadratic sort to build, so only by name
+SWEEP_WORKLOADS = tuple(kind for kind in WORKLOAD_NAMES if kind != 'quick-killer')
+
+# --- Operation Codes ---
+OP_COMPARE = 0  # (OP_COMPARE, i, j): one key comparison of elements i and j
+OP_SWAP = 1     # (OP_SWAP, i, j): exchange elements i and j
+OP_WRITE = 2    # (OP_WRITE, i, value): store value at index i
+OP_READ = 3     # (OP_READ, i, j): highlight i (and j unless -1) without comparing
+
+# Meta operations carry counters only; they are tallied but never become frames
+OP_META = 8             # First meta op code
+OP_META_COMPARES = 8    # (OP_META_COMPARES, count, 0): comparisons made off the array
+OP_META_ALLOC = 9       # (OP_META_ALLOC, delta, 0): auxiliary elements allocated (<0 frees)
+OP_META_DEPTH = 10      # (OP_META_DEPTH, depth, 0): current recursion depth
 
 # --- Type Definitions ---
-FrameData = Tuple[List[int], int, int]  # (array, index1, index2)
-AlgorithmGenerator = Generator[FrameData, None, None]
+FrameData = Tuple[MutableSequence[int], int, int]  # (array, index1, index2)
+Operation = Tuple[int, int, int]        # (op_code, index1, index2 or value)
+AlgorithmGenerator = Generator[Operation, None, None]
 
 def get_user_input():
     """Get user input for number of bars and algorithm selection."""
@@ -38,11 +171,11 @@ def get_user_input():
     # Get number of bars
     while True:
         try:
-            n = int(input("Enter number of bars (10-1000): "))
-            if 10 <= n <= 1000:
+            n = int(input("Enter number of bars (10-1000000): "))
+            if 10 <= n <= 1000000:
                 break
             else:
-                print("❌ Please enter a number between 10 and 1000.")
+                print("❌ Please enter a number between 10 and 1000000.")
         except ValueError:
             print("❌ Please enter a valid number.")
         except KeyboardInterrupt:
@@ -50,29 +183,22 @@ def get_user_input():
             exit()
     
     print(f"✅ Will create {n} bars with heights from 1 to {n}")
+    if n > RASTER_THRESHOLD:
+        print(f"🖼️ Above {RASTER_THRESHOLD} bars the array is drawn as a single image; "
+              f"O(n²) algorithms will take a long time to record")
     return n
 
 def get_algorithm_selection():
     """Get user selection for two algorithms to compare."""
-    algorithms = {
-        '1': 'Bubble Sort',
-        '2': 'Selection Sort', 
-        '3': 'Insertion Sort',
-        '4': 'Quick Sort',
-        '5': 'Heap Sort',
-        '6': 'Shell Sort',
-        '7': 'Comb Sort',
-        '8': 'Radix Sort',
-        '9': 'Bucket Sort',
-        '10': 'Bogo Sort',
-        '11': 'Merge Sort',
-    }
+    algorithms = dict(ALGORITHM_NAMES)
     
     print("\n📊 Available sorting algorithms:")
     print()
     
     for key, name in algorithms.items():
         print(f"  {key:2}. {name}")
+    print(f"  {AUTO_CHOICE}: pick the algorithm that suits the input")
+    algorithms[AUTO_CHOICE] = 'Auto'
     
     print()
     print("Select TWO algorithms to compare:")
@@ -80,12 +206,12 @@ def get_algorithm_selection():
     # Get first algorithm
     while True:
         try:
-            choice1 = input("First algorithm (1-11): ").strip()
+            choice1 = input(f"First algorithm (1-{len(algorithms) - 1} or {AUTO_CHOICE}): ").strip().lower()
             if choice1 in algorithms:
                 first_algo = choice1
                 break
             else:
-                print("❌ Invalid choice. Please select 1-11.")
+                print(f"❌ Invalid choice. Please select 1-{len(algorithms) - 1} or {AUTO_CHOICE}.")
         except KeyboardInterrupt:
             print("\n👋 Goodbye!")
             exit()
@@ -93,14 +219,14 @@ def get_algorithm_selection():
     # Get second algorithm
     while True:
         try:
-            choice2 = input("Second algorithm (1-11): ").strip()
+            choice2 = input(f"Second algorithm (1-{len(algorithms) - 1} or {AUTO_CHOICE}): ").strip().lower()
             if choice2 in algorithms and choice2 != choice1:
                 second_algo = choice2
                 break
             elif choice2 == choice1:
                 print("❌ Please select a different algorithm for comparison.")
             else:
-                print("❌ Invalid choice. Please select 1-11.")
+                print(f"❌ Invalid choice. Please select 1-{len(algorithms) - 1} or {AUTO_CHOICE}.")
         except KeyboardInterrupt:
             print("\n👋 Goodbye!")
             exit()
@@ -111,147 +237,493 @@ def get_algorithm_selection():
     
     return first_algo, second_algo, algorithms
 
+def get_workload_selection() -> str:
+    """Ask which input distribution to sort; Enter keeps the uniform shuffle."""
+    workloads = list(WORKLOAD_NAMES)
+    
+    print("\n🎲 Input distributions:")
+    print()
+    for number, kind in enumerate(workloads, 1):
+        print(f"  {number:2}. {kind:<13} {WORKLOAD_NAMES[kind]}")
+    print()
+    
+    while True:
+        try:
+            choice = input(f"Input distribution (1-{len(workloads)}, Enter for random): ").strip()
+            if not choice:
+                return 'random'
+            if choice in WORKLOAD_NAMES:
+                return choice
+            if choice.isdigit() and 1 <= int(choice) <= len(workloads):
+                return workloads[int(choice) - 1]
+            print(f"❌ Invalid choice. Please select 1-{len(workloads)}.")
+        except KeyboardInterrupt:
+            print("\n👋 Goodbye!")
+            exit()
+
 # --- Sorting Algorithm Classes ---
 
+_NATIVE_BYTE_ORDER = '@=' + ('<' if sys.byteorder == 'little' else '>')
+
+
+def _buffer_typecode(arr) -> Optional[str]:
+    """``array`` type code of a one-dimensional native integer buffer, or None for lists and the rest."""
+    if isinstance(arr, list):
+        return None
+    if isinstance(arr, array):
+        return arr.typecode
+    try:
+        view = memoryview(arr)
+    except TypeError:
+        return None
+    typecode = view.format[1:] if view.format[:1] in _NATIVE_BYTE_ORDER else view.format
+    return typecode if view.ndim == 1 and typecode in 'bBhHiIlLqQ' else None
+
+
+def _working_copy(arr):
+    """Private copy of ``arr`` for an algorithm to sort, keeping typed inputs unboxed.
+    
+    Lists (and other iterables) become lists. ``array.array`` inputs are
+    copied as arrays of the same type, and any other one-dimensional integer
+    buffer, such as a NumPy array, is copied through the buffer protocol into
+    the matching ``array`` type: 1-8 bytes per element instead of a pointer
+    plus a boxed int.
+    """
+    typecode = _buffer_typecode(arr)
+    if typecode is None:
+        return list(arr)
+    if isinstance(arr, array):
+        return arr[:]
+    view = memoryview(arr)
+    copy = array(typecode)
+    copy.frombytes(view.cast('B') if view.c_contiguous else view.tobytes())
+    return copy
+
+
+def _same_kind(result, original):
+    """``result`` in the container type of ``original``, as the uninstrumented sorts return it.
+    
+    Typed inputs come back as arrays of the same type, and NumPy inputs as
+    NumPy arrays sharing the result's buffer.
+    """
+    typecode = _buffer_typecode(original)
+    if typecode is None:
+        return result
+    if not isinstance(result, array):
+        result = array(typecode, result)
+    if hasattr(original, 'dtype'):
+        import numpy as np
+        
+        return np.frombuffer(result, dtype=original.dtype)
+    return result
+
+
+def _count_sort_comparisons(values: list) -> int:
+    """Sort ``values`` in place with ``list.sort`` and return the comparisons it made."""
+    comparisons = 0
+    
+    class CountingKey:
+        __slots__ = ('value',)
+        
+        def __init__(self, value):
+            self.value = value
+        
+        def __lt__(self, other):
+            nonlocal comparisons
+            comparisons += 1
+            return self.value < other.value
+    
+    values.sort(key=CountingKey)
+    return comparisons
+
+
+def _insertion_sort_range_ops(a: List[int], lo: int, hi: int) -> AlgorithmGenerator:
+    """Insertion sort ``a[lo:hi]`` in place, yielding operations (hybrid sorts' small-range cutoff)."""
+    for i in range(lo + 1, hi):
+        key = a[i]
+        j = i - 1
+        while j >= lo:
+            yield OP_COMPARE, j, i
+            if a[j] > key:
+                a[j + 1] = a[j]
+                yield OP_WRITE, j + 1, a[j]
+                j -= 1
+            else:
+                break
+        if j + 1 != i:
+            a[j + 1] = key
+            yield OP_WRITE, j + 1, key
+
+
+def _heap_sort_range_ops(a: List[int], lo: int, hi: int) -> AlgorithmGenerator:
+    """Heap sort ``a[lo:hi]`` in place, yielding operations (hybrid sorts' worst-case fallback)."""
+    n = hi - lo
+    
+    def sift_down(root, size):
+        while True:
+            largest = root
+            left = 2 * root + 1
+            right = left + 1
+            if left < size:
+                yield OP_COMPARE, lo + left, lo + largest
+                if a[lo + left] > a[lo + largest]:
+                    largest = left
+            if right < size:
+                yield OP_COMPARE, lo + right, lo + largest
+                if a[lo + right] > a[lo + largest]:
+                    largest = right
+            if largest == root:
+                return
+            a[lo + root], a[lo + largest] = a[lo + largest], a[lo + root]
+            yield OP_SWAP, lo + root, lo + largest
+            root = largest
+    
+    for root in range(n // 2 - 1, -1, -1):
+        yield from sift_down(root, n)
+    for end in range(n - 1, 0, -1):
+        a[lo], a[lo + end] = a[lo + end], a[lo]
+        yield OP_SWAP, lo, lo + end
+        yield from sift_down(0, end)
+
+
+def _insertion_sort_range(a: List[int], lo: int, hi: int) -> None:
+    """Uninstrumented ``_insertion_sort_range_ops``."""
+    for i in range(lo + 1, hi):
+        key = a[i]
+        j = i - 1
+        while j >= lo and a[j] > key:
+            a[j + 1] = a[j]
+            j -= 1
+        a[j + 1] = key
+
+
+def _heap_sort_range(a: List[int], lo: int, hi: int) -> None:
+    """Uninstrumented ``_heap_sort_range_ops``."""
+    n = hi - lo
+    
+    def sift_down(root, size):
+        while True:
+            largest = root
+            left = 2 * root + 1
+            right = left + 1
+            if left < size and a[lo + left] > a[lo + largest]:
+                largest = left
+            if right < size and a[lo + right] > a[lo + largest]:
+                largest = right
+            if largest == root:
+                return
+            a[lo + root], a[lo + largest] = a[lo + largest], a[lo + root]
+            root = largest
+    
+    for root in range(n // 2 - 1, -1, -1):
+        sift_down(root, n)
+    for end in range(n - 1, 0, -1):
+        a[lo], a[lo + end] = a[lo + end], a[lo]
+        sift_down(0, end)
+
+
+def _heapify_ops(array: List[int], n: int, i: int) -> AlgorithmGenerator:
+    """Sift ``array[i]`` down the max-heap ``array[:n]``, yielding operations."""
+    # Sift down in a loop; ``depth`` is the level the recursive form would reach
+    depth = 1
+    while True:
+        yield OP_META_DEPTH, depth, 0
+        largest = i
+        l = 2 * i + 1
+        r = 2 * i + 2
+        
+        if l < n:
+            yield OP_COMPARE, l, largest
+            if array[l] > array[largest]:
+                largest = l
+        
+        if r < n:
+            yield OP_COMPARE, r, largest
+            if array[r] > array[largest]:
+                largest = r
+        
+        if largest == i:
+            return
+        array[i], array[largest] = array[largest], array[i]
+        yield OP_SWAP, i, largest
+        i = largest
+        depth += 1
+
+
+def _heapify(array: List[int], n: int, i: int) -> None:
+    """Uninstrumented ``_heapify_ops``."""
+    while True:
+        largest = i
+        l = 2 * i + 1
+        r = 2 * i + 2
+        if l < n and array[l] > array[largest]:
+            largest = l
+        if r < n and array[r] > array[largest]:
+            largest = r
+        if largest == i:
+            return
+        array[i], array[largest] = array[largest], array[i]
+        i = largest
+
+
+def _partition_median_of_three_ops(a: List[int], lo: int, hi: int) -> Generator[Operation, None, int]:
+    """Hoare-partition ``a[lo:hi]`` around its median of three, yielding operations.
+    
+    Returns ``j`` such that ``a[lo..j] <= pivot <= a[j+1..hi-1]``; needs ``hi - lo >= 3``.
+    """
+    # Order a[lo], a[mid], a[hi-1]; the median becomes the pivot value
+    mid = (lo + hi - 1) // 2
+    for i, j in ((lo, mid), (mid, hi - 1), (lo, mid)):
+        yield OP_COMPARE, j, i
+        if a[j] < a[i]:
+            a[i], a[j] = a[j], a[i]
+            yield OP_SWAP, i, j
+    pivot = a[mid]
+    
+    i, j = lo - 1, hi
+    while True:
+        i += 1
+        yield OP_COMPARE, i, mid
+        while a[i] < pivot:
+            i += 1
+            yield OP_COMPARE, i, mid
+        j -= 1
+        yield OP_COMPARE, j, mid
+        while a[j] > pivot:
+            j -= 1
+            yield OP_COMPARE, j, mid
+        if i >= j:
+            return j
+        a[i], a[j] = a[j], a[i]
+        yield OP_SWAP, i, j
+
+
+def _partition_median_of_three(a: List[int], lo: int, hi: int) -> int:
+    """Uninstrumented ``_partition_median_of_three_ops``."""
+    mid = (lo + hi - 1) // 2
+    for i, j in ((lo, mid), (mid, hi - 1), (lo, mid)):
+        if a[j] < a[i]:
+            a[i], a[j] = a[j], a[i]
+    pivot = a[mid]
+    
+    i, j = lo - 1, hi
+    while True:
+        i += 1
+        while a[i] < pivot:
+            i += 1
+        j -= 1
+        while a[j] > pivot:
+            j -= 1
+        if i >= j:
+            return j
+        a[i], a[j] = a[j], a[i]
+
+
+def selection_k(choice: str, n: int) -> int:
+    """Default target index of selection algorithm ``choice`` for n elements.
+    
+    Quickselect finds the median; top-k and partial sort gather the
+    smallest ``n // SELECTION_K_DIVISOR`` elements (at least one).
+    """
+    if choice == '15':
+        return n // 2
+    return min(n, max(1, n // SELECTION_K_DIVISOR))
+
+
+def result_is_valid(choice: Optional[str], array: List[int]) -> bool:
+    """Whether ``array`` is what algorithm ``choice`` promises to produce.
+    
+    Sorts must leave it fully sorted. Quickselect must leave its target
+    element with nothing larger before it and nothing smaller after it;
+    top-k and partial sort must leave the k smallest in front, and partial
+    sort must also have them in order.
+    """
+    if choice not in SELECTION_ALGORITHMS:
+        return all(array[i] <= array[i + 1] for i in range(len(array) - 1))
+    
+    k = selection_k(choice, len(array))
+    if choice == '15':
+        return (not array or (max(array[:k], default=array[k]) <= array[k]
+                              <= min(array[k + 1:], default=array[k])))
+    front, rest = array[:k], array[k:]
+    if front and rest and max(front) > min(rest):
+        return False
+    return choice != '17' or all(front[i] <= front[i + 1] for i in range(len(front) - 1))
+
+
+def _select_ops(a: List[int], lo: int, hi: int, k: int) -> AlgorithmGenerator:
+    """Introselect: move the element of rank ``k`` in ``a[lo:hi]`` to index ``k``, yielding operations.
+    
+    Each median-of-three partition keeps only the side holding ``k``; after
+    ``2·log2(n)`` of them the remaining range is heap-sorted instead.
+    """
+    budget = 2 * (hi - lo).bit_length()
+    depth = 1
+    while hi - lo > 1:
+        yield OP_META_DEPTH, depth, 0
+        if hi - lo <= INTROSORT_CUTOFF:
+            yield from _insertion_sort_range_ops(a, lo, hi)
+            return
+        if budget == 0:
+            yield from _heap_sort_range_ops(a, lo, hi)
+            return
+        j = yield from _partition_median_of_three_ops(a, lo, hi)
+        if k <= j:
+            hi = j + 1
+        else:
+            lo = j + 1
+        budget -= 1
+        depth += 1
+
+
+def _select(a: List[int], lo: int, hi: int, k: int) -> None:
+    """Uninstrumented ``_select_ops``."""
+    budget = 2 * (hi - lo).bit_length()
+    while hi - lo > 1:
+        if hi - lo <= INTROSORT_CUTOFF:
+            _insertion_sort_range(a, lo, hi)
+            return
+        if budget == 0:
+            _heap_sort_range(a, lo, hi)
+            return
+        j = _partition_median_of_three(a, lo, hi)
+        if k <= j:
+            hi = j + 1
+        else:
+            lo = j + 1
+        budget -= 1
+
+
 class SortingAlgorithms:
-    """Collection of sorting algorithms as generators for visualization."""
+    """Collection of sorting algorithms as operation generators for visualization.
+
+    Each generator works on a private copy of the input and yields one
+    ``(op_code, index1, index2_or_value)`` tuple per visual step instead of a
+    full array snapshot. ``record_trace`` stores the stream together with the
+    initial array, and ``OperationTrace`` rebuilds any frame on demand.
+    
+    Inputs may be lists, ``array.array`` or NumPy integer arrays. Typed
+    inputs are sorted as typed copies (see ``_working_copy``), and the
+    uninstrumented variants return the sorted copy in the input's type.
+    """
     
     @staticmethod
     def bubble_sort_generator(arr: List[int]) -> AlgorithmGenerator:
         """Bubble sort algorithm generator."""
         n = len(arr)
-        local_arr = list(arr)
+        local_arr = _working_copy(arr)
         
         for i in range(n):
             swapped = False
             for j in range(0, n - i - 1):
-                yield list(local_arr), j, j + 1
+                yield OP_COMPARE, j, j + 1
                 
                 if local_arr[j] > local_arr[j + 1]:
                     local_arr[j], local_arr[j + 1] = local_arr[j + 1], local_arr[j]
                     swapped = True
-                    yield list(local_arr), j, j + 1
+                    yield OP_SWAP, j, j + 1
             
             if not swapped:
                 break
-        
-        yield list(local_arr), -1, -1
 
     @staticmethod
     def selection_sort_generator(arr: List[int]) -> AlgorithmGenerator:
         """Selection sort algorithm generator."""
         n = len(arr)
-        local_arr = list(arr)
+        local_arr = _working_copy(arr)
         
         for i in range(n):
             min_idx = i
             
             for j in range(i + 1, n):
-                yield list(local_arr), min_idx, j
+                yield OP_COMPARE, min_idx, j
                 
                 if local_arr[min_idx] > local_arr[j]:
                     min_idx = j
             
             if min_idx != i:
                 local_arr[i], local_arr[min_idx] = local_arr[min_idx], local_arr[i]
-                yield list(local_arr), i, min_idx
-        
-        yield list(local_arr), -1, -1
+                yield OP_SWAP, i, min_idx
 
     @staticmethod
     def insertion_sort_generator(arr: List[int]) -> AlgorithmGenerator:
         """Insertion sort algorithm generator."""
-        local_arr = list(arr)
+        local_arr = _working_copy(arr)
         
         for i in range(1, len(local_arr)):
             key = local_arr[i]
             j = i - 1
             
             while j >= 0:
-                yield list(local_arr), j, i
+                yield OP_COMPARE, j, i
                 
                 if local_arr[j] > key:
                     local_arr[j + 1] = local_arr[j]
+                    yield OP_WRITE, j + 1, local_arr[j]
                     j -= 1
-                    yield list(local_arr), j + 1, i
                 else:
                     break
             
             local_arr[j + 1] = key
-            yield list(local_arr), j + 1, i
-        
-        yield list(local_arr), -1, -1
+            yield OP_WRITE, j + 1, key
 
     @staticmethod
     def quick_sort_generator(arr: List[int]) -> AlgorithmGenerator:
-        """Quick sort algorithm generator."""
-        local_arr = list(arr)
+        """Quick sort algorithm generator.
         
-        def quick_sort_recursive(array, low, high):
-            if low < high:
-                pivot = array[high]
-                i = low - 1
-                
-                for j in range(low, high):
-                    yield list(array), j, high
-                    
-                    if array[j] <= pivot:
-                        i += 1
-                        if i != j:
-                            array[i], array[j] = array[j], array[i]
-                            yield list(array), i, j
-                
-                pivot_index = i + 1
-                if pivot_index != high:
-                    array[pivot_index], array[high] = array[high], array[pivot_index]
-                    yield list(array), pivot_index, high
-                
-                yield from quick_sort_recursive(array, low, pivot_index - 1)
-                yield from quick_sort_recursive(array, pivot_index + 1, high)
+        Partitions are kept on an explicit stack rather than in nested
+        generators, so each yield costs the same at any depth and sorted input
+        (n levels deep with a last-element pivot) cannot hit the recursion limit.
+        """
+        array = _working_copy(arr)
+        # (low, high, depth) ranges; the left part is pushed last so it is
+        # sorted first, in the same order as the recursive formulation
+        stack = [(0, len(array) - 1, 1)] if len(array) > 1 else []
         
-        yield from quick_sort_recursive(local_arr, 0, len(local_arr) - 1)
-        yield list(local_arr), -1, -1
+        while stack:
+            low, high, depth = stack.pop()
+            yield OP_META_DEPTH, depth, 0
+            pivot = array[high]
+            i = low - 1
+            
+            for j in range(low, high):
+                yield OP_COMPARE, j, high
+                
+                if array[j] <= pivot:
+                    i += 1
+                    if i != j:
+                        array[i], array[j] = array[j], array[i]
+                        yield OP_SWAP, i, j
+            
+            pivot_index = i + 1
+            if pivot_index != high:
+                array[pivot_index], array[high] = array[high], array[pivot_index]
+                yield OP_SWAP, pivot_index, high
+            
+            # Only ranges with two or more elements do any work
+            if pivot_index + 1 < high:
+                stack.append((pivot_index + 1, high, depth + 1))
+            if low < pivot_index - 1:
+                stack.append((low, pivot_index - 1, depth + 1))
 
     @staticmethod
     def heap_sort_generator(arr: List[int]) -> AlgorithmGenerator:
         """Heap sort algorithm generator."""
-        local_arr = list(arr)
+        local_arr = _working_copy(arr)
         n = len(local_arr)
         
-        def heapify(array, n, i):
-            largest = i
-            l = 2 * i + 1
-            r = 2 * i + 2
-            
-            if l < n:
-                yield list(array), l, largest
-                if array[l] > array[largest]:
-                    largest = l
-            
-            if r < n:
-                yield list(array), r, largest
-                if array[r] > array[largest]:
-                    largest = r
-            
-            if largest != i:
-                array[i], array[largest] = array[largest], array[i]
-                yield list(array), i, largest
-                yield from heapify(array, n, largest)
-        
         for i in range(n // 2 - 1, -1, -1):
-            yield from heapify(local_arr, n, i)
+            yield from _heapify_ops(local_arr, n, i)
         
         for i in range(n - 1, 0, -1):
             local_arr[0], local_arr[i] = local_arr[i], local_arr[0]
-            yield list(local_arr), 0, i
-            yield from heapify(local_arr, i, 0)
-        
-        yield list(local_arr), -1, -1
+            yield OP_SWAP, 0, i
+            yield from _heapify_ops(local_arr, i, 0)
 
     @staticmethod
     def shell_sort_generator(arr: List[int]) -> AlgorithmGenerator:
         """Shell sort algorithm generator."""
-        local_arr = list(arr)
+        local_arr = _working_copy(arr)
         n = len(local_arr)
         gap = n // 2
         
@@ -261,26 +733,24 @@ class SortingAlgorithms:
                 j = i
                 
                 while j >= gap:
-                    yield list(local_arr), j, j - gap
+                    yield OP_COMPARE, j, j - gap
                     
                     if local_arr[j - gap] > temp:
                         local_arr[j] = local_arr[j - gap]
+                        yield OP_WRITE, j, local_arr[j]
                         j -= gap
-                        yield list(local_arr), j, j + gap
                     else:
                         break
                 
                 local_arr[j] = temp
-                yield list(local_arr), j, i
+                yield OP_WRITE, j, temp
             
             gap //= 2
-        
-        yield list(local_arr), -1, -1
 
     @staticmethod
     def comb_sort_generator(arr: List[int]) -> AlgorithmGenerator:
         """Comb sort algorithm generator."""
-        local_arr = list(arr)
+        local_arr = _working_copy(arr)
         n = len(local_arr)
         gap = n
         shrink = 1.3
@@ -294,32 +764,33 @@ class SortingAlgorithms:
             
             i = 0
             while i + gap < n:
-                yield list(local_arr), i, i + gap
+                yield OP_COMPARE, i, i + gap
                 
                 if local_arr[i] > local_arr[i + gap]:
                     local_arr[i], local_arr[i + gap] = local_arr[i + gap], local_arr[i]
                     sorted_flag = False
-                    yield list(local_arr), i, i + gap
+                    yield OP_SWAP, i, i + gap
                 
                 i += 1
-        
-        yield list(local_arr), -1, -1
 
     @staticmethod
     def radix_sort_generator(arr: List[int]) -> AlgorithmGenerator:
         """Radix sort algorithm generator."""
-        local_arr = list(arr)
+        local_arr = _working_copy(arr)
+        if not local_arr:
+            return
         max_num = max(local_arr)
         exp = 1
         
         while max_num // exp > 0:
             output = [0] * len(local_arr)
             count = [0] * 10
+            yield OP_META_ALLOC, len(output) + len(count), 0
             
             for i in range(len(local_arr)):
                 index = local_arr[i] // exp
                 count[index % 10] += 1
-                yield list(local_arr), i, -1
+                yield OP_READ, i, -1
             
             for i in range(1, 10):
                 count[i] += count[i - 1]
@@ -329,81 +800,98 @@ class SortingAlgorithms:
                 index = local_arr[i] // exp
                 output[count[index % 10] - 1] = local_arr[i]
                 count[index % 10] -= 1
-                yield list(local_arr), i, -1
+                yield OP_READ, i, -1
                 i -= 1
             
             for i in range(len(local_arr)):
                 local_arr[i] = output[i]
-                yield list(local_arr), i, -1
+                yield OP_WRITE, i, output[i]
             
+            yield OP_META_ALLOC, -(len(output) + len(count)), 0
             exp *= 10
-        
-        yield list(local_arr), -1, -1
 
     @staticmethod
     def bucket_sort_generator(arr: List[int]) -> AlgorithmGenerator:
         """Bucket sort algorithm generator."""
-        local_arr = list(arr)
+        local_arr = _working_copy(arr)
         if not local_arr:
             return
         
         bucket_count = 10
         max_val = max(local_arr)
         min_val = min(local_arr)
-        bucket_range = (max_val - min_val) / bucket_count
+        bucket_range = (max_val - min_val) / bucket_count or 1
         
         buckets = [[] for _ in range(bucket_count)]
+        yield OP_META_ALLOC, len(local_arr), 0
         
         for i, num in enumerate(local_arr):
             bucket_index = min(int((num - min_val) / bucket_range), bucket_count - 1)
             buckets[bucket_index].append(num)
-            yield list(local_arr), i, -1
+            yield OP_READ, i, -1
         
-        result = []
-        for i, bucket in enumerate(buckets):
-            bucket.sort()
-            result.extend(bucket)
+        k = 0
+        for bucket in buckets:
+            comparisons = _count_sort_comparisons(bucket)
+            yield OP_META_COMPARES, comparisons, 0
             
-            for j in range(len(result)):
-                if j < len(local_arr):
-                    local_arr[j] = result[j]
-            yield list(local_arr), i, -1
+            # Only the slots that actually change are emitted as writes
+            for num in bucket:
+                if local_arr[k] != num:
+                    local_arr[k] = num
+                    yield OP_WRITE, k, num
+                k += 1
         
-        yield list(local_arr), -1, -1
+        yield OP_META_ALLOC, -len(local_arr), 0
 
     @staticmethod
     def bogo_sort_generator(arr: List[int], max_iterations: int = 1000) -> AlgorithmGenerator:
         """Bogo sort algorithm generator (limited iterations)."""
-        local_arr = list(arr)
+        local_arr = _working_copy(arr)
         iteration = 0
         
         def is_sorted(array: List[int]) -> bool:
             return all(array[i] <= array[i + 1] for i in range(len(array) - 1))
         
-        while not is_sorted(local_arr) and iteration < max_iterations:
+        def sortedness_comparisons(array: List[int]) -> int:
+            """Comparisons ``is_sorted`` makes before it can answer."""
+            for i in range(len(array) - 1):
+                if array[i] > array[i + 1]:
+                    return i + 1
+            return max(len(array) - 1, 0)
+        
+        while True:
+            yield OP_META_COMPARES, sortedness_comparisons(local_arr), 0
+            if is_sorted(local_arr) or iteration >= max_iterations:
+                break
+            
+            previous = list(local_arr)
             random.shuffle(local_arr)
             iteration += 1
             
+            for i, num in enumerate(local_arr):
+                if previous[i] != num:
+                    yield OP_WRITE, i, num
+            
             active_idx1 = random.randint(0, len(local_arr) - 1)
             active_idx2 = random.randint(0, len(local_arr) - 1)
-            yield list(local_arr), active_idx1, active_idx2
-        
-        yield list(local_arr), -1, -1
+            yield OP_READ, active_idx1, active_idx2
 
     @staticmethod
     def merge_sort_generator(arr: List[int]) -> AlgorithmGenerator:
         """Merge sort algorithm generator."""
-        local_arr = list(arr)
+        local_arr = _working_copy(arr)
         
         def merge(array, left, mid, right):
             left_arr = array[left:mid + 1]
             right_arr = array[mid + 1:right + 1]
+            yield OP_META_ALLOC, right - left + 1, 0
             
             i = j = 0
             k = left
             
             while i < len(left_arr) and j < len(right_arr):
-                yield list(array), left + i, mid + 1 + j
+                yield OP_COMPARE, left + i, mid + 1 + j
                 
                 if left_arr[i] <= right_arr[j]:
                     array[k] = left_arr[i]
@@ -412,273 +900,4383 @@ class SortingAlgorithms:
                     array[k] = right_arr[j]
                     j += 1
                 
-                yield list(array), k, -1
+                yield OP_WRITE, k, array[k]
                 k += 1
             
             while i < len(left_arr):
                 array[k] = left_arr[i]
-                yield list(array), k, -1
+                yield OP_WRITE, k, array[k]
                 i += 1
                 k += 1
             
             while j < len(right_arr):
                 array[k] = right_arr[j]
-                yield list(array), k, -1
+                yield OP_WRITE, k, array[k]
                 j += 1
                 k += 1
+            
+            yield OP_META_ALLOC, -(right - left + 1), 0
         
-        def merge_sort_recursive(array, left, right):
-            if left < right:
-                mid = (left + right) // 2
-                
-                yield from merge_sort_recursive(array, left, mid)
-                yield from merge_sort_recursive(array, mid + 1, right)
-                yield from merge(array, left, mid, right)
+        # Explicit stack of (left, right, depth, halves_sorted) entries: a range is
+        # visited once to split it and again, after both halves, to merge it,
+        # so delegation never nests deeper than ``merge`` below
+        stack = [(0, len(local_arr) - 1, 1, False)] if len(local_arr) > 1 else []
         
-        yield from merge_sort_recursive(local_arr, 0, len(local_arr) - 1)
-        yield list(local_arr), -1, -1
-
-def get_algorithm_function(choice: str):
-    """Map algorithm choice to function."""
-    algorithm_map = {
-        '1': SortingAlgorithms.bubble_sort_generator,
-        '2': SortingAlgorithms.selection_sort_generator,
-        '3': SortingAlgorithms.insertion_sort_generator,
-        '4': SortingAlgorithms.quick_sort_generator,
-        '5': SortingAlgorithms.heap_sort_generator,
-        '6': SortingAlgorithms.shell_sort_generator,
-        '7': SortingAlgorithms.comb_sort_generator,
-        '8': SortingAlgorithms.radix_sort_generator,
-        '9': SortingAlgorithms.bucket_sort_generator,
-        '10': SortingAlgorithms.bogo_sort_generator,
-        '11': SortingAlgorithms.merge_sort_generator,
-    }
-    return algorithm_map[choice]
-
-# --- Visualization Class ---
+        while stack:
+            left, right, depth, halves_sorted = stack.pop()
+            mid = (left + right) // 2
+            if halves_sorted:
+                yield from merge(local_arr, left, mid, right)
+                continue
+            
+            yield OP_META_DEPTH, depth, 0
+            stack.append((left, right, depth, True))
+            if mid + 1 < right:
+                stack.append((mid + 1, right, depth + 1, False))
+            if left < mid:
+                stack.append((left, mid, depth + 1, False))
 
-class SortingVisualizer:
-    """Advanced sorting algorithm visualizer with customizable bar count."""
-    
-    def __init__(self, n_bars: int):
-        self.n_bars = n_bars
-        self.initial_array = self._generate_array()
+    @staticmethod
+    def tim_sort_generator(arr: List[int]) -> AlgorithmGenerator:
+        """Timsort generator (CPython's ``list.sort`` algorithm).
         
-    def _generate_array(self) -> List[int]:
-        """Generate array with heights from 1 to n_bars, randomly shuffled."""
-        array = list(range(1, self.n_bars + 1))
-        random.shuffle(array)
-        print(f"🎲 Generated random array: {array[:10]}{'...' if len(array) > 10 else ''}")
-        return array
-    
-    def _setup_plot_style(self, ax: plt.Axes, title: str) -> None:
-        """Configure plot appearance with green bars on black background."""
-        ax.set_title(title, color='white', fontsize=14, fontweight='bold')
-        ax.set_facecolor(BACKGROUND_COLOR)
-        ax.set_xticks([])
-        ax.set_yticks([])
-        ax.set_xlim(-1, self.n_bars)
-        ax.set_ylim(0, self.n_bars + 1)
+        Natural runs are detected (descending ones reversed), extended to a
+        minimum run length with binary insertion sort and merged under the
+        run-stack invariants. Merges copy the smaller run aside and switch to
+        galloping once one side keeps winning.
+        """
+        a = _working_copy(arr)
+        n = len(a)
+        runs = []  # Pending (base, length) runs
+        min_gallop = TIMSORT_MIN_GALLOP
         
-        # Remove spines for cleaner look
-        for spine in ax.spines.values():
-            spine.set_visible(False)
-    
-    def _create_bars(self, ax: plt.Axes) -> List[plt.Rectangle]:
-        """Create initial bar chart with green bars."""
-        bar_width = 0.8 if self.n_bars <= 50 else 0.95  # Adjust width based on bar count
+        def count_run(lo):
+            hi = lo + 1
+            if hi == n:
+                return 1
+            yield OP_COMPARE, hi, lo
+            if a[hi] < a[lo]:
+                # Strictly descending, so reversing keeps equal elements stable
+                hi += 1
+                while hi < n:
+                    yield OP_COMPARE, hi, hi - 1
+                    if not a[hi] < a[hi - 1]:
+                        break
+                    hi += 1
+                i, j = lo, hi - 1
+                while i < j:
+                    a[i], a[j] = a[j], a[i]
+                    yield OP_SWAP, i, j
+                    i += 1
+                    j -= 1
+            else:
+                hi += 1
+                while hi < n:
+                    yield OP_COMPARE, hi, hi - 1
+                    if a[hi] < a[hi - 1]:
+                        break
+                    hi += 1
+            return hi - lo
         
-        bars = ax.bar(
-            range(self.n_bars), 
-            self.initial_array, 
-            color=BAR_COLOR_NORMAL,
-            edgecolor='darkgreen',
-            linewidth=0.1 if self.n_bars > 100 else 0.2,
-            width=bar_width
-        )
-        return bars
-    
-    def _validate_array(self, array: List[int]) -> bool:
-        """Check if array is correctly sorted."""
-        return all(array[i] <= array[i + 1] for i in range(len(array) - 1))
-    
-    def _update_animation_frame(self, frame_number: int, algorithms_data: List[dict], 
-                              standard_frames: int) -> List:
-        """Update animation frame for both algorithms."""
-        updated_artists = []
+        def binary_insertion(lo, hi, start):
+            for i in range(start, hi):
+                pivot = a[i]
+                left, right = lo, i
+                while left < right:
+                    mid = (left + right) // 2
+                    yield OP_COMPARE, mid, i
+                    if pivot < a[mid]:
+                        right = mid
+                    else:
+                        left = mid + 1
+                for k in range(i, left, -1):
+                    a[k] = a[k - 1]
+                    yield OP_WRITE, k, a[k]
+                if left != i:
+                    a[left] = pivot
+                    yield OP_WRITE, left, pivot
         
-        for algo_data in algorithms_data:
-            bars = algo_data['bars']
-            original_frames = algo_data['original_frames']
-            text_label = algo_data['text_label']
-            algorithm_name = algo_data['name']
-            algorithm_finish_frame = algo_data['algorithm_finish_frame']
-            validation_start_frame = algo_data.get('validation_start_frame', algorithm_finish_frame + 1)
-            validation_duration = 60  # Validation takes 60 frames (1 second)
-            is_first_completed = algo_data.get('is_first_completed', False)
+        def gallop(key, key_index, seq, origin, base, length, hint, right):
+            """Exponential then binary search of ``seq[base:base+length]`` from ``hint``.
             
-            # Check if this algorithm should still be running
-            if frame_number <= algorithm_finish_frame:
-                # Algorithm is still running
-                if original_frames and len(original_frames) > 0:
-                    # Calculate which frame to show from original frames
-                    progress_ratio = frame_number / algorithm_finish_frame
-                    original_frame_index = int(progress_ratio * (len(original_frames) - 1))
-                    original_frame_index = min(original_frame_index, len(original_frames) - 1)
-                    
-                    current_array, active_idx1, active_idx2 = original_frames[original_frame_index]
-                    
-                    # Update bar heights and colors
-                    for bar_idx, bar in enumerate(bars):
-                        bar.set_height(current_array[bar_idx])
-                        
-                        # Set colors: selected bars are black, others are green
-                        if bar_idx == active_idx1 or bar_idx == active_idx2:
-                            bar.set_color(BAR_COLOR_SELECTED)  # Black for selected
-                        else:
-                            bar.set_color(BAR_COLOR_NORMAL)    # Green for normal
-                    
-                    # Show progress
-                    progress_percent = (frame_number / algorithm_finish_frame) * 100
-                    text_label.set_text(f'{algorithm_name} - Progress: {progress_percent:.1f}%')
-                else:
-                    # No frames available
-                    progress_percent = (frame_number / algorithm_finish_frame) * 100
-                    text_label.set_text(f'{algorithm_name} - Progress: {progress_percent:.1f}%')
-            elif frame_number <= validation_start_frame + validation_duration:
-                # Algorithm is in validation phase
-                if original_frames and len(original_frames) > 0:
-                    final_array, _, _ = original_frames[-1]
-                    
-                    # Calculate validation progress
-                    validation_progress = (frame_number - validation_start_frame) / validation_duration
-                    validation_progress = max(0, min(1, validation_progress))
-                    
-                    # How many bars to validate so far
-                    bars_to_validate = int(validation_progress * self.n_bars)
-                    
-                    # Check if array is correctly sorted
-                    is_correct = self._validate_array(final_array)
-                    
-                    for bar_idx, bar in enumerate(bars):
-                        bar.set_height(final_array[bar_idx])
-                        
-                        if bar_idx < bars_to_validate:
-                            # Already validated bars
-                            if is_correct:
-                                bar.set_color('#0080FF')  # Blue for validated correct
-                            else:
-                                bar.set_color('#FF0000')  # Red for validation error
-                        else:
-                            # Not yet validated
-                            bar.set_color('#00AA00')  # Dark green for completed but not validated
-                    
-                    # Show validation progress
-                    validation_percent = validation_progress * 100
-                    if is_first_completed:
-                        text_label.set_text(f'WINNER - {algorithm_name} - Validating: {validation_percent:.0f}%')
-                    else:
-                        text_label.set_text(f'{algorithm_name} - Validating: {validation_percent:.0f}%')
-                else:
-                    # No frames available
-                    if is_first_completed:
-                        text_label.set_text(f'WINNER - {algorithm_name} - Validating...')
-                    else:
-                        text_label.set_text(f'{algorithm_name} - Validating...')
+            Returns the insertion point of ``key``: after equal elements if
+            ``right``, before them otherwise. ``origin + i`` is the array
+            position highlighted for ``seq[i]``.
+            """
+            def goes_after(i):
+                return not key < seq[i] if right else seq[i] < key
+            
+            last_ofs, ofs = 0, 1
+            yield OP_COMPARE, origin + base + hint, key_index
+            if goes_after(base + hint):
+                max_ofs = length - hint
+                while ofs < max_ofs:
+                    yield OP_COMPARE, origin + base + hint + ofs, key_index
+                    if not goes_after(base + hint + ofs):
+                        break
+                    last_ofs, ofs = ofs, (ofs << 1) + 1
+                ofs = min(ofs, max_ofs)
+                last_ofs, ofs = last_ofs + hint, ofs + hint
             else:
-                # Validation completed
-                if original_frames and len(original_frames) > 0:
-                    final_array, _, _ = original_frames[-1]
-                    is_correct = self._validate_array(final_array)
-                    
-                    for bar_idx, bar in enumerate(bars):
-                        bar.set_height(final_array[bar_idx])
-                        if is_correct:
-                            bar.set_color('#0080FF')  # Blue for validated correct
-                        else:
-                            bar.set_color('#FF0000')  # Red for validation error
-                    
-                    # Show final status
-                    if is_correct:
-                        if is_first_completed:
-                            text_label.set_text(f'WINNER - {algorithm_name} - VALID SORT!')
-                        else:
-                            text_label.set_text(f'{algorithm_name} - VALID SORT!')
-                    else:
-                        text_label.set_text(f'{algorithm_name} - ❌ SORT ERROR!')
+                max_ofs = hint + 1
+                while ofs < max_ofs:
+                    yield OP_COMPARE, origin + base + hint - ofs, key_index
+                    if goes_after(base + hint - ofs):
+                        break
+                    last_ofs, ofs = ofs, (ofs << 1) + 1
+                ofs = min(ofs, max_ofs)
+                last_ofs, ofs = hint - ofs, hint - last_ofs
+            
+            # Now the answer lies in (last_ofs, ofs]; finish with a binary search
+            last_ofs += 1
+            while last_ofs < ofs:
+                mid = last_ofs + ((ofs - last_ofs) >> 1)
+                yield OP_COMPARE, origin + base + mid, key_index
+                if goes_after(base + mid):
+                    last_ofs = mid + 1
                 else:
-                    if is_first_completed:
-                        text_label.set_text(f'WINNER - {algorithm_name} - COMPLETED!')
+                    ofs = mid
+            return ofs
+        
+        def merge_lo(base1, len1, base2, len2):
+            # Run 1 is the shorter: copy it aside and merge forwards into its slots
+            nonlocal min_gallop
+            tmp = a[base1:base1 + len1]
+            yield OP_META_ALLOC, len1, 0
+            cursor1, cursor2, dest = 0, base2, base1
+            end2 = base2 + len2
+            
+            while cursor1 < len1 and cursor2 < end2:
+                wins1 = wins2 = 0
+                while cursor1 < len1 and cursor2 < end2:
+                    yield OP_COMPARE, cursor2, dest
+                    if a[cursor2] < tmp[cursor1]:
+                        a[dest] = a[cursor2]
+                        cursor2 += 1
+                        wins1, wins2 = 0, wins2 + 1
                     else:
-                        text_label.set_text(f'{algorithm_name} - COMPLETED!')
+                        a[dest] = tmp[cursor1]
+                        cursor1 += 1
+                        wins1, wins2 = wins1 + 1, 0
+                    yield OP_WRITE, dest, a[dest]
+                    dest += 1
+                    if wins1 >= min_gallop or wins2 >= min_gallop:
+                        break
+                
+                # Galloping: move whole stretches that one run wins outright
+                while cursor1 < len1 and cursor2 < end2:
+                    count1 = yield from gallop(a[cursor2], cursor2, tmp, base1, cursor1, len1 - cursor1, 0, True)
+                    for _ in range(count1):
+                        a[dest] = tmp[cursor1]
+                        yield OP_WRITE, dest, a[dest]
+                        dest += 1
+                        cursor1 += 1
+                    count2 = 0
+                    if cursor1 < len1:
+                        count2 = yield from gallop(tmp[cursor1], dest, a, 0, cursor2, end2 - cursor2, 0, False)
+                        for _ in range(count2):
+                            a[dest] = a[cursor2]
+                            yield OP_WRITE, dest, a[dest]
+                            dest += 1
+                            cursor2 += 1
+                    if count1 < TIMSORT_MIN_GALLOP and count2 < TIMSORT_MIN_GALLOP:
+                        min_gallop += 1
+                        break
+                    min_gallop = max(1, min_gallop - 1)
             
-            updated_artists.extend(bars)
-            updated_artists.append(text_label)
+            # Leftovers of run 2 are already in place
+            while cursor1 < len1:
+                a[dest] = tmp[cursor1]
+                yield OP_WRITE, dest, a[dest]
+                dest += 1
+                cursor1 += 1
+            yield OP_META_ALLOC, -len1, 0
         
-        return updated_artists
-    
-    def visualize_algorithms(self, algo1_choice: str, algo2_choice: str, algo_names: dict):
-        """Main visualization method for two algorithms."""
+        def merge_hi(base1, len1, base2, len2):
+            # Run 2 is the shorter: copy it aside and merge backwards into its slots
+            nonlocal min_gallop
+            tmp = a[base2:base2 + len2]
+            yield OP_META_ALLOC, len2, 0
+            cursor1, cursor2, dest = base1 + len1 - 1, len2 - 1, base2 + len2 - 1
+            
+            while cursor1 >= base1 and cursor2 >= 0:
+                wins1 = wins2 = 0
+                while cursor1 >= base1 and cursor2 >= 0:
+                    yield OP_COMPARE, cursor1, dest
+                    if tmp[cursor2] < a[cursor1]:
+                        a[dest] = a[cursor1]
+                        cursor1 -= 1
+                        wins1, wins2 = wins1 + 1, 0
+                    else:
+                        a[dest] = tmp[cursor2]
+                        cursor2 -= 1
+                        wins1, wins2 = 0, wins2 + 1
+                    yield OP_WRITE, dest, a[dest]
+                    dest -= 1
+                    if wins1 >= min_gallop or wins2 >= min_gallop:
+                        break
+                
+                while cursor1 >= base1 and cursor2 >= 0:
+                    length1 = cursor1 - base1 + 1
+                    keep1 = yield from gallop(tmp[cursor2], dest, a, 0, base1, length1, length1 - 1, True)
+                    count1 = length1 - keep1
+                    for _ in range(count1):
+                        a[dest] = a[cursor1]
+                        yield OP_WRITE, dest, a[dest]
+                        dest -= 1
+                        cursor1 -= 1
+                    count2 = 0
+                    if cursor1 >= base1:
+                        keep2 = yield from gallop(a[cursor1], cursor1, tmp, base2, 0, cursor2 + 1, cursor2, False)
+                        count2 = cursor2 + 1 - keep2
+                        for _ in range(count2):
+                            a[dest] = tmp[cursor2]
+                            yield OP_WRITE, dest, a[dest]
+                            dest -= 1
+                            cursor2 -= 1
+                    if count1 < TIMSORT_MIN_GALLOP and count2 < TIMSORT_MIN_GALLOP:
+                        min_gallop += 1
+                        break
+                    min_gallop = max(1, min_gallop - 1)
+            
+            # Leftovers of run 1 are already in place
+            while cursor2 >= 0:
+                a[dest] = tmp[cursor2]
+                yield OP_WRITE, dest, a[dest]
+                dest -= 1
+                cursor2 -= 1
+            yield OP_META_ALLOC, -len2, 0
         
-        # Get algorithm functions
-        algo1_func = get_algorithm_function(algo1_choice)
-        algo2_func = get_algorithm_function(algo2_choice)
-        algo1_name = algo_names[algo1_choice]
-        algo2_name = algo_names[algo2_choice]
+        def merge_at(i):
+            base1, len1 = runs[i]
+            base2, len2 = runs[i + 1]
+            runs[i] = (base1, len1 + len2)
+            del runs[i + 1]
+            
+            # Skip the prefix of run 1 and the suffix of run 2 that are already in place
+            skip = yield from gallop(a[base2], base2, a, 0, base1, len1, 0, True)
+            base1, len1 = base1 + skip, len1 - skip
+            if len1 == 0:
+                return
+            len2 = yield from gallop(a[base1 + len1 - 1], base1 + len1 - 1, a, 0, base2, len2, len2 - 1, False)
+            if len2 == 0:
+                return
+            if len1 <= len2:
+                yield from merge_lo(base1, len1, base2, len2)
+            else:
+                yield from merge_hi(base1, len1, base2, len2)
         
-        print(f"🔄 Generating frames for algorithms...")
+        def merge_collapse():
+            while len(runs) > 1:
+                i = len(runs) - 2
+                if ((i > 0 and runs[i - 1][1] <= runs[i][1] + runs[i + 1][1])
+                        or (i > 1 and runs[i - 2][1] <= runs[i - 1][1] + runs[i][1])):
+                    if runs[i - 1][1] < runs[i + 1][1]:
+                        i -= 1
+                elif runs[i][1] > runs[i + 1][1]:
+                    break
+                yield from merge_at(i)
         
-        # Generate frames for both algorithms
-        algorithm_frames_data = {}
+        min_run = n
+        extra = 0
+        while min_run >= 64:
+            extra |= min_run & 1
+            min_run >>= 1
+        min_run += extra
         
-        for algo_func, name in [(algo1_func, algo1_name), (algo2_func, algo2_name)]:
-            print(f"  📊 Generating frames for {name}...")
-            generator = algo_func(self.initial_array.copy())
-            frames = []
-            
-            try:
-                for frame_data in generator:
-                    frames.append(frame_data)
-            except StopIteration:
-                pass
-            
-            algorithm_frames_data[name] = frames
-            print(f"     Generated {len(frames)} frames")
+        lo = 0
+        while lo < n:
+            run = yield from count_run(lo)
+            if run < min_run:
+                forced = min(min_run, n - lo)
+                yield from binary_insertion(lo, lo + forced, lo + run)
+                run = forced
+            runs.append((lo, run))
+            yield from merge_collapse()
+            lo += run
         
-        # Calculate execution times for smart animation timing
-        execution_times = {}
-        fastest_time = float('inf')
-        fastest_algorithm = None
+        while len(runs) > 1:
+            i = len(runs) - 2
+            if i > 0 and runs[i - 1][1] < runs[i + 1][1]:
+                i -= 1
+            yield from merge_at(i)
+    
+    @staticmethod
+    def intro_sort_generator(arr: List[int]) -> AlgorithmGenerator:
+        """Introsort generator: median-of-three quicksort with a heapsort fallback.
         
-        print("⏱️ Measuring algorithm complexity...")
-        for name in algorithm_frames_data.keys():
-            frame_count = len(algorithm_frames_data[name])
-            # Simulate execution time based on frame count
-            exec_time = frame_count * 0.000001
-            execution_times[name] = exec_time
-            print(f"   {name}: {frame_count} frames → {exec_time:.6f}s")
+        Once a range has been partitioned ``2·log2(n)`` levels deep it is
+        heap-sorted instead, bounding the worst case at O(n log n); ranges
+        of ``INTROSORT_CUTOFF`` elements or fewer are insertion-sorted.
+        """
+        a = _working_copy(arr)
+        n = len(a)
+        stack = [(0, n, 2 * n.bit_length(), 1)] if n > 1 else []  # (lo, hi, depth budget, depth)
+        
+        while stack:
+            lo, hi, budget, depth = stack.pop()
+            yield OP_META_DEPTH, depth, 0
+            if hi - lo <= INTROSORT_CUTOFF:
+                yield from _insertion_sort_range_ops(a, lo, hi)
+                continue
+            if budget == 0:
+                yield from _heap_sort_range_ops(a, lo, hi)
+                continue
             
-            if exec_time < fastest_time:
-                fastest_time = exec_time
-                fastest_algorithm = name
+            j = yield from _partition_median_of_three_ops(a, lo, hi)
+            stack.append((j + 1, hi, budget - 1, depth + 1))
+            stack.append((lo, j + 1, budget - 1, depth + 1))
+    
+    @staticmethod
+    def pdq_sort_generator(arr: List[int]) -> AlgorithmGenerator:
+        """Pattern-defeating quicksort generator (Orson Peters' pdqsort).
         
-        print(f"🏆 Fastest: {fastest_algorithm} ({fastest_time:.6f}s)")
+        Quicksort with median-of-three (ninther on large ranges) pivots that
+        also: insertion-sorts ranges below ``PDQSORT_CUTOFF``; finishes
+        already-partitioned ranges with a bounded insertion sort, so sorted
+        runs cost O(n); groups elements equal to an earlier pivot in one
+        pass; and, after a badly unbalanced partition, swaps a few elements
+        to break up the pattern, falling back to heapsort after ``log2(n)``
+        such partitions.
+        """
+        a = _working_copy(arr)
+        n = len(a)
         
-        # Smart timing system - prevent long waits
-        MIN_ANIMATION_TIME = 3.0    # Minimum animation time (seconds)
-        MAX_ANIMATION_TIME = 12.0   # Maximum animation time (seconds) 
-        FAST_ALGO_FRAMES = 600      # Base frames for fastest algorithm
+        def sort2(i, j):
+            yield OP_COMPARE, j, i
+            if a[j] < a[i]:
+                a[i], a[j] = a[j], a[i]
+                yield OP_SWAP, i, j
         
-        # Setup figure
-        fig, axes = plt.subplots(1, 2, figsize=FIGURE_SIZE)
-        fig.patch.set_facecolor(BACKGROUND_COLOR)
+        def sort3(i, j, k):
+            yield from sort2(i, j)
+            yield from sort2(j, k)
+            yield from sort2(i, j)
         
-        # Smart timing calculation - prevent long waits
-        algorithms_data = []
-        first_to_complete = fastest_algorithm
+        def swap(i, j):
+            a[i], a[j] = a[j], a[i]
+            yield OP_SWAP, i, j
         
-        # Calculate time ratios with smart limits
-        time_ratios = {}
+        def partition_right(begin, end):
+            # Elements < pivot go left; returns (pivot position, no swaps were needed)
+            pivot = a[begin]
+            first = begin + 1
+            yield OP_COMPARE, first, begin
+            while a[first] < pivot:
+                first += 1
+                yield OP_COMPARE, first, begin
+            last = end
+            if first - 1 == begin:
+                while first < last:
+                    last -= 1
+                    yield OP_COMPARE, last, begin
+                    if a[last] < pivot:
+                        break
+            else:
+                while True:
+                    last -= 1
+                    yield OP_COMPARE, last, begin
+                    if a[last] < pivot:
+                        break
+            
+            already_partitioned = first >= last
+            while first < last:
+                yield from swap(first, last)
+                first += 1
+                yield OP_COMPARE, first, begin
+                while a[first] < pivot:
+                    first += 1
+                    yield OP_COMPARE, first, begin
+                last -= 1
+                yield OP_COMPARE, last, begin
+                while not a[last] < pivot:
+                    last -= 1
+                    yield OP_COMPARE, last, begin
+            
+            pivot_pos = first - 1
+            a[begin] = a[pivot_pos]
+            yield OP_WRITE, begin, a[begin]
+            a[pivot_pos] = pivot
+            yield OP_WRITE, pivot_pos, pivot
+            return pivot_pos, already_partitioned
+        
+        def partition_left(begin, end):
+            # Elements equal to the pivot go left, and are then done
+            pivot = a[begin]
+            last = end - 1
+            yield OP_COMPARE, last, begin
+            while pivot < a[last]:
+                last -= 1
+                yield OP_COMPARE, last, begin
+            first = begin
+            if last + 1 == end:
+                while first < last:
+                    first += 1
+                    yield OP_COMPARE, first, begin
+                    if pivot < a[first]:
+                        break
+            else:
+                while True:
+                    first += 1
+                    yield OP_COMPARE, first, begin
+                    if pivot < a[first]:
+                        break
+            
+            while first < last:
+                yield from swap(first, last)
+                last -= 1
+                yield OP_COMPARE, last, begin
+                while pivot < a[last]:
+                    last -= 1
+                    yield OP_COMPARE, last, begin
+                first += 1
+                yield OP_COMPARE, first, begin
+                while not pivot < a[first]:
+                    first += 1
+                    yield OP_COMPARE, first, begin
+            
+            a[begin] = a[last]
+            yield OP_WRITE, begin, a[begin]
+            a[last] = pivot
+            yield OP_WRITE, last, pivot
+            return last
+        
+        def partial_insertion_sort(begin, end):
+            # Insertion sort that gives up after moving PDQSORT_PARTIAL_LIMIT elements
+            moved = 0
+            for cur in range(begin + 1, end):
+                if moved > PDQSORT_PARTIAL_LIMIT:
+                    return False
+                yield OP_COMPARE, cur, cur - 1
+                if a[cur] < a[cur - 1]:
+                    key = a[cur]
+                    sift = cur
+                    while True:
+                        a[sift] = a[sift - 1]
+                        yield OP_WRITE, sift, a[sift]
+                        sift -= 1
+                        if sift == begin:
+                            break
+                        yield OP_COMPARE, sift - 1, sift
+                        if not key < a[sift - 1]:
+                            break
+                    a[sift] = key
+                    yield OP_WRITE, sift, key
+                    moved += cur - sift
+            return True
+        
+        stack = [(0, n, max(1, n.bit_length() - 1), True, 1)] if n > 1 else []
+        
+        while stack:
+            # (begin, end, bad partitions still allowed, leftmost, depth)
+            begin, end, bad_allowed, leftmost, depth = stack.pop()
+            yield OP_META_DEPTH, depth, 0
+            size = end - begin
+            if size < PDQSORT_CUTOFF:
+                yield from _insertion_sort_range_ops(a, begin, end)
+                continue
+            
+            half = size // 2
+            if size > PDQSORT_NINTHER_THRESHOLD:
+                yield from sort3(begin, begin + half, end - 1)
+                yield from sort3(begin + 1, begin + half - 1, end - 2)
+                yield from sort3(begin + 2, begin + half + 1, end - 3)
+                yield from sort3(begin + half - 1, begin + half, begin + half + 1)
+                yield from swap(begin, begin + half)
+            else:
+                yield from sort3(begin + half, begin, end - 1)
+            
+            if not leftmost:
+                # Pivot equal to the element before this range: group the equal keys
+                yield OP_COMPARE, begin - 1, begin
+                if not a[begin - 1] < a[begin]:
+                    pivot_pos = yield from partition_left(begin, end)
+                    stack.append((pivot_pos + 1, end, bad_allowed, False, depth + 1))
+                    continue
+            
+            pivot_pos, already_partitioned = yield from partition_right(begin, end)
+            left_size = pivot_pos - begin
+            right_size = end - (pivot_pos + 1)
+            
+            if left_size < size // 8 or right_size < size // 8:
+                bad_allowed -= 1
+                if bad_allowed == 0:
+                    yield from _heap_sort_range_ops(a, begin, end)
+                    continue
+                if left_size >= PDQSORT_CUTOFF:
+                    quarter = left_size // 4
+                    yield from swap(begin, begin + quarter)
+                    yield from swap(pivot_pos - 1, pivot_pos - quarter)
+                    if left_size > PDQSORT_NINTHER_THRESHOLD:
+                        yield from swap(begin + 1, begin + quarter + 1)
+                        yield from swap(begin + 2, begin + quarter + 2)
+                        yield from swap(pivot_pos - 2, pivot_pos - (quarter + 1))
+                        yield from swap(pivot_pos - 3, pivot_pos - (quarter + 2))
+                if right_size >= PDQSORT_CUTOFF:
+                    quarter = right_size // 4
+                    yield from swap(pivot_pos + 1, pivot_pos + 1 + quarter)
+                    yield from swap(end - 1, end - quarter)
+                    if right_size > PDQSORT_NINTHER_THRESHOLD:
+                        yield from swap(pivot_pos + 2, pivot_pos + 2 + quarter)
+                        yield from swap(pivot_pos + 3, pivot_pos + 3 + quarter)
+                        yield from swap(end - 2, end - (1 + quarter))
+                        yield from swap(end - 3, end - (2 + quarter))
+            elif already_partitioned:
+                # Likely (nearly) sorted: try to finish both sides cheaply
+                left_done = yield from partial_insertion_sort(begin, pivot_pos)
+                if left_done:
+                    right_done = yield from partial_insertion_sort(pivot_pos + 1, end)
+                    if right_done:
+                        continue
+            
+            stack.append((pivot_pos + 1, end, bad_allowed, False, depth + 1))
+            stack.append((begin, pivot_pos, bad_allowed, leftmost, depth + 1))
+    
+    # --- Selection algorithms (only part of the output is ordered) ---
+    
+    @staticmethod
+    def quickselect_generator(arr: List[int], k: Optional[int] = None) -> AlgorithmGenerator:
+        """Introselect generator: put the k-th smallest element (default: the median) at index k.
+        
+        Everything before index k ends up no larger than it and everything
+        after no smaller. O(n) on average, O(n log n) at worst.
+        """
+        a = _working_copy(arr)
+        n = len(a)
+        k = selection_k('15', n) if k is None else k
+        yield from _select_ops(a, 0, n, k)
+    
+    @staticmethod
+    def heap_top_k_generator(arr: List[int], k: Optional[int] = None) -> AlgorithmGenerator:
+        """Heap top-k generator: gather the k smallest elements at the front, in max-heap order.
+        
+        The first k elements are built into a max-heap with heap sort's
+        ``heapify``; each later element smaller than the root replaces it and
+        is sifted down. O(n log k).
+        """
+        a = _working_copy(arr)
+        n = len(a)
+        k = selection_k('16', n) if k is None else k
+        if k == 0:
+            return
+        
+        for i in range(k // 2 - 1, -1, -1):
+            yield from _heapify_ops(a, k, i)
+        for i in range(k, n):
+            yield OP_COMPARE, i, 0
+            if a[i] < a[0]:
+                a[0], a[i] = a[i], a[0]
+                yield OP_SWAP, 0, i
+                yield from _heapify_ops(a, k, 0)
+    
+    @staticmethod
+    def partial_sort_generator(arr: List[int], k: Optional[int] = None) -> AlgorithmGenerator:
+        """Partial sort generator: the k smallest elements, in order, at the front.
+        
+        Introselect moves the k smallest elements before index k, then only
+        that prefix is heap-sorted. O(n + k log k).
+        """
+        a = _working_copy(arr)
+        n = len(a)
+        k = selection_k('17', n) if k is None else k
+        if k == 0:
+            return
+        
+        yield from _select_ops(a, 0, n, k - 1)
+        yield from _heap_sort_range_ops(a, 0, k)
+    
+    # --- Uninstrumented variants (used for wall-clock timing) ---
+    
+    @staticmethod
+    def bubble_sort(arr: List[int]) -> List[int]:
+        """Bubble sort without instrumentation; returns a sorted copy."""
+        local_arr = _working_copy(arr)
+        n = len(local_arr)
+        
+        for i in range(n):
+            swapped = False
+            for j in range(0, n - i - 1):
+                if local_arr[j] > local_arr[j + 1]:
+                    local_arr[j], local_arr[j + 1] = local_arr[j + 1], local_arr[j]
+                    swapped = True
+            if not swapped:
+                break
+        return _same_kind(local_arr, arr)
+
+    @staticmethod
+    def selection_sort(arr: List[int]) -> List[int]:
+        """Selection sort without instrumentation; returns a sorted copy."""
+        local_arr = _working_copy(arr)
+        n = len(local_arr)
+        
+        for i in range(n):
+            min_idx = i
+            for j in range(i + 1, n):
+                if local_arr[min_idx] > local_arr[j]:
+                    min_idx = j
+            if min_idx != i:
+                local_arr[i], local_arr[min_idx] = local_arr[min_idx], local_arr[i]
+        return _same_kind(local_arr, arr)
+
+    @staticmethod
+    def insertion_sort(arr: List[int]) -> List[int]:
+        """Insertion sort without instrumentation; returns a sorted copy."""
+        local_arr = _working_copy(arr)
+        
+        for i in range(1, len(local_arr)):
+            key = local_arr[i]
+            j = i - 1
+            while j >= 0 and local_arr[j] > key:
+                local_arr[j + 1] = local_arr[j]
+                j -= 1
+            local_arr[j + 1] = key
+        return _same_kind(local_arr, arr)
+
+    @staticmethod
+    def quick_sort(arr: List[int]) -> List[int]:
+        """Quick sort (Lomuto, last-element pivot) without instrumentation."""
+        array = _working_copy(arr)
+        stack = [(0, len(array) - 1)]
+        
+        while stack:
+            low, high = stack.pop()
+            if low < high:
+                pivot = array[high]
+                i = low - 1
+                for j in range(low, high):
+                    if array[j] <= pivot:
+                        i += 1
+                        array[i], array[j] = array[j], array[i]
+                pivot_index = i + 1
+                array[pivot_index], array[high] = array[high], array[pivot_index]
+                stack.append((pivot_index + 1, high))
+                stack.append((low, pivot_index - 1))
+        
+        return _same_kind(array, arr)
+
+    @staticmethod
+    def heap_sort(arr: List[int]) -> List[int]:
+        """Heap sort without instrumentation; returns a sorted copy."""
+        local_arr = _working_copy(arr)
+        n = len(local_arr)
+        
+        for i in range(n // 2 - 1, -1, -1):
+            _heapify(local_arr, n, i)
+        for i in range(n - 1, 0, -1):
+            local_arr[0], local_arr[i] = local_arr[i], local_arr[0]
+            _heapify(local_arr, i, 0)
+        return _same_kind(local_arr, arr)
+
+    @staticmethod
+    def shell_sort(arr: List[int]) -> List[int]:
+        """Shell sort without instrumentation; returns a sorted copy."""
+        local_arr = _working_copy(arr)
+        n = len(local_arr)
+        gap = n // 2
+        
+        while gap > 0:
+            for i in range(gap, n):
+                temp = local_arr[i]
+                j = i
+                while j >= gap and local_arr[j - gap] > temp:
+                    local_arr[j] = local_arr[j - gap]
+                    j -= gap
+                local_arr[j] = temp
+            gap //= 2
+        return _same_kind(local_arr, arr)
+
+    @staticmethod
+    def comb_sort(arr: List[int]) -> List[int]:
+        """Comb sort without instrumentation; returns a sorted copy."""
+        local_arr = _working_copy(arr)
+        n = len(local_arr)
+        gap = n
+        sorted_flag = False
+        
+        while not sorted_flag:
+            gap = int(gap / 1.3)
+            if gap <= 1:
+                gap = 1
+                sorted_flag = True
+            for i in range(n - gap):
+                if local_arr[i] > local_arr[i + gap]:
+                    local_arr[i], local_arr[i + gap] = local_arr[i + gap], local_arr[i]
+                    sorted_flag = False
+        return _same_kind(local_arr, arr)
+
+    @staticmethod
+    def radix_sort(arr: List[int]) -> List[int]:
+        """LSD base-10 radix sort without instrumentation; returns a sorted copy."""
+        local_arr = _working_copy(arr)
+        if not local_arr:
+            return _same_kind(local_arr, arr)
+        max_num = max(local_arr)
+        exp = 1
+        
+        while max_num // exp > 0:
+            output = local_arr[:]  # Same container type; every slot is overwritten
+            count = [0] * 10
+            for num in local_arr:
+                count[(num // exp) % 10] += 1
+            for i in range(1, 10):
+                count[i] += count[i - 1]
+            for num in reversed(local_arr):
+                digit = (num // exp) % 10
+                output[count[digit] - 1] = num
+                count[digit] -= 1
+            local_arr = output
+            exp *= 10
+        return _same_kind(local_arr, arr)
+
+    @staticmethod
+    def bucket_sort(arr: List[int]) -> List[int]:
+        """Bucket sort (10 buckets) without instrumentation; returns a sorted copy."""
+        local_arr = _working_copy(arr)
+        if not local_arr:
+            return _same_kind(local_arr, arr)
+        
+        bucket_count = 10
+        min_val = min(local_arr)
+        bucket_range = (max(local_arr) - min_val) / bucket_count or 1
+        buckets = [[] for _ in range(bucket_count)]
+        for num in local_arr:
+            buckets[min(int((num - min_val) / bucket_range), bucket_count - 1)].append(num)
+        
+        result = []
+        for bucket in buckets:
+            bucket.sort()
+            result.extend(bucket)
+        return _same_kind(result, arr)
+
+    @staticmethod
+    def bogo_sort(arr: List[int], max_iterations: int = 1000) -> List[int]:
+        """Bogo sort (limited iterations) without instrumentation."""
+        local_arr = _working_copy(arr)
+        iteration = 0
+        
+        while (iteration < max_iterations and
+               not all(local_arr[i] <= local_arr[i + 1] for i in range(len(local_arr) - 1))):
+            random.shuffle(local_arr)
+            iteration += 1
+        return _same_kind(local_arr, arr)
+
+    @staticmethod
+    def merge_sort(arr: List[int]) -> List[int]:
+        """Top-down merge sort without instrumentation; returns a sorted copy."""
+        local_arr = _working_copy(arr)
+        
+        def merge_sort_recursive(array, left, right):
+            if left < right:
+                mid = (left + right) // 2
+                merge_sort_recursive(array, left, mid)
+                merge_sort_recursive(array, mid + 1, right)
+                
+                left_arr = array[left:mid + 1]
+                right_arr = array[mid + 1:right + 1]
+                i = j = 0
+                k = left
+                while i < len(left_arr) and j < len(right_arr):
+                    if left_arr[i] <= right_arr[j]:
+                        array[k] = left_arr[i]
+                        i += 1
+                    else:
+                        array[k] = right_arr[j]
+                        j += 1
+                    k += 1
+                array[k:right + 1] = left_arr[i:] + right_arr[j:]
+        
+        merge_sort_recursive(local_arr, 0, len(local_arr) - 1)
+        return _same_kind(local_arr, arr)
+
+    @staticmethod
+    def tim_sort(arr: List[int]) -> List[int]:
+        """Timsort without instrumentation; returns a sorted copy."""
+        a = _working_copy(arr)
+        n = len(a)
+        runs = []  # Pending (base, length) runs
+        min_gallop = TIMSORT_MIN_GALLOP
+        
+        def count_run(lo):
+            hi = lo + 1
+            if hi == n:
+                return 1
+            if a[hi] < a[lo]:
+                # Strictly descending, so reversing keeps equal elements stable
+                hi += 1
+                while hi < n:
+                    if not a[hi] < a[hi - 1]:
+                        break
+                    hi += 1
+                i, j = lo, hi - 1
+                while i < j:
+                    a[i], a[j] = a[j], a[i]
+                    i += 1
+                    j -= 1
+            else:
+                hi += 1
+                while hi < n:
+                    if a[hi] < a[hi - 1]:
+                        break
+                    hi += 1
+            return hi - lo
+        
+        def binary_insertion(lo, hi, start):
+            for i in range(start, hi):
+                pivot = a[i]
+                left, right = lo, i
+                while left < right:
+                    mid = (left + right) // 2
+                    if pivot < a[mid]:
+                        right = mid
+                    else:
+                        left = mid + 1
+                for k in range(i, left, -1):
+                    a[k] = a[k - 1]
+                if left != i:
+                    a[left] = pivot
+        
+        def gallop(key, seq, base, length, hint, right):
+            """Insertion point of ``key`` in ``seq[base:base+length]``, searched outwards from ``hint``."""
+            def goes_after(i):
+                return not key < seq[i] if right else seq[i] < key
+            
+            last_ofs, ofs = 0, 1
+            if goes_after(base + hint):
+                max_ofs = length - hint
+                while ofs < max_ofs:
+                    if not goes_after(base + hint + ofs):
+                        break
+                    last_ofs, ofs = ofs, (ofs << 1) + 1
+                ofs = min(ofs, max_ofs)
+                last_ofs, ofs = last_ofs + hint, ofs + hint
+            else:
+                max_ofs = hint + 1
+                while ofs < max_ofs:
+                    if goes_after(base + hint - ofs):
+                        break
+                    last_ofs, ofs = ofs, (ofs << 1) + 1
+                ofs = min(ofs, max_ofs)
+                last_ofs, ofs = hint - ofs, hint - last_ofs
+            
+            # Now the answer lies in (last_ofs, ofs]; finish with a binary search
+            last_ofs += 1
+            while last_ofs < ofs:
+                mid = last_ofs + ((ofs - last_ofs) >> 1)
+                if goes_after(base + mid):
+                    last_ofs = mid + 1
+                else:
+                    ofs = mid
+            return ofs
+        
+        def merge_lo(base1, len1, base2, len2):
+            # Run 1 is the shorter: copy it aside and merge forwards into its slots
+            nonlocal min_gallop
+            tmp = a[base1:base1 + len1]
+            cursor1, cursor2, dest = 0, base2, base1
+            end2 = base2 + len2
+            
+            while cursor1 < len1 and cursor2 < end2:
+                wins1 = wins2 = 0
+                while cursor1 < len1 and cursor2 < end2:
+                    if a[cursor2] < tmp[cursor1]:
+                        a[dest] = a[cursor2]
+                        cursor2 += 1
+                        wins1, wins2 = 0, wins2 + 1
+                    else:
+                        a[dest] = tmp[cursor1]
+                        cursor1 += 1
+                        wins1, wins2 = wins1 + 1, 0
+                    dest += 1
+                    if wins1 >= min_gallop or wins2 >= min_gallop:
+                        break
+                
+                # Galloping: move whole stretches that one run wins outright
+                while cursor1 < len1 and cursor2 < end2:
+                    count1 = gallop(a[cursor2], tmp, cursor1, len1 - cursor1, 0, True)
+                    a[dest:dest + count1] = tmp[cursor1:cursor1 + count1]
+                    dest += count1
+                    cursor1 += count1
+                    count2 = 0
+                    if cursor1 < len1:
+                        count2 = gallop(tmp[cursor1], a, cursor2, end2 - cursor2, 0, False)
+                        a[dest:dest + count2] = a[cursor2:cursor2 + count2]
+                        dest += count2
+                        cursor2 += count2
+                    if count1 < TIMSORT_MIN_GALLOP and count2 < TIMSORT_MIN_GALLOP:
+                        min_gallop += 1
+                        break
+                    min_gallop = max(1, min_gallop - 1)
+            
+            # Leftovers of run 2 are already in place
+            a[dest:dest + len1 - cursor1] = tmp[cursor1:]
+        
+        def merge_hi(base1, len1, base2, len2):
+            # Run 2 is the shorter: copy it aside and merge backwards into its slots
+            nonlocal min_gallop
+            tmp = a[base2:base2 + len2]
+            cursor1, cursor2, dest = base1 + len1 - 1, len2 - 1, base2 + len2 - 1
+            
+            while cursor1 >= base1 and cursor2 >= 0:
+                wins1 = wins2 = 0
+                while cursor1 >= base1 and cursor2 >= 0:
+                    if tmp[cursor2] < a[cursor1]:
+                        a[dest] = a[cursor1]
+                        cursor1 -= 1
+                        wins1, wins2 = wins1 + 1, 0
+                    else:
+                        a[dest] = tmp[cursor2]
+                        cursor2 -= 1
+                        wins1, wins2 = 0, wins2 + 1
+                    dest -= 1
+                    if wins1 >= min_gallop or wins2 >= min_gallop:
+                        break
+                
+                while cursor1 >= base1 and cursor2 >= 0:
+                    length1 = cursor1 - base1 + 1
+                    keep1 = gallop(tmp[cursor2], a, base1, length1, length1 - 1, True)
+                    count1 = length1 - keep1
+                    a[dest - count1 + 1:dest + 1] = a[cursor1 - count1 + 1:cursor1 + 1]
+                    dest -= count1
+                    cursor1 -= count1
+                    count2 = 0
+                    if cursor1 >= base1:
+                        keep2 = gallop(a[cursor1], tmp, 0, cursor2 + 1, cursor2, False)
+                        count2 = cursor2 + 1 - keep2
+                        a[dest - count2 + 1:dest + 1] = tmp[cursor2 - count2 + 1:cursor2 + 1]
+                        dest -= count2
+                        cursor2 -= count2
+                    if count1 < TIMSORT_MIN_GALLOP and count2 < TIMSORT_MIN_GALLOP:
+                        min_gallop += 1
+                        break
+                    min_gallop = max(1, min_gallop - 1)
+            
+            # Leftovers of run 1 are already in place
+            a[dest - cursor2:dest + 1] = tmp[:cursor2 + 1]
+        
+        def merge_at(i):
+            base1, len1 = runs[i]
+            base2, len2 = runs[i + 1]
+            runs[i] = (base1, len1 + len2)
+            del runs[i + 1]
+            
+            # Skip the prefix of run 1 and the suffix of run 2 that are already in place
+            skip = gallop(a[base2], a, base1, len1, 0, True)
+            base1, len1 = base1 + skip, len1 - skip
+            if len1 == 0:
+                return
+            len2 = gallop(a[base1 + len1 - 1], a, base2, len2, len2 - 1, False)
+            if len2 == 0:
+                return
+            if len1 <= len2:
+                merge_lo(base1, len1, base2, len2)
+            else:
+                merge_hi(base1, len1, base2, len2)
+        
+        def merge_collapse():
+            while len(runs) > 1:
+                i = len(runs) - 2
+                if ((i > 0 and runs[i - 1][1] <= runs[i][1] + runs[i + 1][1])
+                        or (i > 1 and runs[i - 2][1] <= runs[i - 1][1] + runs[i][1])):
+                    if runs[i - 1][1] < runs[i + 1][1]:
+                        i -= 1
+                elif runs[i][1] > runs[i + 1][1]:
+                    break
+                merge_at(i)
+        
+        min_run = n
+        extra = 0
+        while min_run >= 64:
+            extra |= min_run & 1
+            min_run >>= 1
+        min_run += extra
+        
+        lo = 0
+        while lo < n:
+            run = count_run(lo)
+            if run < min_run:
+                forced = min(min_run, n - lo)
+                binary_insertion(lo, lo + forced, lo + run)
+                run = forced
+            runs.append((lo, run))
+            merge_collapse()
+            lo += run
+        
+        while len(runs) > 1:
+            i = len(runs) - 2
+            if i > 0 and runs[i - 1][1] < runs[i + 1][1]:
+                i -= 1
+            merge_at(i)
+        
+        return _same_kind(a, arr)
+    
+    @staticmethod
+    def intro_sort(arr: List[int]) -> List[int]:
+        """Introsort without instrumentation; returns a sorted copy."""
+        a = _working_copy(arr)
+        n = len(a)
+        stack = [(0, n, 2 * n.bit_length())] if n > 1 else []  # (lo, hi, depth budget)
+        
+        while stack:
+            lo, hi, budget = stack.pop()
+            if hi - lo <= INTROSORT_CUTOFF:
+                _insertion_sort_range(a, lo, hi)
+                continue
+            if budget == 0:
+                _heap_sort_range(a, lo, hi)
+                continue
+            
+            j = _partition_median_of_three(a, lo, hi)
+            stack.append((j + 1, hi, budget - 1))
+            stack.append((lo, j + 1, budget - 1))
+        
+        return _same_kind(a, arr)
+    
+    @staticmethod
+    def pdq_sort(arr: List[int]) -> List[int]:
+        """Pattern-defeating quicksort without instrumentation; returns a sorted copy."""
+        a = _working_copy(arr)
+        n = len(a)
+        
+        def sort2(i, j):
+            if a[j] < a[i]:
+                a[i], a[j] = a[j], a[i]
+        
+        def sort3(i, j, k):
+            sort2(i, j)
+            sort2(j, k)
+            sort2(i, j)
+        
+        def swap(i, j):
+            a[i], a[j] = a[j], a[i]
+        
+        def partition_right(begin, end):
+            # Elements < pivot go left; returns (pivot position, no swaps were needed)
+            pivot = a[begin]
+            first = begin + 1
+            while a[first] < pivot:
+                first += 1
+            last = end
+            if first - 1 == begin:
+                while first < last:
+                    last -= 1
+                    if a[last] < pivot:
+                        break
+            else:
+                while True:
+                    last -= 1
+                    if a[last] < pivot:
+                        break
+            
+            already_partitioned = first >= last
+            while first < last:
+                swap(first, last)
+                first += 1
+                while a[first] < pivot:
+                    first += 1
+                last -= 1
+                while not a[last] < pivot:
+                    last -= 1
+            
+            pivot_pos = first - 1
+            a[begin] = a[pivot_pos]
+            a[pivot_pos] = pivot
+            return pivot_pos, already_partitioned
+        
+        def partition_left(begin, end):
+            # Elements equal to the pivot go left, and are then done
+            pivot = a[begin]
+            last = end - 1
+            while pivot < a[last]:
+                last -= 1
+            first = begin
+            if last + 1 == end:
+                while first < last:
+                    first += 1
+                    if pivot < a[first]:
+                        break
+            else:
+                while True:
+                    first += 1
+                    if pivot < a[first]:
+                        break
+            
+            while first < last:
+                swap(first, last)
+                last -= 1
+                while pivot < a[last]:
+                    last -= 1
+                first += 1
+                while not pivot < a[first]:
+                    first += 1
+            
+            a[begin] = a[last]
+            a[last] = pivot
+            return last
+        
+        def partial_insertion_sort(begin, end):
+            # Insertion sort that gives up after moving PDQSORT_PARTIAL_LIMIT elements
+            moved = 0
+            for cur in range(begin + 1, end):
+                if moved > PDQSORT_PARTIAL_LIMIT:
+                    return False
+                if a[cur] < a[cur - 1]:
+                    key = a[cur]
+                    sift = cur
+                    while True:
+                        a[sift] = a[sift - 1]
+                        sift -= 1
+                        if sift == begin:
+                            break
+                        if not key < a[sift - 1]:
+                            break
+                    a[sift] = key
+                    moved += cur - sift
+            return True
+        
+        stack = [(0, n, max(1, n.bit_length() - 1), True)] if n > 1 else []
+        
+        while stack:
+            # (begin, end, bad partitions still allowed, leftmost)
+            begin, end, bad_allowed, leftmost = stack.pop()
+            size = end - begin
+            if size < PDQSORT_CUTOFF:
+                _insertion_sort_range(a, begin, end)
+                continue
+            
+            half = size // 2
+            if size > PDQSORT_NINTHER_THRESHOLD:
+                sort3(begin, begin + half, end - 1)
+                sort3(begin + 1, begin + half - 1, end - 2)
+                sort3(begin + 2, begin + half + 1, end - 3)
+                sort3(begin + half - 1, begin + half, begin + half + 1)
+                swap(begin, begin + half)
+            else:
+                sort3(begin + half, begin, end - 1)
+            
+            if not leftmost:
+                # Pivot equal to the element before this range: group the equal keys
+                if not a[begin - 1] < a[begin]:
+                    pivot_pos = partition_left(begin, end)
+                    stack.append((pivot_pos + 1, end, bad_allowed, False))
+                    continue
+            
+            pivot_pos, already_partitioned = partition_right(begin, end)
+            left_size = pivot_pos - begin
+            right_size = end - (pivot_pos + 1)
+            
+            if left_size < size // 8 or right_size < size // 8:
+                bad_allowed -= 1
+                if bad_allowed == 0:
+                    _heap_sort_range(a, begin, end)
+                    continue
+                if left_size >= PDQSORT_CUTOFF:
+                    quarter = left_size // 4
+                    swap(begin, begin + quarter)
+                    swap(pivot_pos - 1, pivot_pos - quarter)
+                    if left_size > PDQSORT_NINTHER_THRESHOLD:
+                        swap(begin + 1, begin + quarter + 1)
+                        swap(begin + 2, begin + quarter + 2)
+                        swap(pivot_pos - 2, pivot_pos - (quarter + 1))
+                        swap(pivot_pos - 3, pivot_pos - (quarter + 2))
+                if right_size >= PDQSORT_CUTOFF:
+                    quarter = right_size // 4
+                    swap(pivot_pos + 1, pivot_pos + 1 + quarter)
+                    swap(end - 1, end - quarter)
+                    if right_size > PDQSORT_NINTHER_THRESHOLD:
+                        swap(pivot_pos + 2, pivot_pos + 2 + quarter)
+                        swap(pivot_pos + 3, pivot_pos + 3 + quarter)
+                        swap(end - 2, end - (1 + quarter))
+                        swap(end - 3, end - (2 + quarter))
+            elif already_partitioned:
+                # Likely (nearly) sorted: try to finish both sides cheaply
+                left_done = partial_insertion_sort(begin, pivot_pos)
+                if left_done:
+                    right_done = partial_insertion_sort(pivot_pos + 1, end)
+                    if right_done:
+                        continue
+            
+            stack.append((pivot_pos + 1, end, bad_allowed, False))
+            stack.append((begin, pivot_pos, bad_allowed, leftmost))
+        
+        return _same_kind(a, arr)
+    
+    @staticmethod
+    def quickselect(arr: List[int], k: Optional[int] = None) -> List[int]:
+        """Introselect without instrumentation; returns a copy with the k-th smallest at index k."""
+        a = _working_copy(arr)
+        _select(a, 0, len(a), selection_k('15', len(a)) if k is None else k)
+        return _same_kind(a, arr)
+    
+    @staticmethod
+    def heap_top_k(arr: List[int], k: Optional[int] = None) -> List[int]:
+        """Heap top-k without instrumentation; returns a copy with the k smallest in front."""
+        a = _working_copy(arr)
+        n = len(a)
+        k = selection_k('16', n) if k is None else k
+        if k == 0:
+            return _same_kind(a, arr)
+        
+        for i in range(k // 2 - 1, -1, -1):
+            _heapify(a, k, i)
+        for i in range(k, n):
+            if a[i] < a[0]:
+                a[0], a[i] = a[i], a[0]
+                _heapify(a, k, 0)
+        return _same_kind(a, arr)
+    
+    @staticmethod
+    def partial_sort(arr: List[int], k: Optional[int] = None) -> List[int]:
+        """Partial sort without instrumentation; returns a copy with the k smallest sorted in front."""
+        a = _working_copy(arr)
+        k = selection_k('17', len(a)) if k is None else k
+        if k:
+            _select(a, 0, len(a), k - 1)
+            _heap_sort_range(a, 0, k)
+        return _same_kind(a, arr)
+
+# --- Batch Sorting ---
+
+BATCH_METHODS = ('auto', 'odd-even', 'bitonic', 'insertion', 'shell')
+
+
+@lru_cache(maxsize=None)
+def _odd_even_merge_network(size: int) -> Tuple[Tuple[int, int], ...]:
+    """Batcher's odd-even merge sorting network for ``size`` (a power of two) inputs.
+    
+    Returns the comparators in order as ``(lo, hi)`` pairs; each one leaves
+    the smaller of its two values at ``lo``.
+    """
+    comparators = []
+    p = 1
+    while p < size:
+        k = p
+        while k >= 1:
+            for j in range(k % p, size - k, 2 * k):
+                for i in range(min(k, size - j - k)):
+                    if (i + j) // (2 * p) == (i + j + k) // (2 * p):
+                        comparators.append((i + j, i + j + k))
+            k //= 2
+        p *= 2
+    return tuple(comparators)
+
+
+@lru_cache(maxsize=None)
+def _bitonic_network(size: int) -> Tuple[Tuple[int, int], ...]:
+    """Bitonic sorting network for ``size`` (a power of two) inputs, in the same form."""
+    comparators = []
+    k = 2
+    while k <= size:
+        j = k // 2
+        while j >= 1:
+            for i in range(size):
+                if i ^ j > i:
+                    comparators.append((i, i ^ j) if i & k == 0 else (i ^ j, i))
+            j //= 2
+        k *= 2
+    return tuple(comparators)
+
+
+def _compare_exchange(low, high, scratch) -> None:
+    """Order ``low`` <= ``high`` element-wise in place, for every row of a block at once."""
+    import numpy as np
+    
+    np.minimum(low, high, out=scratch)
+    np.maximum(low, high, out=high)
+    low[...] = scratch
+
+
+def _sort_block_columns(columns, width: int, method: str, scratch) -> None:
+    """Sort a block stored column-wise (one row per column) with ``method``, in place."""
+    if method in ('odd-even', 'bitonic'):
+        network = _odd_even_merge_network if method == 'odd-even' else _bitonic_network
+        for lo, hi in network(len(columns)):
+            _compare_exchange(columns[lo], columns[hi], scratch)
+        return
+    
+    gap = width // 2 if method == 'shell' else 1
+    while gap > 0:
+        for i in range(gap, width):
+            for j in range(i, gap - 1, -gap):
+                if not (columns[j - gap] > columns[j]).any():
+                    break
+                _compare_exchange(columns[j - gap], columns[j], scratch)
+        gap //= 2
+
+
+def sort_rows(rows, method: str = 'auto'):
+    """Sort every row of a 2-D array with vectorized compare-exchanges; returns a sorted copy.
+    
+    Rows are handled in cache-sized blocks, transposed so that each step is
+    one compare-exchange across all rows of the block. 'odd-even' and
+    'bitonic' run Batcher's sorting networks, with rows padded to a power of
+    two. 'insertion' and 'shell' replay ``SortingAlgorithms.insertion_sort``'s
+    and ``shell_sort``'s passes as compare-exchanges, ending each insertion as
+    soon as no row in the block moves. 'auto' uses odd-even merge up to
+    ``BATCH_NETWORK_MAX_WIDTH`` columns and shell sort beyond. NaNs sort
+    last, as in ``np.sort``. A NumPy array in gives a NumPy array out;
+    nested lists give nested lists.
+    """
+    import numpy as np
+    
+    if method not in BATCH_METHODS:
+        raise ValueError(f"Unknown method {method!r}; expected one of {', '.join(BATCH_METHODS)}")
+    values = np.asarray(rows)
+    if values.ndim != 2:
+        raise ValueError(f"sort_rows needs a 2-D array, not {values.ndim}-D")
+    
+    count, width = values.shape
+    if method == 'auto':
+        method = 'odd-even' if width <= BATCH_NETWORK_MAX_WIDTH else 'shell'
+    result = values.copy()
+    if width < 2 or count == 0:
+        return result if isinstance(rows, np.ndarray) else result.tolist()
+    
+    # Min/max would spread a NaN over its whole row, so sort NaNs as infinity and restore them at the end
+    nan_counts = None
+    if values.dtype.kind == 'f':
+        missing = np.isnan(values)
+        if missing.any():
+            nan_counts = missing.sum(axis=1)
+            values = np.where(missing, np.inf, values)
+    
+    height = 1 << (width - 1).bit_length() if method in ('odd-even', 'bitonic') else width
+    columns = np.empty((height, min(BATCH_BLOCK_ROWS, count)), dtype=values.dtype)
+    # Padding holds the largest value, so it stays in the rows that are cut off
+    columns[width:] = np.iinfo(values.dtype).max if values.dtype.kind in 'iu' else np.inf
+    scratch = np.empty(columns.shape[1], dtype=values.dtype)
+    
+    for start in range(0, count, BATCH_BLOCK_ROWS):
+        stop = min(start + BATCH_BLOCK_ROWS, count)
+        block = columns[:, :stop - start]
+        block[:width] = values[start:stop].T
+        _sort_block_columns(block, width, method, scratch[:stop - start])
+        result[start:stop] = block[:width].T
+    
+    if nan_counts is not None:
+        result[np.arange(width) >= (width - nan_counts)[:, None]] = np.nan
+    return result if isinstance(rows, np.ndarray) else result.tolist()
+
+# --- Record Sorting ---
+
+_COMPLEMENT = bytes(range(255, -1, -1))  # translate() table flipping each byte, for reverse byte keys
+
+
+def _encode_key_column(values: list, name: str) -> List[bytes]:
+    """Fixed-width big-endian byte strings ordered like ``values`` (all ints, all strs or all bytes).
+    
+    Ints are offset by the column minimum. Strings are UTF-8 encoded (which
+    keeps code point order) and zero-padded to the longest, followed by their
+    length so that a prefix still sorts before its extensions.
+    """
+    if all(isinstance(value, int) for value in values):
+        low = min(values)
+        width = max(1, ((max(values) - low).bit_length() + 7) // 8)
+        return [(value - low).to_bytes(width, 'big') for value in values]
+    
+    if all(isinstance(value, str) for value in values):
+        values = [value.encode('utf-8') for value in values]
+    elif not all(isinstance(value, bytes) for value in values):
+        kinds = sorted({type(value).__name__ for value in values})
+        raise TypeError(f"{name} needs int, str or bytes keys (or tuples of them), got {', '.join(kinds)}")
+    longest = max(len(value) for value in values)
+    length_width = max(1, (longest.bit_length() + 7) // 8)
+    return [value.ljust(longest, b'\0') + len(value).to_bytes(length_width, 'big') for value in values]
+
+
+def byte_keys(keys: list, reverse: bool = False, name: str = 'Radix Sort') -> List[bytes]:
+    """Equal-length byte strings whose lexicographic order is the order of ``keys``.
+    
+    ``keys`` are ints, strs or bytes, or same-length tuples of them; each tuple
+    position becomes a fixed-width column. With ``reverse`` every byte is
+    complemented, so ascending byte order is descending key order and a
+    stable sort still keeps equal keys in input order.
+    """
+    if not keys:
+        return []
+    if all(isinstance(key, tuple) for key in keys) and len({len(key) for key in keys}) == 1:
+        columns = [_encode_key_column(list(column), name) for column in zip(*keys)]
+        encoded = [b''.join(parts) for parts in zip(*columns)]
+    else:
+        encoded = _encode_key_column(keys, name)
+    return [key.translate(_COMPLEMENT) for key in encoded] if reverse else encoded
+
+
+def _varying_positions(encoded: List[bytes]) -> List[int]:
+    """Byte positions where not every key has the same byte; the others cannot change the order."""
+    first = encoded[0]
+    return [position for position in range(len(first))
+            if any(key[position] != first[position] for key in encoded)]
+
+
+def _radix_sort_byte_keys(encoded: List[bytes]) -> List[int]:
+    """Stable LSD radix sort of record indices by one byte of their key per pass."""
+    order = list(range(len(encoded)))
+    for position in reversed(_varying_positions(encoded)):
+        buckets = [[] for _ in range(256)]
+        for index in order:
+            buckets[encoded[index][position]].append(index)
+        order = [index for bucket in buckets for index in bucket]
+    return order
+
+
+def _bucket_sort_byte_keys(encoded: List[bytes]) -> List[int]:
+    """Stable bucket sort of record indices on the first byte that varies, then on the whole key."""
+    positions = _varying_positions(encoded)
+    if not positions:
+        return list(range(len(encoded)))
+    
+    buckets = [[] for _ in range(256)]
+    for index, key in enumerate(encoded):
+        buckets[key[positions[0]]].append(index)
+    order = []
+    for bucket in buckets:
+        bucket.sort(key=encoded.__getitem__)
+        order.extend(bucket)
+    return order
+
+
+def sort_records(records, key: Optional[Callable] = None, reverse: bool = False, choice: str = '11') -> list:
+    """Sort any records with algorithm ``choice``, like ``sorted(records, key=key, reverse=reverse)``.
+    
+    ``key`` is called exactly once per record, and the algorithm sorts the
+    cached keys (decorate-sort-undecorate). Comparison sorts get ``(key,
+    position)`` pairs, so every algorithm is stable: equal keys keep their
+    input order, with or without ``reverse``. Radix and Bucket Sort work on
+    ``byte_keys`` instead, and need int, str or bytes keys or tuples of them.
+    Selection algorithms and Bogo Sort, which may give up unsorted, raise
+    ``ValueError``, as do unknown choices.
+    """
+    if choice not in ALGORITHM_NAMES:
+        raise ValueError(f"Unknown algorithm choice {choice!r}")
+    if choice in SELECTION_ALGORITHMS:
+        raise ValueError(f"{ALGORITHM_NAMES[choice]} selects rather than sorts; use a sorting algorithm")
+    if choice in BOUNDED_ALGORITHMS:
+        raise ValueError(f"{ALGORITHM_NAMES[choice]} may stop before the records are sorted; "
+                         f"use a sorting algorithm")
+    records = list(records)
+    keys = records if key is None else [key(record) for record in records]
+    if len(records) < 2:
+        return records
+    
+    if choice in ('8', '9'):
+        encoded = byte_keys(keys, reverse, ALGORITHM_NAMES[choice])
+        order = _radix_sort_byte_keys(encoded) if choice == '8' else _bucket_sort_byte_keys(encoded)
+        return [records[index] for index in order]
+    
+    # Ties break on position; negated under reverse so flipping the result keeps them in input order
+    sign = -1 if reverse else 1
+    decorated = get_algorithm_function(choice, fast=True)(
+        [(record_key, sign * index) for index, record_key in enumerate(keys)])
+    result = [records[sign * tie] for _, tie in decorated]
+    if reverse:
+        result.reverse()
+    return result
+
+
+def count_key_calls(sort_func, records, key: Callable) -> int:
+    """How many times ``sort_func(records, key=...)`` calls ``key`` while sorting a copy of ``records``."""
+    calls = 0
+    
+    def counted(record):
+        nonlocal calls
+        calls += 1
+        return key(record)
+    
+    sort_func(list(records), key=counted)
+    return calls
+
+
+# --- Operation Counters ---
+
+class OperationCounts:
+    """Uniform work counters for one algorithm run.
+
+    ``comparisons`` counts key comparisons (including ones made off the array,
+    e.g. inside bucket sort's buckets), ``swaps`` counts exchanges of two
+    array elements and ``writes`` counts single-element stores into the array.
+    ``aux_peak`` is the largest number of auxiliary elements alive at once,
+    ``aux_allocated`` the total ever allocated, and ``max_depth`` the deepest
+    recursion level reached. Counters are derived from the operation stream
+    of the instrumented generators, so the uninstrumented variants pay nothing.
+    """
+    
+    FIELDS = ('comparisons', 'swaps', 'writes', 'aux_peak', 'aux_allocated', 'max_depth')
+    __slots__ = FIELDS + ('aux_live',)
+    
+    def __init__(self):
+        for field in self.__slots__:
+            setattr(self, field, 0)
+    
+    def add(self, op_code: int, arg1: int) -> None:
+        """Tally a single operation from a generator stream."""
+        if op_code == OP_COMPARE:
+            self.comparisons += 1
+        elif op_code == OP_SWAP:
+            self.swaps += 1
+        elif op_code == OP_WRITE:
+            self.writes += 1
+        elif op_code == OP_META_COMPARES:
+            self.comparisons += arg1
+        elif op_code == OP_META_ALLOC:
+            self.aux_live += arg1
+            if arg1 > 0:
+                self.aux_allocated += arg1
+                self.aux_peak = max(self.aux_peak, self.aux_live)
+        elif op_code == OP_META_DEPTH:
+            self.max_depth = max(self.max_depth, arg1)
+    
+    def as_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+    
+    def summary(self) -> str:
+        return (f"{self.comparisons} comparisons, {self.swaps} swaps, {self.writes} writes, "
+                f"aux peak {self.aux_peak} elements, depth {self.max_depth}")
+
+
+def count_operations(algo_func, initial_array: List[int]) -> OperationCounts:
+    """Run an operation generator and tally its counters without storing a trace."""
+    counts = OperationCounts()
+    add = counts.add
+    for op_code, arg1, _ in algo_func(list(initial_array)):
+        add(op_code, arg1)
+    return counts
+
+# --- Sortedness Tracking ---
+
+class SortednessTracker:
+    """Live sortedness metrics of an array, updated in O(1) per swap or write.
+    
+    Adjacent inversions (descents) are counted exactly: the array is sorted
+    when there are none, and it splits into ``descents + 1`` ascending runs.
+    Counting every inversion would cost O(n) per update, so the Kendall tau
+    inversion count is estimated from a fixed sample of index pairs instead,
+    ``(x, (m * x + b) mod n)`` for a few affine permutations, in which every
+    index takes part in a bounded number of pairs. Arrays of up to
+    ``SORTEDNESS_EXACT_MAX`` elements track every pair exactly.
+    
+    The tracker owns the mutations: apply operations through ``swap`` and
+    ``write`` rather than to ``array`` directly.
+    """
+    
+    def __init__(self, values: List[int]):
+        n = len(values)
+        self.exact = n <= SORTEDNESS_EXACT_MAX
+        # (multiplier, offset, inverse multiplier) of each sampling permutation
+        self._permutations = []
+        if not self.exact:
+            for fraction in SORTEDNESS_SAMPLE_STRIDES:
+                multiplier = max(2, int(n * fraction))
+                while math.gcd(multiplier, n) != 1:
+                    multiplier += 1
+                offset = int(n * fraction * fraction)
+                self._permutations.append((multiplier, offset, pow(multiplier, -1, n)))
+        if self.exact:
+            self.sample_size = n * (n - 1) // 2
+        else:
+            # Fixed points pair an index with itself and are never inverted
+            self.sample_size = sum(n - sum(1 for x in range(n) if (m * x + b) % n == x)
+                                   for m, b, _ in self._permutations)
+        self.reset(values)
+    
+    def reset(self, values: List[int]) -> None:
+        """Start tracking ``values`` (a list the tracker will mutate), recounting in O(n)."""
+        import operator
+        
+        self.array = values
+        n = len(values)
+        self.adjacent_inversions = sum(map(operator.gt, values, islice(values, 1, None)))
+        if self.exact:
+            self.sampled_inversions = sum(values[x] > values[y] for x in range(n) for y in range(x + 1, n))
+        else:
+            self.sampled_inversions = sum(
+                (values[x] > values[y]) if x < y else (values[y] > values[x])
+                for m, b, _ in self._permutations
+                for x, y in zip(range(n), ((m * x + b) % n for x in range(n))))
+    
+    def _pair_inversions(self, x: int, skip: int = -1) -> int:
+        """Inverted tracked pairs that include index ``x``, leaving out its pairs with ``skip``."""
+        a = self.array
+        n = len(a)
+        value = a[x]
+        inversions = 0
+        if self.exact:
+            for y in range(n):
+                if y != skip and ((value > a[y]) if x < y else (a[y] > value)):
+                    inversions += 1
+            return inversions
+        for m, b, inverse in self._permutations:
+            y = (m * x + b) % n
+            if y != skip and ((value > a[y]) if x < y else (a[y] > value)):
+                inversions += 1
+            y = inverse * (x - b) % n
+            if y != skip and ((value > a[y]) if x < y else (a[y] > value)):
+                inversions += 1
+        return inversions
+    
+    def _descents_around(self, i: int) -> int:
+        """Descents between element ``i`` and its neighbours."""
+        a = self.array
+        value = a[i]
+        return (i > 0 and a[i - 1] > value) + (i + 1 < len(a) and value > a[i + 1])
+    
+    def swap(self, i: int, j: int) -> None:
+        """Exchange elements ``i`` and ``j`` of the tracked array."""
+        if i == j:
+            return
+        if i > j:
+            i, j = j, i
+        a = self.array
+        # The pair (i, j) is seen from i's side only, and the descent between neighbours once
+        before = self._pair_inversions(i) + self._pair_inversions(j, i)
+        descents = self._descents_around(i) + (j > i + 1 and self._descents_around(j)) + \
+            (j == i + 1 and j + 1 < len(a) and a[j] > a[j + 1])
+        a[i], a[j] = a[j], a[i]
+        self.sampled_inversions += self._pair_inversions(i) + self._pair_inversions(j, i) - before
+        self.adjacent_inversions += self._descents_around(i) + (j > i + 1 and self._descents_around(j)) + \
+            (j == i + 1 and j + 1 < len(a) and a[j] > a[j + 1]) - descents
+    
+    def write(self, i: int, value: int) -> None:
+        """Store ``value`` at index ``i`` of the tracked array."""
+        before = self._pair_inversions(i)
+        descents = self._descents_around(i)
+        self.array[i] = value
+        self.sampled_inversions += self._pair_inversions(i) - before
+        self.adjacent_inversions += self._descents_around(i) - descents
+    
+    @property
+    def is_sorted(self) -> bool:
+        return self.adjacent_inversions == 0
+    
+    @property
+    def runs(self) -> int:
+        """Number of maximal ascending runs."""
+        return self.adjacent_inversions + 1 if self.array else 0
+    
+    @property
+    def inversion_fraction(self) -> float:
+        """Share of (sampled) pairs that are out of order: 0 when sorted, 1 when reversed."""
+        return self.sampled_inversions / self.sample_size if self.sample_size else 0.0
+    
+    @property
+    def inversions(self) -> int:
+        """Estimated number of inverted pairs (exact for small arrays)."""
+        n = len(self.array)
+        return round(self.inversion_fraction * (n * (n - 1) // 2))
+    
+    @property
+    def kendall_tau(self) -> float:
+        """Estimated Kendall rank correlation with the sorted order, from -1 to 1."""
+        return 1 - 2 * self.inversion_fraction
+    
+    @property
+    def percent_sorted(self) -> float:
+        """Share of pairs in order, as a percentage; 100 only once the array is sorted."""
+        if self.is_sorted:
+            return 100.0
+        return min(99.9, 100 * (1 - self.inversion_fraction))
+
+# --- Operation Traces ---
+
+class OperationTrace:
+    """Compact, seekable record of an algorithm run.
+
+    The initial array is stored once and the operations are kept in three
+    parallel typed buffers, so memory grows with the number of steps rather
+    than with steps times array length. Every ``keyframe_interval`` operations
+    a full snapshot of the array is kept as well, so any frame can be rebuilt
+    by replaying at most ``keyframe_interval`` operations. Smaller intervals
+    seek faster and use more memory.
+
+    Frame ``k`` is the array after applying operations ``0..k`` with that
+    operation's indices highlighted; the last frame (``len(trace) - 1``) is the
+    final array with nothing highlighted.
+    """
+    
+    def __init__(self, initial_array: List[int], keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+        self.initial_array = array('q', initial_array)
+        self.keyframe_interval = keyframe_interval
+        self.op_codes = array('b')
+        self.op_args1 = array('q')
+        self.op_args2 = array('q')
+        # Snapshot m (concatenated) is the array after m * keyframe_interval operations
+        self.keyframes = array('q', self.initial_array)
+        self._keyframed_ops = 0
+        # Counters from meta operations, which are not stored as frames
+        self.meta_counts = OperationCounts()
+    
+    def append(self, op_code: int, arg1: int, arg2: int) -> None:
+        """Record a single operation; meta operations only update counters."""
+        if op_code >= OP_META:
+            self.meta_counts.add(op_code, arg1)
+            return
+        self.op_codes.append(op_code)
+        self.op_args1.append(arg1)
+        self.op_args2.append(arg2)
+    
+    @property
+    def counts(self) -> OperationCounts:
+        """Operation counters for the recorded run."""
+        counts = OperationCounts()
+        for field in OperationCounts.__slots__:
+            setattr(counts, field, getattr(self.meta_counts, field))
+        # Memory-mapped traces hold memoryviews, which have no count()
+        op_codes = self.op_codes if isinstance(self.op_codes, array) else bytes(self.op_codes)
+        counts.comparisons += op_codes.count(OP_COMPARE)
+        counts.swaps = op_codes.count(OP_SWAP)
+        counts.writes = op_codes.count(OP_WRITE)
+        return counts
+    
+    @property
+    def operation_count(self) -> int:
+        return len(self.op_codes)
+    
+    @property
+    def keyframe_count(self) -> int:
+        n = len(self.initial_array)
+        return len(self.keyframes) // n if n else 0
+    
+    @property
+    def nbytes(self) -> int:
+        """Approximate buffer memory held by the trace."""
+        return sum(buf.itemsize * len(buf) for buf in
+                   (self.initial_array, self.op_codes, self.op_args1, self.op_args2, self.keyframes))
+    
+    def __len__(self) -> int:
+        """Number of frames, including the final un-highlighted frame."""
+        return len(self.op_codes) + 1
+    
+    def build_keyframes(self) -> None:
+        """Snapshot the array every ``keyframe_interval`` operations.
+
+        Only operations appended since the last call are replayed, so this can
+        be called repeatedly while a trace is still growing.
+        """
+        n = len(self.initial_array)
+        interval = self.keyframe_interval
+        last_keyframe = self._keyframed_ops // interval
+        
+        if n == 0:
+            self._keyframed_ops = self.operation_count
+            return
+        
+        current_array = self.keyframe(last_keyframe)
+        position = last_keyframe * interval
+        while position + interval <= self.operation_count:
+            _apply_operations(self, current_array, position, position + interval)
+            position += interval
+            self.keyframes.extend(current_array)
+        self._keyframed_ops = self.operation_count
+    
+    def keyframe(self, index: int) -> array:
+        """Copy of the array after ``index * keyframe_interval`` operations, as ``array('q')``."""
+        snapshot = array('q')
+        snapshot.frombytes(self._keyframe_view(index).cast('B'))
+        return snapshot
+    
+    def _keyframe_view(self, index: int) -> memoryview:
+        """Zero-copy view of keyframe ``index``."""
+        n = len(self.initial_array)
+        return memoryview(self.keyframes)[index * n:(index + 1) * n]
+    
+    def replayer(self, track_sortedness: bool = False) -> 'TraceReplayer':
+        """Create a cursor that reconstructs frames of this trace."""
+        return TraceReplayer(self, track_sortedness)
+    
+    def frame(self, index: int) -> FrameData:
+        """Reconstruct a single frame as an independent ``(array, idx1, idx2)`` tuple."""
+        current_array, idx1, idx2 = self.replayer().seek(index)
+        return current_array[:], idx1, idx2
+    
+    def final_array(self) -> array:
+        """Array after all operations have been applied, as ``array('q')``."""
+        return self.frame(len(self) - 1)[0]
+
+    def save(self, path: str, median_ns: Optional[float] = None) -> None:
+        """Write the trace, with all keyframes built, to ``path`` in the ``load`` format.
+        
+        ``median_ns`` optionally stores the algorithm's uninstrumented run time
+        on the same input alongside it. The file is written under a temporary
+        name and renamed into place, so readers never see a partial trace.
+        """
+        self.build_keyframes()
+        header = TRACE_FILE_HEADER.pack(
+            TRACE_FILE_MAGIC, len(self.initial_array), self.operation_count, self.keyframe_interval,
+            len(self.keyframes), math.nan if median_ns is None else median_ns,
+            *(getattr(self.meta_counts, field) for field in OperationCounts.__slots__))
+        temporary_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(temporary_path, 'wb') as handle:
+                handle.write(header)
+                # 64-bit buffers first, so every one of them starts 8-byte aligned
+                for buf in (self.initial_array, self.op_args1, self.op_args2, self.keyframes, self.op_codes):
+                    handle.write(buf)
+            os.replace(temporary_path, path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+    
+    @classmethod
+    def load(cls, path: str) -> Tuple['OperationTrace', Optional[float]]:
+        """Memory-map a trace written by ``save``; returns ``(trace, median_ns)``.
+        
+        The operation and keyframe buffers are read-only views of the mapping,
+        so loading costs the same whatever the trace's length and pages are
+        read from disk only as playback reaches them. Raises ``ValueError``
+        for a file that is not a complete trace.
+        """
+        import mmap
+        
+        with open(path, 'rb') as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) < TRACE_FILE_HEADER.size:
+            raise ValueError(f"{path} is too short to be a trace")
+        magic, n, operation_count, keyframe_interval, keyframe_values, median_ns, *meta = \
+            TRACE_FILE_HEADER.unpack_from(mapped)
+        if magic != TRACE_FILE_MAGIC:
+            raise ValueError(f"{path} is not a trace file")
+        if len(mapped) != TRACE_FILE_HEADER.size + 8 * (n + 2 * operation_count + keyframe_values) + operation_count:
+            raise ValueError(f"{path} is truncated")
+        
+        view = memoryview(mapped)
+        offset = TRACE_FILE_HEADER.size
+        buffers = []
+        for length, itemsize, typecode in ((n, 8, 'q'), (operation_count, 8, 'q'), (operation_count, 8, 'q'),
+                                           (keyframe_values, 8, 'q'), (operation_count, 1, 'b')):
+            buffers.append(view[offset:offset + length * itemsize].cast(typecode))
+            offset += length * itemsize
+        
+        trace = cls.__new__(cls)
+        trace.initial_array = array('q', buffers[0])
+        trace.keyframe_interval = keyframe_interval
+        trace.op_args1, trace.op_args2, trace.keyframes, trace.op_codes = buffers[1:]
+        trace._keyframed_ops = operation_count
+        trace.meta_counts = OperationCounts()
+        for field, value in zip(OperationCounts.__slots__, meta):
+            setattr(trace.meta_counts, field, value)
+        trace._mapping = mapped  # Closed with the trace, once its views are gone
+        return trace, None if math.isnan(median_ns) else median_ns
+    
+    def __getstate__(self) -> dict:
+        """Pickle memory-mapped buffers as plain arrays, for worker processes."""
+        state = self.__dict__.copy()
+        state.pop('_mapping', None)
+        for name in ('op_codes', 'op_args1', 'op_args2', 'keyframes'):
+            if not isinstance(state[name], array):
+                copy = array(state[name].format)
+                copy.frombytes(state[name].cast('B'))
+                state[name] = copy
+        return state
+
+
+def _apply_operations(trace: OperationTrace, current_array: List[int], start: int, stop: int,
+                      sortedness: Optional[SortednessTracker] = None) -> None:
+    """Apply operations ``start..stop-1`` of ``trace`` to ``current_array`` in place.
+    
+    If given, ``sortedness`` must be tracking ``current_array``; the operations
+    are then applied through it so its metrics stay current.
+    """
+    op_codes = trace.op_codes
+    op_args1 = trace.op_args1
+    op_args2 = trace.op_args2
+    
+    if sortedness is not None:
+        swap = sortedness.swap
+        write = sortedness.write
+        for k in range(start, stop):
+            op_code = op_codes[k]
+            if op_code == OP_SWAP:
+                swap(op_args1[k], op_args2[k])
+            elif op_code == OP_WRITE:
+                write(op_args1[k], op_args2[k])
+        return
+    
+    for k in range(start, stop):
+        op_code = op_codes[k]
+        if op_code == OP_SWAP:
+            i, j = op_args1[k], op_args2[k]
+            current_array[i], current_array[j] = current_array[j], current_array[i]
+        elif op_code == OP_WRITE:
+            current_array[op_args1[k]] = op_args2[k]
+
+
+class TraceReplayer:
+    """Cursor that rebuilds frames of an ``OperationTrace``.
+
+    Short forward seeks replay the operations in between, so a monotonic
+    playback (as in the animation) replays each operation about once. Backward
+    or long forward seeks restart from the nearest keyframe instead, which
+    bounds the work of any seek to one keyframe copy plus at most
+    ``keyframe_interval`` operations.
+    
+    With ``track_sortedness`` a ``SortednessTracker`` follows the working
+    array as ``sortedness``. Re-seeding it after a keyframe jump costs about as
+    much as replaying a quarter as many operations as there are elements, so
+    shorter forward gaps are replayed instead.
+    """
+    
+    def __init__(self, trace: OperationTrace, track_sortedness: bool = False):
+        self.trace = trace
+        # One int64 working buffer for the replayer's lifetime; keyframe jumps copy into it
+        self.array = trace.initial_array[:]
+        self.position = 0  # Number of operations applied so far
+        self.sortedness = SortednessTracker(self.array) if track_sortedness else None
+    
+    def _move_to(self, target: int) -> None:
+        trace = self.trace
+        if trace._keyframed_ops < trace.operation_count:
+            trace.build_keyframes()
+        
+        keyframe_index = target // trace.keyframe_interval
+        keyframe_position = keyframe_index * trace.keyframe_interval
+        reseed_cost = len(self.array) // 4 if self.sortedness is not None else 0
+        if target < self.position or (keyframe_position > self.position and
+                                      target - self.position > reseed_cost):
+            memoryview(self.array)[:] = trace._keyframe_view(keyframe_index)
+            self.position = keyframe_position
+            if self.sortedness is not None:
+                self.sortedness.reset(self.array)
+        
+        _apply_operations(trace, self.array, self.position, target, self.sortedness)
+        self.position = target
+    
+    def seek(self, frame_index: int) -> FrameData:
+        """Move to ``frame_index`` and return ``(array, idx1, idx2)``.
+
+        The returned ``array('q')`` is the replayer's working buffer; copy it if
+        it must outlive the next ``seek`` call.
+        """
+        trace = self.trace
+        frame_index = max(0, min(frame_index, len(trace) - 1))
+        self._move_to(min(frame_index + 1, trace.operation_count))
+        
+        if frame_index >= trace.operation_count:
+            return self.array, -1, -1
+        
+        op_code = trace.op_codes[frame_index]
+        if op_code == OP_WRITE:
+            return self.array, trace.op_args1[frame_index], -1
+        return self.array, trace.op_args1[frame_index], trace.op_args2[frame_index]
+    
+    def iter_frames(self) -> Iterator[FrameData]:
+        """Yield every frame in order, sharing the working buffer between frames."""
+        for frame_index in range(len(self.trace)):
+            yield self.seek(frame_index)
+
+
+def auto_keyframe_interval(operation_count: int, n: int) -> int:
+    """Keyframe spacing that keeps snapshots within ``KEYFRAME_MEMORY_BUDGET`` bytes."""
+    snapshot_bytes = 8 * max(n, 1)
+    return max(DEFAULT_KEYFRAME_INTERVAL,
+               math.ceil(operation_count * snapshot_bytes / KEYFRAME_MEMORY_BUDGET))
+
+
+def record_trace(algo_func, initial_array: List[int], keyframe_interval: Optional[int] = None,
+                 progress: Optional[Callable[[int], None]] = None) -> OperationTrace:
+    """Run an operation generator to completion and record a seekable trace.
+
+    Without an explicit ``keyframe_interval`` the spacing is chosen after
+    recording by ``auto_keyframe_interval``, so large arrays get sparser
+    keyframes instead of unbounded snapshot memory. ``progress`` is called
+    with the number of operations consumed so far every
+    ``TRACE_PROGRESS_INTERVAL`` operations.
+    """
+    trace = OperationTrace(initial_array, keyframe_interval or DEFAULT_KEYFRAME_INTERVAL)
+    op_codes = trace.op_codes
+    op_args1 = trace.op_args1
+    op_args2 = trace.op_args2
+    add_meta = trace.meta_counts.add
+    
+    operations = algo_func(list(initial_array))
+    if progress is not None:
+        operations = _report_progress(operations, progress)
+    
+    for op_code, arg1, arg2 in operations:
+        if op_code >= OP_META:
+            add_meta(op_code, arg1)
+            continue
+        op_codes.append(op_code)
+        op_args1.append(arg1)
+        op_args2.append(arg2)
+    
+    if keyframe_interval is None:
+        trace.keyframe_interval = auto_keyframe_interval(trace.operation_count, len(initial_array))
+    trace.build_keyframes()
+    return trace
+
+
+class RecordingCancelled(Exception):
+    """Raised inside a recording worker once the parent asks it to stop."""
+
+
+def _report_progress(operations: Iterator[Operation], progress: Callable[[int], None],
+                     interval: int = TRACE_PROGRESS_INTERVAL) -> Iterator[Operation]:
+    """Pass ``operations`` through, calling ``progress(total)`` after every ``interval`` of them."""
+    emitted = 0
+    while True:
+        chunk = list(islice(operations, interval))
+        if not chunk:
+            return
+        yield from chunk
+        emitted += len(chunk)
+        progress(emitted)
+
+# Progress queue and cancel event of a trace-recording worker process
+_recording_channel = None
+
+def _init_recording_worker(progress_queue, cancel_event) -> None:
+    global _recording_channel
+    _recording_channel = (progress_queue, cancel_event)
+
+def _record_trace_job(choice: str, initial_array: List[int],
+                      keyframe_interval: Optional[int]) -> OperationTrace:
+    """Worker: record one algorithm's trace, reporting progress and honouring cancellation."""
+    progress_queue, cancel_event = _recording_channel
+    
+    def progress(operation_count: int) -> None:
+        if cancel_event.is_set():
+            raise RecordingCancelled(choice)
+        progress_queue.put((choice, operation_count))
+    
+    return record_trace(get_algorithm_function(choice), initial_array, keyframe_interval, progress)
+
+def record_traces(choices: List[str], initial_array: List[int], keyframe_interval: Optional[int] = None,
+                  jobs: Optional[int] = None,
+                  should_cancel: Optional[Callable[[], bool]] = None) -> dict:
+    """Record traces for several algorithms concurrently, one process each.
+    
+    Returns ``{choice: OperationTrace}``. A one-line progress display is kept
+    up to date while recording. Ctrl+C or a true ``should_cancel()`` stops all
+    workers and raises ``RecordingCancelled``. Small inputs are recorded in
+    this process, where the pool would cost more than it saves.
+    """
+    import multiprocessing
+    import queue
+    from concurrent.futures import ProcessPoolExecutor, wait
+    
+    choices = list(dict.fromkeys(choices))
+    if len(choices) == 1 or jobs == 1 or len(initial_array) < PARALLEL_RECORDING_MIN_SIZE:
+        def progress(operation_count: int) -> None:
+            if should_cancel is not None and should_cancel():
+                raise RecordingCancelled('cancelled by caller')
+        
+        return {choice: record_trace(get_algorithm_function(choice), initial_array, keyframe_interval, progress)
+                for choice in choices}
+    
+    context = multiprocessing.get_context()
+    progress_queue = context.Queue()
+    cancel_event = context.Event()
+    progress = {choice: 0 for choice in choices}
+    
+    with ProcessPoolExecutor(max_workers=min(jobs or len(choices), len(choices)), mp_context=context,
+                             initializer=_init_recording_worker,
+                             initargs=(progress_queue, cancel_event)) as pool:
+        futures = {pool.submit(_record_trace_job, choice, initial_array, keyframe_interval): choice
+                   for choice in choices}
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=0.25)
+                for future in done:
+                    progress[futures[future]] = -1  # Finished
+                while True:
+                    try:
+                        choice, operation_count = progress_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if progress[choice] >= 0:
+                        progress[choice] = operation_count
+                status = ' | '.join(
+                    f"{ALGORITHM_NAMES.get(choice, choice)}: " + ('done' if count < 0 else f"{count:,} ops")
+                    for choice, count in progress.items())
+                print(f"   {status}".ljust(79), end="\r", flush=True)
+                if should_cancel is not None and should_cancel():
+                    raise RecordingCancelled('cancelled by caller')
+            print()
+            return {futures[future]: future.result() for future in futures}
+        except (KeyboardInterrupt, RecordingCancelled):
+            print()
+            cancel_event.set()
+            for future in pending:
+                future.cancel()
+            raise RecordingCancelled('trace recording cancelled') from None
+
+# --- Trace Cache ---
+
+TRACE_FILE_MAGIC = b'SVTRACE1'
+# Magic, n, operation count, keyframe interval, keyframe values, median run time, meta counters
+TRACE_FILE_HEADER = struct.Struct(f'<8s4qd{len(OperationCounts.__slots__)}q')
+
+
+@lru_cache(maxsize=None)
+def _code_version() -> str:
+    """Hash of this module's source, so editing any algorithm invalidates cached traces."""
+    import hashlib
+    
+    with open(__file__, 'rb') as handle:
+        return hashlib.sha256(handle.read()).hexdigest()
+
+
+def default_trace_cache_directory() -> str:
+    """``$SORTING_VISUALIZER_CACHE``, else ``sorting-visualizer/traces`` under the user cache directory."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.environ.get('SORTING_VISUALIZER_CACHE') or os.path.join(base, 'sorting-visualizer', 'traces')
+
+
+class TraceCache:
+    """Size-bounded on-disk store of recorded traces, evicting the least recently used.
+    
+    Entries are keyed by algorithm, keyframe interval, a hash of the initial
+    array and a hash of this module's source, so a trace is only reused for
+    the exact run that produced it. Hits are memory-mapped rather than read,
+    and refresh the entry's modification time, which orders eviction.
+    """
+    
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = TRACE_CACHE_MAX_BYTES):
+        self.directory = directory or default_trace_cache_directory()
+        self.max_bytes = max_bytes
+    
+    def path(self, choice: str, initial_array: List[int], keyframe_interval: Optional[int] = None) -> str:
+        """File that holds (or would hold) the trace of ``choice`` run on ``initial_array``."""
+        import hashlib
+        
+        digest = hashlib.sha256(f"{choice}|{keyframe_interval or 'auto'}|{len(initial_array)}|"
+                                f"{sys.byteorder}|{_code_version()}|".encode())
+        digest.update(array('q', initial_array))
+        return os.path.join(self.directory, f'{digest.hexdigest()}.trace')
+    
+    def load(self, choice: str, initial_array: List[int],
+             keyframe_interval: Optional[int] = None) -> Optional[Tuple[OperationTrace, Optional[float]]]:
+        """Cached ``(trace, median_ns)`` for this run, or None on a miss."""
+        path = self.path(choice, initial_array, keyframe_interval)
+        try:
+            result = OperationTrace.load(path)
+            os.utime(path)  # Mark as most recently used
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # A damaged entry is a miss; drop it so it gets re-recorded
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return result
+    
+    def store(self, choice: str, initial_array: List[int], keyframe_interval: Optional[int],
+              trace: OperationTrace, median_ns: Optional[float] = None) -> bool:
+        """Save a trace, then evict old entries; returns False if it is too big to keep."""
+        trace.build_keyframes()
+        if trace.nbytes > self.max_bytes:
+            return False
+        os.makedirs(self.directory, exist_ok=True)
+        trace.save(self.path(choice, initial_array, keyframe_interval), median_ns)
+        self.evict()
+        return True
+    
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """``(mtime, size, path)`` of every cached trace, least recently used first."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if name.endswith('.trace'):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue  # Evicted by another process
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+    
+    @property
+    def size(self) -> int:
+        """Bytes currently held by the cache."""
+        return sum(size for _, size, _ in self._entries())
+    
+    def evict(self) -> int:
+        """Remove least recently used traces until the cache fits ``max_bytes``; returns the count."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+    
+    def clear(self) -> int:
+        """Remove every cached trace; returns the count."""
+        entries = self._entries()
+        for _, _, path in entries:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        return len(entries)
+
+# --- Streaming Playback ---
+
+class OperationStream:
+    """Run an operation generator on a background thread and replay it as it arrives.
+    
+    The producer pushes chunks of visible operations into a bounded queue and
+    blocks once ``max_chunks`` are waiting, so memory stays constant however
+    long the sort runs and nothing is recorded. The consumer applies
+    operations to ``array`` with ``advance``, keeping ``sortedness`` current;
+    ``counts`` is tallied by the producer as operations pass.
+    """
+    
+    def __init__(self, algo_func, initial_array: List[int],
+                 chunk_size: int = STREAM_CHUNK_SIZE, max_chunks: int = STREAM_QUEUE_CHUNKS):
+        import queue
+        import threading
+        
+        self.array = array('q', initial_array)
+        self.sortedness = SortednessTracker(self.array)
+        self.counts = OperationCounts()
+        self.operation_count = 0  # Operations applied to ``array`` so far
+        self.highlight = (-1, -1)  # Indices touched by the last applied operation
+        self.finished = False
+        self.chunk_size = chunk_size
+        self._queue = queue.Queue(maxsize=max_chunks)
+        self._chunk: List[Operation] = []
+        self._offset = 0
+        self._closed = threading.Event()
+        self._producer = threading.Thread(target=self._produce, args=(algo_func(list(initial_array)),),
+                                          daemon=True)
+        self._producer.start()
+    
+    def _put(self, item) -> bool:
+        """Block until ``item`` is queued; False if the stream was closed meanwhile."""
+        import queue
+        
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def _produce(self, operations: Iterator[Operation]) -> None:
+        add = self.counts.add
+        chunk_size = self.chunk_size
+        chunk = []
+        try:
+            for operation in operations:
+                add(operation[0], operation[1])
+                if operation[0] >= OP_META:
+                    continue
+                chunk.append(operation)
+                if len(chunk) >= chunk_size:
+                    if not self._put(chunk):
+                        return
+                    chunk = []
+            if chunk:
+                self._put(chunk)
+        finally:
+            self._put(None)  # End of stream
+    
+    def advance(self, count: int) -> FrameData:
+        """Apply up to ``count`` operations that are ready and return ``(array, idx1, idx2)``.
+        
+        Never waits for the producer: if it is behind, fewer operations are
+        applied. Highlights come from the last operation applied.
+        """
+        import queue
+        
+        swap = self.sortedness.swap
+        write = self.sortedness.write
+        idx1, idx2 = self.highlight
+        while count > 0 and not self.finished:
+            if self._offset >= len(self._chunk):
+                try:
+                    chunk = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if chunk is None:
+                    self.finished = True
+                    break
+                self._chunk, self._offset = chunk, 0
+            
+            stop = min(len(self._chunk), self._offset + count)
+            for k in range(self._offset, stop):
+                op_code, idx1, idx2 = self._chunk[k]
+                if op_code == OP_SWAP:
+                    swap(idx1, idx2)
+                elif op_code == OP_WRITE:
+                    write(idx1, idx2)
+                    idx2 = -1
+            count -= stop - self._offset
+            self.operation_count += stop - self._offset
+            self._offset = stop
+        
+        self.highlight = (-1, -1) if self.finished else (idx1, idx2)
+        return (self.array,) + self.highlight
+    
+    def close(self) -> None:
+        """Stop the producer; it exits at its next queue hand-off."""
+        self._closed.set()
+
+
+def get_algorithm_function(choice: str, fast: bool = False):
+    """Map algorithm choice to its generator, or to its uninstrumented variant if ``fast``."""
+    algorithm_map = {
+        '1': (SortingAlgorithms.bubble_sort_generator, SortingAlgorithms.bubble_sort),
+        '2': (SortingAlgorithms.selection_sort_generator, SortingAlgorithms.selection_sort),
+        '3': (SortingAlgorithms.insertion_sort_generator, SortingAlgorithms.insertion_sort),
+        '4': (SortingAlgorithms.quick_sort_generator, SortingAlgorithms.quick_sort),
+        '5': (SortingAlgorithms.heap_sort_generator, SortingAlgorithms.heap_sort),
+        '6': (SortingAlgorithms.shell_sort_generator, SortingAlgorithms.shell_sort),
+        '7': (SortingAlgorithms.comb_sort_generator, SortingAlgorithms.comb_sort),
+        '8': (SortingAlgorithms.radix_sort_generator, SortingAlgorithms.radix_sort),
+        '9': (SortingAlgorithms.bucket_sort_generator, SortingAlgorithms.bucket_sort),
+        '10': (SortingAlgorithms.bogo_sort_generator, SortingAlgorithms.bogo_sort),
+        '11': (SortingAlgorithms.merge_sort_generator, SortingAlgorithms.merge_sort),
+        '12': (SortingAlgorithms.tim_sort_generator, SortingAlgorithms.tim_sort),
+        '13': (SortingAlgorithms.intro_sort_generator, SortingAlgorithms.intro_sort),
+        '14': (SortingAlgorithms.pdq_sort_generator, SortingAlgorithms.pdq_sort),
+        '15': (SortingAlgorithms.quickselect_generator, SortingAlgorithms.quickselect),
+        '16': (SortingAlgorithms.heap_top_k_generator, SortingAlgorithms.heap_top_k),
+        '17': (SortingAlgorithms.partial_sort_generator, SortingAlgorithms.partial_sort),
+    }
+    generator_func, fast_func = algorithm_map[choice]
+    return fast_func if fast else generator_func
+
+# --- Input Workloads ---
+
+class _AdversaryKey:
+    """Element whose value is decided only when a comparison forces it (McIlroy's antiqsort).
+    
+    Undecided elements are "gas" that compares above every frozen value. When
+    two gas elements meet, the one not currently tracked as the pivot
+    candidate is frozen to the next smallest value. A deterministic quicksort
+    then keeps choosing pivots from the gas and partitions off one element
+    at a time.
+    """
+    
+    __slots__ = ('index', 'state')
+    
+    def __init__(self, index: int, state: dict):
+        self.index = index
+        self.state = state
+    
+    def _compare(self, other: '_AdversaryKey') -> int:
+        state = self.state
+        values = state['values']
+        gas = state['gas']
+        x, y = self.index, other.index
+        if values[x] == gas and values[y] == gas:
+            frozen = x if x == state['candidate'] else y
+            values[frozen] = state['solid']
+            state['solid'] += 1
+        if values[x] == gas:
+            state['candidate'] = x
+        elif values[y] == gas:
+            state['candidate'] = y
+        return values[x] - values[y]
+    
+    def __lt__(self, other): return self._compare(other) < 0
+    def __le__(self, other): return self._compare(other) <= 0
+    def __gt__(self, other): return self._compare(other) > 0
+    def __ge__(self, other): return self._compare(other) >= 0
+
+
+def quicksort_killer(n: int, sort_func=None) -> List[int]:
+    """Permutation of ``1..n`` that drives a deterministic quicksort to O(n²).
+    
+    Found by running ``sort_func`` (default ``SortingAlgorithms.quick_sort``)
+    against an adversary that fixes element values lazily, so it adapts to
+    whichever pivot rule the sort uses: last element, median of three, etc.
+    Building it costs one quadratic run of the target sort.
+    """
+    sort_func = sort_func or SortingAlgorithms.quick_sort
+    state = {'values': [n] * n, 'gas': n, 'solid': 0, 'candidate': None}
+    sort_func([_AdversaryKey(index, state) for index in range(n)])
+    
+    # Anything still undecided compares equal; give it the largest ranks
+    values = state['values']
+    for index in range(n):
+        if values[index] == n:
+            values[index] = state['solid']
+            state['solid'] += 1
+    return [value + 1 for value in values]
+
+
+def generate_workload(kind: str, n: int, rng: Optional[random.Random] = None) -> List[int]:
+    """Build an input of ``n`` positive integers with the given distribution.
+    
+    ``kind`` is one of ``WORKLOAD_NAMES``. Permutation kinds use the heights
+    ``1..n``; ``few-unique`` and ``zipf`` repeat values from that range.
+    """
+    rng = rng or random.Random()
+    values = list(range(1, n + 1))
+    
+    if kind == 'random':
+        rng.shuffle(values)
+    elif kind == 'sorted':
+        pass
+    elif kind == 'reversed':
+        values.reverse()
+    elif kind == 'k-sorted':
+        # Shuffle disjoint windows, so no element is more than k - 1 places from home
+        k = max(2, math.isqrt(n))
+        for start in range(0, n, k):
+            window = values[start:start + k]
+            rng.shuffle(window)
+            values[start:start + k] = window
+    elif kind == 'organ-pipe':
+        values = values[0::2] + values[1::2][::-1]
+    elif kind == 'sawtooth':
+        run = max(2, math.isqrt(n))
+        values = [max(1, (index % run + 1) * n // run) for index in range(n)]
+    elif kind == 'few-unique':
+        levels = [max(1, level * n // 8) for level in range(1, 9)]
+        values = [rng.choice(levels) for _ in range(n)]
+    elif kind == 'zipf':
+        # Rank r appears with probability ~ 1/r, so a few values dominate
+        cumulative = list(accumulate(1 / rank for rank in range(1, n + 1)))
+        values = rng.choices(values, cum_weights=cumulative, k=n) if n else []
+    elif kind == 'quick-killer':
+        values = quicksort_killer(n)
+    else:
+        raise ValueError(f"Unknown workload {kind!r}; expected one of {', '.join(WORKLOAD_NAMES)}")
+    return values
+
+
+def generate_records(kind: str, n: int, rng: Optional[random.Random] = None) -> List[dict]:
+    """Build ``n`` records whose scores follow ``generate_workload(kind, n)``, for key-function sorts.
+    
+    Names are three random letters, so at larger n many records share both
+    score and name and only ``id`` (the input position) tells them apart.
+    """
+    rng = rng or random.Random()
+    scores = generate_workload(kind, n, rng)
+    return [{'id': index, 'name': ''.join(rng.choices(string.ascii_lowercase, k=3)), 'score': score}
+            for index, score in enumerate(scores)]
+
+
+def record_sort_key(record: dict) -> Tuple[int, str]:
+    """Composite key of ``generate_records`` records: score, then name."""
+    return record['score'], record['name']
+
+
+# --- Algorithm Selection ---
+
+class InputFeatures(NamedTuple):
+    """What ``sample_input_features`` learned about an input from a fixed number of probes."""
+    n: int
+    runs: float  # Estimated monotone runs, ascending or descending
+    descent_fraction: float  # Share of sampled neighbours that are out of order
+    inversion_fraction: float  # Share of sampled pairs that are out of order
+    low: Optional[int]  # Smallest sampled value, None unless the input holds integers
+    high: Optional[int]  # Largest sampled value, None unless the input holds integers
+    duplicate_ratio: float  # Share of sampled values that repeat another sampled value
+
+
+def sample_input_features(arr, sample_size: Optional[int] = None,
+                          rng: Optional[random.Random] = None) -> InputFeatures:
+    """Estimate runs, inversions, value range and duplicates of ``arr`` from ``sample_size`` probes.
+    
+    The probes are neighbourhoods of three elements at random positions,
+    visited left to right, plus random pairs for inversions. Short runs show
+    up as direction changes inside the neighbourhoods, long ones as direction
+    changes from one probe to the next. ``sample_size`` defaults to 2√n,
+    capped at ``AUTO_SAMPLE_SIZE``, so the cost stays sublinear and then
+    constant. ``rng`` defaults to a fixed seed, so the same input always
+    gets the same answer.
+    """
+    rng = rng or random.Random(0)
+    n = len(arr)
+    if n < 3:
+        return InputFeatures(n, 1.0, 0.0, 0.0, None, None, 0.0)
+    if sample_size is None:
+        sample_size = min(AUTO_SAMPLE_SIZE, 2 * math.isqrt(n))
+    
+    starts = range(n - 2) if n - 2 <= sample_size else sorted(rng.sample(range(n - 2), sample_size))
+    descents = changes = 0
+    values = []
+    for i in starts:
+        a, b, c = arr[i], arr[i + 1], arr[i + 2]
+        descents += a > b
+        changes += (a < b and b > c) or (a > b and b < c)
+        values.append(a)
+    # Turns in the sampled values themselves, each of which needs a run boundary somewhere in between
+    turns = sum(1 for a, b, c in zip(values, values[1:], values[2:]) if (a < b and b > c) or (a > b and b < c))
+    
+    inverted = compared = 0
+    draw = rng.random
+    for _ in range(min(sample_size, n * (n - 1) // 2)):
+        i, j = int(draw() * n), int(draw() * n)
+        if i < j:
+            inverted += arr[i] > arr[j]
+        elif i > j:
+            inverted += arr[j] > arr[i]
+        else:
+            continue
+        compared += 1
+    
+    integers = _buffer_typecode(arr) is not None or all(isinstance(value, int) for value in values)
+    return InputFeatures(
+        n=n,
+        runs=max(1 + turns, 1 + changes / len(starts) * (n - 2)),
+        descent_fraction=descents / len(starts),
+        inversion_fraction=inverted / max(compared, 1),
+        low=int(min(values)) if integers else None,
+        high=int(max(values)) if integers else None,
+        duplicate_ratio=1 - len(set(values)) / len(values),
+    )
+
+
+def choose_algorithm(features: InputFeatures) -> Tuple[str, str]:
+    """Pick a sorting algorithm for an input with ``features``; returns the choice key and the reason."""
+    if features.n <= AUTO_INSERTION_MAX:
+        return '3', f"n ≤ {AUTO_INSERTION_MAX}"
+    if (features.n <= AUTO_NEARLY_SORTED_MAX and features.descent_fraction == 0
+            and features.inversion_fraction == 0):
+        return '3', "nearly sorted"
+    if features.runs <= AUTO_MAX_RUNS:
+        return '12', f"about {features.runs:.0f} monotone runs"
+    if features.duplicate_ratio >= AUTO_DUPLICATE_RATIO:
+        return '14', f"{features.duplicate_ratio:.0%} duplicates"
+    if features.low is not None and features.high - features.low < AUTO_DENSE_RANGE_FACTOR * features.n:
+        return '9', "dense integer range"
+    if features.inversion_fraction <= AUTO_PRESORTED_INVERSIONS:
+        return '14', f"{features.inversion_fraction:.1%} inversions"
+    return '13', "no exploitable structure"
+
+
+def select_algorithm(arr, rng: Optional[random.Random] = None) -> Tuple[str, str]:
+    """Sample ``arr`` and pick the algorithm that suits it; returns the choice key and the reason."""
+    return choose_algorithm(sample_input_features(arr, rng=rng))
+
+
+def resolve_auto_choice(choice: str, arr) -> str:
+    """``choice`` itself, or what ``select_algorithm`` picks for ``arr`` if it is ``AUTO_CHOICE``."""
+    if choice != AUTO_CHOICE:
+        return choice
+    picked, reason = select_algorithm(arr)
+    print(f"🤖 Auto picked {ALGORITHM_NAMES[picked]} ({reason})")
+    return picked
+
+
+def auto_panel_names(choices: List[str], picks: List[str], algo_names: dict) -> dict:
+    """Copy of ``algo_names`` in which algorithms that Auto picked are titled "Auto → <name>".
+    
+    ``picks`` are ``choices`` after ``resolve_auto_choice``. The visualizer
+    shows one panel when both resolve to the same algorithm; the title keeps
+    saying that Auto chose it.
+    """
+    names = dict(algo_names)
+    for choice, picked in zip(choices, picks):
+        if choice == AUTO_CHOICE:
+            names[picked] = f"Auto → {ALGORITHM_NAMES[picked]}"
+    return names
+
+
+def auto_sort(arr):
+    """Sort with the algorithm ``select_algorithm`` picks for ``arr``; returns a sorted copy."""
+    choice, _ = select_algorithm(arr)
+    return get_algorithm_function(choice, fast=True)(arr)
+
+
+# --- Parallel Sorting ---
+
+@contextmanager
+def _shared_int64_view(name: str) -> Iterator[memoryview]:
+    """Attach to a shared memory block by name and view it as signed 64-bit integers."""
+    from multiprocessing import shared_memory
+    
+    block = shared_memory.SharedMemory(name=name)
+    view = block.buf.cast('q')
+    try:
+        yield view
+    finally:
+        view.release()
+        block.close()
+
+
+@contextmanager
+def _shared_int64_blocks(*contents: List[int]) -> Iterator[list]:
+    """Create one shared block per list, each sized and filled from it; unlinked on exit."""
+    from multiprocessing import shared_memory
+    
+    blocks = []
+    try:
+        for values in contents:
+            blocks.append(shared_memory.SharedMemory(create=True, size=max(len(values), 1) * 8))
+            view = blocks[-1].buf.cast('q')
+            view[:len(values)] = array('q', values)
+            view.release()
+        yield blocks
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _read_shared_int64(block, lo: int, hi: int) -> List[int]:
+    """Copy ``[lo, hi)`` of a shared block out as a list."""
+    view = block.buf.cast('q')
+    try:
+        return view[lo:hi].tolist()
+    finally:
+        view.release()
+
+
+def _chunk_bounds(n: int, parts: int) -> List[Tuple[int, int]]:
+    """Split ``range(n)`` into ``parts`` contiguous, nearly equal ``(lo, hi)`` ranges."""
+    return [(n * i // parts, n * (i + 1) // parts) for i in range(parts)]
+
+
+def _sort_shared_range(name: str, lo: int, hi: int, choice: str) -> None:
+    """Worker: sort ``[lo, hi)`` of a shared block in place with algorithm ``choice``."""
+    with _shared_int64_view(name) as view:
+        view[lo:hi] = array('q', get_algorithm_function(choice, fast=True)(view[lo:hi].tolist()))
+
+
+def _merge_shared_partition(source: str, target: str, chunks: List[Tuple[int, int]],
+                            low: Optional[int], high: Optional[int], offset: int) -> None:
+    """Worker: k-way merge every sorted chunk's values in ``[low, high)`` into ``target[offset:]``."""
+    import heapq
+    from bisect import bisect_left
+    
+    with _shared_int64_view(source) as src, _shared_int64_view(target) as dst:
+        runs = []
+        for lo, hi in chunks:
+            start = lo if low is None else bisect_left(src, low, lo, hi)
+            stop = hi if high is None else bisect_left(src, high, lo, hi)
+            if start < stop:
+                runs.append(src[start:stop].tolist())
+        merged = list(heapq.merge(*runs))
+        dst[offset:offset + len(merged)] = array('q', merged)
+
+
+def _count_shared_buckets(name: str, lo: int, hi: int, splitters: List[int]) -> List[int]:
+    """Worker: how many of ``[lo, hi)``'s values fall in each bucket between ``splitters``."""
+    from bisect import bisect_right
+    
+    counts = [0] * (len(splitters) + 1)
+    with _shared_int64_view(name) as view:
+        for value in view[lo:hi].tolist():
+            counts[bisect_right(splitters, value)] += 1
+    return counts
+
+
+def _scatter_shared_buckets(source: str, target: str, lo: int, hi: int,
+                            splitters: List[int], offsets: List[int]) -> None:
+    """Worker: copy ``[lo, hi)``'s values into their buckets of ``target``, starting at ``offsets``."""
+    from bisect import bisect_right
+    
+    buckets = [[] for _ in range(len(splitters) + 1)]
+    with _shared_int64_view(source) as src, _shared_int64_view(target) as dst:
+        for value in src[lo:hi].tolist():
+            buckets[bisect_right(splitters, value)].append(value)
+        for offset, values in zip(offsets, buckets):
+            dst[offset:offset + len(values)] = array('q', values)
+
+
+def _run_parallel_phase(pool, job, argument_lists: List[tuple]) -> list:
+    """Submit ``job`` once per argument tuple and wait for every result, in order."""
+    futures = [pool.submit(job, *arguments) for arguments in argument_lists]
+    return [future.result() for future in futures]
+
+
+def _with_pool(workers: Optional[int], executor, body: Callable[..., List[int]]) -> List[int]:
+    """Run ``body(pool, workers)`` on ``executor``, or on a process pool made for this call."""
+    from concurrent.futures import ProcessPoolExecutor
+    
+    workers = workers or os.cpu_count() or 1
+    if executor is not None:
+        return body(executor, workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return body(pool, workers)
+
+
+def parallel_merge_sort(arr: List[int], workers: Optional[int] = None, choice: str = '11',
+                        executor=None) -> List[int]:
+    """Multiprocess merge sort of 64-bit integers; returns a sorted copy.
+    
+    The input is copied once into shared memory and each of ``workers``
+    processes sorts one chunk of it in place with algorithm ``choice``.
+    Splitters sampled at regular positions of the sorted chunks then give
+    every worker one value range, which it k-way heap merges from all the
+    chunks straight into its slice of a shared output block. Only indices
+    and splitters are pickled. Pass ``executor`` to reuse a process pool.
+    """
+    from bisect import bisect_left
+    
+    n = len(arr)
+    if n < 2:
+        return list(arr)
+    
+    def body(pool, workers):
+        chunks = _chunk_bounds(n, workers)
+        with _shared_int64_blocks(arr, arr) as (source, target):
+            _run_parallel_phase(pool, _sort_shared_range,
+                                [(source.name, lo, hi, choice) for lo, hi in chunks])
+            
+            view = source.buf.cast('q')
+            try:
+                samples = sorted(view[lo + (hi - lo) * k // workers]
+                                 for lo, hi in chunks if hi > lo for k in range(workers))
+                splitters = [samples[len(samples) * k // workers] for k in range(1, workers)]
+                # Output offset of each range: how many values sort before its splitter
+                offsets = [0] + [sum(bisect_left(view, splitter, lo, hi) - lo for lo, hi in chunks)
+                                 for splitter in splitters]
+            finally:
+                view.release()
+            
+            bounds = [None] + splitters + [None]
+            _run_parallel_phase(pool, _merge_shared_partition,
+                                [(source.name, target.name, chunks, bounds[k], bounds[k + 1], offsets[k])
+                                 for k in range(workers)])
+            return _read_shared_int64(target, 0, n)
+    
+    return _with_pool(workers, executor, body)
+
+
+def parallel_sample_sort(arr: List[int], workers: Optional[int] = None, choice: str = '11',
+                         executor=None, seed: Optional[int] = None) -> List[int]:
+    """Multiprocess sample sort of 64-bit integers; returns a sorted copy.
+    
+    Splitters are picked from a random oversample of the input, one bucket
+    per worker. Each worker counts its input chunk's values per bucket, the
+    counts give every (chunk, bucket) pair a disjoint slice of a shared
+    output block, the workers scatter their values into those slices, and
+    finally each worker sorts one bucket in place with algorithm ``choice``.
+    """
+    n = len(arr)
+    if n < 2:
+        return list(arr)
+    
+    def body(pool, workers):
+        rng = random.Random(seed)
+        sample = sorted(rng.choices(arr, k=workers * PARALLEL_SAMPLE_OVERSAMPLING))
+        splitters = [sample[len(sample) * k // workers] for k in range(1, workers)]
+        chunks = _chunk_bounds(n, workers)
+        
+        with _shared_int64_blocks(arr, arr) as (source, target):
+            counts = _run_parallel_phase(pool, _count_shared_buckets,
+                                         [(source.name, lo, hi, splitters) for lo, hi in chunks])
+            bucket_sizes = [sum(column) for column in zip(*counts)]
+            bucket_starts = [0] + list(accumulate(bucket_sizes))
+            
+            # Chunk c writes bucket b after every earlier chunk's share of b
+            offsets = []
+            running = bucket_starts[:-1]
+            for chunk_counts in counts:
+                offsets.append(running)
+                running = [start + count for start, count in zip(running, chunk_counts)]
+            
+            _run_parallel_phase(pool, _scatter_shared_buckets,
+                                [(source.name, target.name, lo, hi, splitters, chunk_offsets)
+                                 for (lo, hi), chunk_offsets in zip(chunks, offsets)])
+            _run_parallel_phase(pool, _sort_shared_range,
+                                [(target.name, bucket_starts[b], bucket_starts[b + 1], choice)
+                                 for b in range(workers) if bucket_sizes[b] > 1])
+            return _read_shared_int64(target, 0, n)
+    
+    return _with_pool(workers, executor, body)
+
+
+PARALLEL_SORTS = {
+    'merge': ('Parallel Merge Sort', parallel_merge_sort),
+    'sample': ('Parallel Sample Sort', parallel_sample_sort),
+}
+
+# --- External Sorting ---
+
+EXTERNAL_FORMATS = ('binary', 'text')
+
+
+def _external_format(path: str, fmt: Optional[str]) -> str:
+    """``fmt`` if given, else 'binary' for ``.bin`` files and 'text' for anything else."""
+    if fmt is None:
+        return 'binary' if path.lower().endswith('.bin') else 'text'
+    if fmt not in EXTERNAL_FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(EXTERNAL_FORMATS)}")
+    return fmt
+
+
+def read_integer_chunks(path: str, fmt: str, chunk_values: int) -> Iterator[array]:
+    """Yield a file's integers ``chunk_values`` at a time as ``array('q')``.
+    
+    ``fmt`` is 'binary' (native-endian signed 64-bit integers) or 'text'
+    (one integer per line; blank lines are skipped).
+    """
+    if fmt == 'binary' and os.path.getsize(path) % 8:
+        raise ValueError(f"{path} is not a whole number of 64-bit integers")
+    
+    with open(path, 'rb' if fmt == 'binary' else 'r') as handle:
+        while True:
+            if fmt == 'binary':
+                chunk = array('q')
+                try:
+                    chunk.fromfile(handle, chunk_values)
+                except EOFError:
+                    pass  # Short final chunk; the values read are kept
+                if not chunk:
+                    return
+            else:
+                lines = list(islice(handle, chunk_values))
+                if not lines:
+                    return
+                chunk = array('q', [int(line) for line in lines if not line.isspace()])
+            yield chunk
+
+
+def _write_integers(handle, values: List[int], fmt: str) -> None:
+    """Append ``values`` to an open output file in ``fmt``."""
+    if fmt == 'binary':
+        array('q', values).tofile(handle)
+    elif values:
+        handle.write('\n'.join(map(str, values)))
+        handle.write('\n')
+
+
+def _iter_run(path: str) -> Iterator[int]:
+    """Stream a binary run file through a read-only memory map, one buffer at a time."""
+    import mmap
+    
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        view = memoryview(mapped).cast('q')
+        try:
+            for start in range(0, len(view), EXTERNAL_BUFFER_VALUES):
+                yield from view[start:start + EXTERNAL_BUFFER_VALUES].tolist()
+        finally:
+            view.release()
+
+
+class ExternalSortView:
+    """A downsampled picture of an integer file, for animating its external sort.
+    
+    Bar ``b`` shows the value at position ``marks[b]``, the start of the
+    bar's equal share of the file, rescaled to a height between 1 and
+    ``size``. ``initial_array`` is the file as it is before sorting.
+    """
+    
+    def __init__(self, path: str, size: int, fmt: Optional[str] = None):
+        fmt = _external_format(path, fmt)
+        total = 0
+        self.low = self.high = 0
+        for chunk in read_integer_chunks(path, fmt, EXTERNAL_BUFFER_VALUES):
+            self.low = min(chunk) if total == 0 else min(self.low, min(chunk))
+            self.high = max(chunk) if total == 0 else max(self.high, max(chunk))
+            total += len(chunk)
+        
+        self.total = total
+        self.size = min(size, total)
+        self.marks = [total * bar // self.size for bar in range(self.size)]
+        self.initial_array = [0] * self.size
+        position = 0
+        for chunk in read_integer_chunks(path, fmt, EXTERNAL_BUFFER_VALUES):
+            for _, bar, height in self.writes(chunk, position):
+                self.initial_array[bar] = height
+            position += len(chunk)
+    
+    def height(self, value: int) -> int:
+        """Bar height for ``value``, scaled linearly from the file's range onto 1..size."""
+        return 1 + (value - self.low) * (self.size - 1) // max(self.high - self.low, 1)
+    
+    def bar_range(self, start: int, stop: int) -> Tuple[int, int]:
+        """First and last bar whose mark lies in positions ``[start, stop)`` (last < first if none)."""
+        from bisect import bisect_left
+        
+        return bisect_left(self.marks, start), bisect_left(self.marks, stop) - 1
+    
+    def writes(self, values: List[int], start: int) -> AlgorithmGenerator:
+        """``OP_WRITE`` operations for the bars whose marks fall in ``values``, placed at ``start``."""
+        first, last = self.bar_range(start, start + len(values))
+        for bar in range(first, last + 1):
+            yield OP_WRITE, bar, self.height(values[self.marks[bar] - start])
+
+
+def _merge_runs(runs: List[Tuple[str, int, int]], output_path: str, fmt: str,
+                view: Optional[ExternalSortView]) -> AlgorithmGenerator:
+    """k-way heap merge ``(path, start, length)`` runs into ``output_path`` in buffered batches."""
+    import heapq
+    
+    merged = heapq.merge(*(_iter_run(path) for path, _, _ in runs))
+    position = runs[0][1] if runs else 0
+    with open(output_path, 'wb' if fmt == 'binary' else 'w') as handle:
+        while True:
+            batch = list(islice(merged, EXTERNAL_BUFFER_VALUES))
+            if not batch:
+                break
+            _write_integers(handle, batch, fmt)
+            if view is not None:
+                yield from view.writes(batch, position)
+            position += len(batch)
+
+
+def _external_sort_steps(input_path: str, output_path: str, memory_budget: int, fmt: Optional[str],
+                         temp_dir: Optional[str], choice: Optional[str],
+                         view: Optional[ExternalSortView]) -> AlgorithmGenerator:
+    """Run an external merge sort, yielding operations on ``view`` (nothing if it is None)."""
+    import tempfile
+    
+    fmt = _external_format(input_path, fmt)
+    chunk_values = max(1, memory_budget // EXTERNAL_BYTES_PER_VALUE)
+    fan_in = max(2, memory_budget // (EXTERNAL_BUFFER_VALUES * EXTERNAL_BYTES_PER_VALUE))
+    sort_func = sorted if choice is None else get_algorithm_function(choice, fast=True)
+    
+    with tempfile.TemporaryDirectory(prefix='external-sort-', dir=temp_dir) as directory:
+        # Run formation: sort each chunk that fits the budget and spill it
+        runs = []
+        position = 0
+        for chunk in read_integer_chunks(input_path, fmt, chunk_values):
+            if view is not None:
+                first, last = view.bar_range(position, position + len(chunk))
+                if first <= last:
+                    yield OP_READ, first, last
+            values = sort_func(chunk)
+            path = os.path.join(directory, f"run-{len(runs)}.bin")
+            with open(path, 'wb') as handle:
+                _write_integers(handle, values, 'binary')
+            runs.append((path, position, len(values)))
+            if view is not None:
+                yield from view.writes(values, position)
+            position += len(values)
+        
+        # Merge passes: neighbouring runs are merged, so each output run stays one span of positions
+        merge_pass = 0
+        while len(runs) > fan_in:
+            merged_runs = []
+            for start in range(0, len(runs), fan_in):
+                group = runs[start:start + fan_in]
+                path = os.path.join(directory, f"pass-{merge_pass}-{len(merged_runs)}.bin")
+                yield from _merge_runs(group, path, 'binary', view)
+                merged_runs.append((path, group[0][1], sum(length for _, _, length in group)))
+                for run_path, _, _ in group:
+                    os.remove(run_path)
+            runs = merged_runs
+            merge_pass += 1
+        
+        yield from _merge_runs(runs, output_path, fmt, view)
+
+
+def external_sort(input_path: str, output_path: str, memory_budget: int = EXTERNAL_MEMORY_BUDGET,
+                  fmt: Optional[str] = None, temp_dir: Optional[str] = None,
+                  choice: Optional[str] = None) -> None:
+    """Sort an integer file that may not fit in memory into ``output_path``.
+    
+    Chunks of about ``memory_budget`` bytes are read, sorted in memory
+    (with the built-in sort, or algorithm ``choice``) and spilled to run
+    files in ``temp_dir``. Runs are then k-way heap merged through
+    memory-mapped, buffered sequential reads, in as many passes as the
+    budget requires. The output uses the input's ``fmt``.
+    """
+    from collections import deque
+    
+    deque(_external_sort_steps(input_path, output_path, memory_budget, fmt, temp_dir, choice, None),
+          maxlen=0)
+
+
+def external_sort_generator(view: ExternalSortView, input_path: str, output_path: str,
+                            memory_budget: int = EXTERNAL_MEMORY_BUDGET, fmt: Optional[str] = None,
+                            temp_dir: Optional[str] = None,
+                            choice: Optional[str] = None) -> Callable[[List[int]], AlgorithmGenerator]:
+    """``external_sort`` as an operation generator over ``view``, for ``OperationStream``.
+    
+    Each sorted run writes its bars, and every merge pass rewrites the bars
+    of the span it merges, so replaying the stream on ``view.initial_array``
+    shows the runs forming and then the merge phases joining them.
+    """
+    def generator(arr: List[int]) -> AlgorithmGenerator:
+        return _external_sort_steps(input_path, output_path, memory_budget, fmt, temp_dir, choice, view)
+    return generator
+
+# --- NumPy Sorts ---
+
+def _as_int64_array(arr):
+    """Copy an integer array or a sequence of ints into a NumPy int64 array."""
+    import numpy as np
+    
+    if not isinstance(arr, np.ndarray):
+        return np.fromiter(arr, dtype=np.int64, count=len(arr))  # Much faster than asarray for lists
+    if arr.size and arr.dtype.kind not in 'iu':
+        raise TypeError(f"NumPy sorts need 64-bit integers, not {arr.dtype}")
+    # uint64 values past the int64 range would wrap to negatives and sort first
+    if arr.size and arr.dtype == np.uint64 and arr.max() > np.iinfo(np.int64).max:
+        raise ValueError(f"NumPy sorts handle values up to {np.iinfo(np.int64).max}; got {arr.max()}")
+    return arr.astype(np.int64)
+
+
+def _from_int64_array(values, arr):
+    """Return sorted ``values`` as an array if the input was one, else as a list."""
+    import numpy as np
+    
+    return values if isinstance(arr, np.ndarray) else values.tolist()
+
+
+def numpy_radix_sort(arr, radix: int = NUMPY_RADIX):
+    """LSD radix sort of int64 values with NumPy; returns a sorted copy.
+    
+    ``radix`` is the number of values per digit, a power of two up to 2**16.
+    Keys are biased to unsigned so negative values order correctly. Each
+    pass histograms one digit with ``bincount`` and skips it if every key
+    shares it; otherwise the keys are scattered into digit order by a stable
+    ``argsort`` of the 8- or 16-bit digits, which NumPy runs as a counting
+    sort. Digits above the highest bit in which the keys differ are never
+    visited, so small value ranges take few passes.
+    """
+    import numpy as np
+    
+    bits = radix.bit_length() - 1
+    if radix < 2 or radix & (radix - 1) or bits > 16:
+        raise ValueError(f"radix must be a power of two between 2 and 65536, not {radix}")
+    
+    values = _as_int64_array(arr)
+    if values.size < 2:
+        return _from_int64_array(values, arr)
+    
+    keys = values.view(np.uint64) ^ np.uint64(1 << 63)
+    spread = int(keys.min()) ^ int(keys.max())  # Bits in which some keys differ
+    digit_type = np.uint8 if bits <= 8 else np.uint16
+    mask = np.uint64(radix - 1)
+    for shift in range(0, spread.bit_length(), bits):
+        digits = ((keys >> np.uint64(shift)) & mask).astype(digit_type)
+        if np.bincount(digits, minlength=radix).max() == keys.size:
+            continue
+        keys = keys[np.argsort(digits, kind='stable')]
+    
+    return _from_int64_array((keys ^ np.uint64(1 << 63)).view(np.int64), arr)
+
+
+def numpy_counting_sort(arr, max_range: Optional[int] = None):
+    """Counting sort of int64 values in a dense range with NumPy; returns a sorted copy.
+    
+    One ``bincount`` over ``value - min`` and a ``repeat`` rebuild the
+    output. Raises ``ValueError`` if ``max - min + 1`` exceeds ``max_range``
+    (default: ``NUMPY_COUNTING_RANGE_FACTOR`` times n, plus 2**16).
+    """
+    import numpy as np
+    
+    values = _as_int64_array(arr)
+    if values.size < 2:
+        return _from_int64_array(values, arr)
+    
+    low, high = int(values.min()), int(values.max())
+    span = high - low + 1
+    limit = max_range if max_range is not None else NUMPY_COUNTING_RANGE_FACTOR * values.size + (1 << 16)
+    if span > limit:
+        raise ValueError(f"value range {span:,} is too wide for counting sort (limit {limit:,})")
+    
+    counts = np.bincount(values - np.int64(low), minlength=span)
+    return _from_int64_array(np.repeat(np.arange(low, high + 1, dtype=np.int64), counts), arr)
+
+
+def numpy_bucket_sort(arr, bucket_size: int = NUMPY_BUCKET_SIZE, seed: Optional[int] = None):
+    """Bucket sort of int64 values with NumPy and data-adapted buckets; returns a sorted copy.
+    
+    About n / ``bucket_size`` buckets are cut at the quantiles of a random
+    sample, so skewed inputs still fill them evenly. Values are grouped by
+    bucket (``bincount``/``cumsum`` give the bucket ends) and every bucket
+    is then sorted in place on its own.
+    """
+    import numpy as np
+    
+    values = _as_int64_array(arr)
+    if values.size < 2:
+        return _from_int64_array(values, arr)
+    
+    buckets = min(1 << 16, max(1, values.size // bucket_size))
+    sample = np.sort(np.random.default_rng(seed).choice(values, size=min(values.size, buckets * 8)))
+    boundaries = sample[(np.arange(1, buckets) * sample.size) // buckets]
+    bucket_ids = np.searchsorted(boundaries, values, side='right').astype(np.uint16)
+    
+    grouped = values[np.argsort(bucket_ids, kind='stable')]
+    ends = np.cumsum(np.bincount(bucket_ids, minlength=buckets))
+    start = 0
+    for end in ends.tolist():
+        if end - start > 1:
+            grouped[start:end].sort()
+        start = end
+    return _from_int64_array(grouped, arr)
+
+
+def numpy_sorts(radixes: Iterable[int] = (NUMPY_RADIX,)) -> dict:
+    """``{name: (sort function, complexity)}`` for the NumPy sorts, one radix sort per radix."""
+    from functools import partial
+    
+    sorts = {}
+    for radix in radixes:
+        sorts[f"NumPy Radix 2^{radix.bit_length() - 1}"] = (partial(numpy_radix_sort, radix=radix), 'O(n·w)')
+    sorts['NumPy Counting'] = (numpy_counting_sort, 'O(n + k)')
+    sorts['NumPy Bucket'] = (numpy_bucket_sort, 'O(n log(n/k))')
+    return sorts
+
+# --- Timing Engine ---
+
+class TimingResult(NamedTuple):
+    """Wall-clock statistics for repeated runs of one algorithm, in nanoseconds."""
+    samples_ns: List[int]
+    median_ns: float
+    p95_ns: float
+    stdev_ns: float
+    
+    @property
+    def median_seconds(self) -> float:
+        return self.median_ns / 1e9
+
+
+def _percentile(sorted_samples: List[int], fraction: float) -> float:
+    """Linearly interpolated percentile of already-sorted samples."""
+    if len(sorted_samples) == 1:
+        return float(sorted_samples[0])
+    position = fraction * (len(sorted_samples) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (position - lower)
+
+
+def time_algorithm(sort_func, initial_array: List[int], repeats: int = TIMING_REPEATS,
+                   warmup: int = TIMING_WARMUP) -> TimingResult:
+    """Time an uninstrumented sort on copies of ``initial_array`` with ``perf_counter_ns``.
+
+    ``warmup`` untimed runs are done first so caches and allocator state
+    settle; each of the ``repeats`` timed runs sorts a fresh copy.
+    """
+    import statistics
+    
+    if repeats < 1:
+        raise ValueError("repeats must be at least 1")
+    
+    for _ in range(warmup):
+        sort_func(list(initial_array))
+    
+    samples = []
+    for _ in range(repeats):
+        data = list(initial_array)
+        start = time.perf_counter_ns()
+        sort_func(data)
+        samples.append(time.perf_counter_ns() - start)
+    
+    ordered = sorted(samples)
+    return TimingResult(
+        samples_ns=samples,
+        median_ns=statistics.median(ordered),
+        p95_ns=_percentile(ordered, 0.95),
+        stdev_ns=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    )
+
+
+class MemoryResult(NamedTuple):
+    """Memory traced during one run of an algorithm, in bytes."""
+    peak_bytes: int    # Highest traced allocation total during the run
+    result_bytes: int  # Size of the returned list, if the sort returned a new one
+    
+    @property
+    def aux_bytes(self) -> int:
+        """Peak memory beyond the output the sort has to produce."""
+        return max(0, self.peak_bytes - self.result_bytes)
+
+
+def measure_memory(sort_func, initial_array: List[int], warmup: int = 1) -> MemoryResult:
+    """Trace the peak memory an uninstrumented sort allocates on a copy of ``initial_array``.
+    
+    Uses ``tracemalloc``, which sees every Python-level allocation but not the
+    interpreter's frame stack, so recursion depth does not show up. Allocation
+    is deterministic, so a single traced run is enough; ``warmup`` untraced
+    runs come first so one-off caches are not counted.
+    """
+    import gc
+    import tracemalloc
+    
+    if tracemalloc.is_tracing():
+        raise RuntimeError("measure_memory needs tracemalloc to be stopped")
+    
+    for _ in range(warmup):
+        sort_func(list(initial_array))
+    
+    data = list(initial_array)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = sort_func(data)
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    result_bytes = sys.getsizeof(result) if isinstance(result, list) and result is not data else 0
+    return MemoryResult(peak_bytes, result_bytes)
+
+
+def format_bytes(count: float) -> str:
+    """Render a byte count with a binary unit, e.g. ``1.5 MiB``."""
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(count) < 1024:
+            return f"{count:.0f} {unit}" if unit == 'B' else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GiB"
+
+
+def format_duration(ns: float) -> str:
+    """Human-readable duration for a nanosecond value."""
+    if ns >= 1e9:
+        return f"{ns / 1e9:.3f}s"
+    if ns >= 1e6:
+        return f"{ns / 1e6:.3f}ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.1f}µs"
+    return f"{ns:.0f}ns"
+
+# --- Benchmark Runner ---
+
+def resolve_algorithm_choice(token: str) -> str:
+    """Map a menu number or a name such as ``quick``/``"Quick Sort"`` to a choice key."""
+    token = token.strip()
+    if token in ALGORITHM_NAMES:
+        return token
+    
+    wanted = token.lower().replace('_', ' ').replace('-', ' ')
+    for choice, name in ALGORITHM_NAMES.items():
+        full_name = name.lower().replace('-', ' ')
+        if wanted in (full_name, full_name.replace(' sort', '')):
+            return choice
+    raise ValueError(f"Unknown algorithm: {token!r}")
+
+
+def fit_growth_exponent(sizes: List[int], times: List[float]) -> Optional[float]:
+    """Least-squares slope of log(time) against log(n), i.e. k in time ~ n^k."""
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, times) if n > 0 and t > 0]
+    if len(points) < 2:
+        return None
+    
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def _drain_generator(generator_func):
+    """Wrap an operation generator as a sort function that just consumes every operation."""
+    from collections import deque
+    
+    def drain(arr: List[int]) -> None:
+        deque(generator_func(arr), maxlen=0)
+    return drain
+
+
+def _count_alloc_events(generator_func):
+    """Like ``_drain_generator``, but also count the auxiliary buffers the generator reports.
+    
+    The count of the latest run is left in the wrapper's ``alloc_events``.
+    """
+    def drain(arr: List[int]) -> None:
+        drain.alloc_events = sum(1 for op_code, delta, _ in generator_func(arr)
+                                 if op_code == OP_META_ALLOC and delta > 0)
+    drain.alloc_events = 0
+    return drain
+
+
+def run_benchmark(choices: List[str], sizes: List[int], repeats: int = TIMING_REPEATS,
+                  warmup: int = TIMING_WARMUP, seed: Optional[int] = None, max_seconds: float = 10.0,
+                  with_counts: bool = False, distribution: str = 'random',
+                  generators: bool = False, records: bool = False) -> dict:
+    """Time the uninstrumented variants of ``choices`` over a sweep of input sizes.
+
+    Every algorithm sorts the same seeded input at each size, drawn from
+    ``generate_workload(distribution, n)``. Once an algorithm's median run exceeds ``max_seconds`` it is skipped at
+    larger sizes, so quadratic sorts do not stall a sweep up to 1e6. With
+    ``with_counts`` the instrumented generator is also run once per size to
+    add ``OperationCounts`` fields to each row. With ``generators`` the
+    instrumented generators themselves are timed, and each row also gets
+    ``operations`` and ``ns_per_operation`` (the cost of one yield). With
+    ``records`` each algorithm sorts ``generate_records`` dicts through
+    ``sort_records`` by ``record_sort_key``, and each row gets ``key_calls``.
+    """
+    from functools import partial
+    
+    rng = random.Random(seed)
+    make_input = generate_records if records else generate_workload
+    inputs = {n: make_input(distribution, n, rng) for n in sizes}
+    
+    rows = []
+    fits = {}
+    for choice in choices:
+        name = ALGORITHM_NAMES[choice]
+        if generators:
+            sort_func = _drain_generator(get_algorithm_function(choice))
+        elif records:
+            sort_func = partial(sort_records, key=record_sort_key, choice=choice)
+        else:
+            sort_func = get_algorithm_function(choice, fast=True)
+        measured_sizes, measured_times = [], []
+        
+        for n in sizes:
+            if measured_times and measured_times[-1] > max_seconds * 1e9:
+                print(f"   {name}: skipping n={n} (previous size exceeded {max_seconds}s)")
+                continue
+            
+            timing = time_algorithm(sort_func, inputs[n], repeats, warmup)
+            measured_sizes.append(n)
+            measured_times.append(timing.median_ns)
+            row = {
+                'algorithm': name,
+                'n': n,
+                'repeats': repeats,
+                'median_ns': timing.median_ns,
+                'p95_ns': timing.p95_ns,
+                'stdev_ns': timing.stdev_ns,
+            }
+            print(f"   {name:<15} n={n:<9} median {format_duration(timing.median_ns):>11}  "
+                  f"p95 {format_duration(timing.p95_ns):>11}")
+            
+            if records:
+                row['key_calls'] = count_key_calls(partial(sort_records, choice=choice), inputs[n],
+                                                   record_sort_key)
+                print(f"   {'':<15} {row['key_calls']:,} key calls ({row['key_calls'] / max(n, 1):.2f} per record)")
+            if with_counts or generators:
+                counts = count_operations(get_algorithm_function(choice), inputs[n])
+                if with_counts:
+                    row.update(counts.as_dict())
+                    print(f"   {'':<15} {counts.summary()}")
+            if generators:
+                # Every yielded tuple, including the meta ones, costs one resume
+                operations = sum(1 for _ in get_algorithm_function(choice)(inputs[n]))
+                row['operations'] = operations
+                row['ns_per_operation'] = timing.median_ns / max(operations, 1)
+                print(f"   {'':<15} {row['ns_per_operation']:.0f} ns per operation, "
+                      f"recursion depth {counts.max_depth}")
+            rows.append(row)
+        
+        fits[name] = {
+            'fitted_exponent': fit_growth_exponent(measured_sizes, measured_times),
+            'readme_average': ALGORITHM_COMPLEXITY[choice],
+        }
+    
+    return {
+        'config': {'sizes': sizes, 'repeats': repeats, 'warmup': warmup, 'seed': seed,
+                   'max_seconds': max_seconds, 'with_counts': with_counts,
+                   'distribution': distribution, 'generators': generators, 'records': records},
+        'results': rows,
+        'fits': fits,
+    }
+
+
+def run_depth_benchmark(choices: List[str], sizes: List[int], repeats: int = TIMING_REPEATS,
+                        warmup: int = TIMING_WARMUP,
+                        seed: Optional[int] = None, distribution: str = 'sorted') -> dict:
+    """Time the instrumented generators at growing recursion depth and fit the cost per yield against it.
+    
+    On sorted input Quick Sort's depth equals n. A fitted ``depth_exponent``
+    near 0 in ns ~ depth^k therefore shows that resuming the generator does
+    not walk a chain of nested ``yield from`` frames; such a chain made
+    each yield linear in depth (k near 1).
+    """
+    rng = random.Random(seed)
+    inputs = {n: generate_workload(distribution, n, rng) for n in sizes}
+    
+    rows = []
+    fits = {}
+    for choice in choices:
+        name = ALGORITHM_NAMES[choice]
+        generator_func = get_algorithm_function(choice)
+        depths, costs = [], []
+        for n in sizes:
+            counts = count_operations(generator_func, inputs[n])
+            operations = sum(1 for _ in generator_func(inputs[n]))
+            timing = time_algorithm(_drain_generator(generator_func), inputs[n], repeats, warmup)
+            ns_per_operation = timing.median_ns / max(operations, 1)
+            depths.append(counts.max_depth)
+            costs.append(ns_per_operation)
+            rows.append({
+                'algorithm': name,
+                'n': n,
+                'repeats': repeats,
+                'max_depth': counts.max_depth,
+                'operations': operations,
+                'median_ns': timing.median_ns,
+                'ns_per_operation': ns_per_operation,
+            })
+            print(f"   {name:<15} n={n:<9} depth {counts.max_depth:<7,} {operations:>13,} operations  "
+                  f"{ns_per_operation:6.0f} ns per operation")
+        
+        fits[name] = {'depth_exponent': fit_growth_exponent(depths, costs)}
+    
+    return {
+        'config': {'sizes': sizes, 'repeats': repeats, 'warmup': warmup, 'seed': seed,
+                   'distribution': distribution, 'depth': True},
+        'results': rows,
+        'fits': fits,
+    }
+
+
+def run_parallel_benchmark(choice: str, sizes: List[int], worker_counts: List[int],
+                           repeats: int = TIMING_REPEATS, warmup: int = TIMING_WARMUP, seed: Optional[int] = None,
+                           distribution: str = 'random') -> dict:
+    """Time the parallel sorts against sequential ``choice`` at each size and worker count.
+    
+    ``choice`` is also the algorithm the workers run on their chunks. Each
+    worker count gets one process pool, reused over the repeats, and every
+    row records its ``speedup`` over the sequential median.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    rng = random.Random(seed)
+    inputs = {n: generate_workload(distribution, n, rng) for n in sizes}
+    sequential_name = ALGORITHM_NAMES[choice]
+    
+    rows = []
+    for n in sizes:
+        sequential = time_algorithm(get_algorithm_function(choice, fast=True), inputs[n], repeats, warmup)
+        print(f"   {sequential_name:<20} n={n:<9} median {format_duration(sequential.median_ns):>11}")
+        
+        for workers in worker_counts:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for name, sort_func in PARALLEL_SORTS.values():
+                    timing = time_algorithm(
+                        lambda data: sort_func(data, workers, choice, pool), inputs[n], repeats, warmup)
+                    speedup = sequential.median_ns / timing.median_ns
+                    rows.append({
+                        'algorithm': name,
+                        'n': n,
+                        'workers': workers,
+                        'repeats': repeats,
+                        'median_ns': timing.median_ns,
+                        'p95_ns': timing.p95_ns,
+                        'stdev_ns': timing.stdev_ns,
+                        'sequential_median_ns': sequential.median_ns,
+                        'speedup': speedup,
+                    })
+                    print(f"   {name:<20} n={n:<9} median {format_duration(timing.median_ns):>11}  "
+                          f"workers {workers:<3} speedup {speedup:.2f}x")
+    
+    return {
+        'config': {'sizes': sizes, 'worker_counts': worker_counts, 'repeats': repeats,
+                   'warmup': warmup, 'seed': seed, 'distribution': distribution,
+                   'chunk_algorithm': sequential_name, 'cpu_count': os.cpu_count()},
+        'results': rows,
+    }
+
+
+def run_numpy_benchmark(sizes: List[int], radixes: Iterable[int] = (NUMPY_RADIX,),
+                        repeats: int = TIMING_REPEATS, warmup: int = TIMING_WARMUP, seed: Optional[int] = None, distribution: str = 'random') -> dict:
+    """Time the NumPy sorts against built-in ``sorted()`` over a sweep of input sizes.
+    
+    Inputs are Python lists, so conversion to and from NumPy is part of
+    each time. Rows add ``speedup_vs_sorted``; a counting sort whose input
+    range is too wide for it is skipped at that size.
+    """
+    rng = random.Random(seed)
+    inputs = {n: generate_workload(distribution, n, rng) for n in sizes}
+    candidates = {'Built-in sorted': (sorted, 'O(n log n)'), **numpy_sorts(radixes)}
+    
+    rows = []
+    fits = {}
+    baseline = {}
+    for name, (sort_func, complexity) in candidates.items():
+        measured_sizes, measured_times = [], []
+        for n in sizes:
+            try:
+                timing = time_algorithm(sort_func, inputs[n], repeats, warmup)
+            except ValueError as exc:
+                print(f"   {name}: skipping n={n} ({exc})")
+                continue
+            baseline.setdefault(n, timing.median_ns)
+            measured_sizes.append(n)
+            measured_times.append(timing.median_ns)
+            speedup = baseline[n] / timing.median_ns
+            rows.append({
+                'algorithm': name,
+                'n': n,
+                'repeats': repeats,
+                'median_ns': timing.median_ns,
+                'p95_ns': timing.p95_ns,
+                'stdev_ns': timing.stdev_ns,
+                'speedup_vs_sorted': speedup,
+            })
+            print(f"   {name:<17} n={n:<9} median {format_duration(timing.median_ns):>11}  "
+                  f"{speedup:.2f}x vs sorted()")
+        
+        fits[name] = {
+            'fitted_exponent': fit_growth_exponent(measured_sizes, measured_times),
+            'readme_average': complexity,
+        }
+    
+    return {
+        'config': {'sizes': sizes, 'repeats': repeats, 'warmup': warmup, 'seed': seed,
+                   'distribution': distribution, 'numpy': True, 'radixes': list(radixes)},
+        'results': rows,
+        'fits': fits,
+    }
+
+
+def run_selector_benchmark(sizes: List[int], fixed_choice: str = AUTO_FIXED_CHOICE,
+                           repeats: int = TIMING_REPEATS, warmup: int = TIMING_WARMUP, seed: Optional[int] = None,
+                           distributions: Iterable[str] = SWEEP_WORKLOADS) -> dict:
+    """Time ``auto_sort`` against always using ``fixed_choice``, for every distribution and size.
+    
+    Each row names the algorithm Auto picked and why, and adds
+    ``selector_ns`` (the median cost of ``select_algorithm`` alone, which is
+    also inside ``auto_median_ns``), ``overhead`` (that cost as a share of
+    the Auto sort) and ``speedup`` (fixed median over Auto median).
+    """
+    rng = random.Random(seed)
+    fixed_name = ALGORITHM_NAMES[fixed_choice]
+    fixed_func = get_algorithm_function(fixed_choice, fast=True)
+    
+    rows = []
+    for distribution in distributions:
+        for n in sizes:
+            values = generate_workload(distribution, n, rng)
+            choice, reason = select_algorithm(values)
+            selector = time_algorithm(select_algorithm, values, repeats, warmup)
+            auto = time_algorithm(auto_sort, values, repeats, warmup)
+            fixed = time_algorithm(fixed_func, values, repeats, warmup)
+            row = {
+                'distribution': distribution,
+                'n': n,
+                'repeats': repeats,
+                'selected': ALGORITHM_NAMES[choice],
+                'reason': reason,
+                'selector_ns': selector.median_ns,
+                'auto_median_ns': auto.median_ns,
+                'fixed_median_ns': fixed.median_ns,
+                'overhead': selector.median_ns / auto.median_ns,
+                'speedup': fixed.median_ns / auto.median_ns,
+            }
+            rows.append(row)
+            print(f"   {distribution:<13} n={n:<9} {row['selected']:<15} "
+                  f"auto {format_duration(auto.median_ns):>11}  {fixed_name} {format_duration(fixed.median_ns):>11}  "
+                  f"{row['speedup']:.2f}x, selector {row['overhead']:.1%}")
+    
+    return {
+        'config': {'sizes': sizes, 'repeats': repeats, 'warmup': warmup, 'seed': seed,
+                   'distributions': list(distributions), 'auto': True, 'fixed_algorithm': fixed_name},
+        'results': rows,
+    }
+
+
+def run_memory_benchmark(choices: List[str], sizes: List[int], seed: Optional[int] = None,
+                         max_seconds: float = 10.0, distribution: str = 'random',
+                         generators: bool = False, baseline: Optional[List[dict]] = None) -> dict:
+    """Measure each algorithm's peak memory over a sweep of input sizes.
+    
+    Rows hold ``peak_bytes`` (everything allocated during the run), ``aux_bytes``
+    (peak minus the returned copy) and ``bytes_per_element``. Each algorithm
+    also gets the growth exponent of its auxiliary memory next to the
+    README's Space column. With ``generators`` the instrumented generators
+    are measured instead, and each row also gets ``generator_alloc_events``:
+    how many auxiliary buffers the generator reported allocating during the
+    measured run. That is the generator's own account, not a tracemalloc
+    figure. Rows of a ``baseline`` run (see
+    ``read_benchmark_results``) are compared by ``find_memory_regressions``.
+    """
+    rng = random.Random(seed)
+    inputs = {n: generate_workload(distribution, n, rng) for n in sizes}
+    
+    rows = []
+    fits = {}
+    for choice in choices:
+        name = ALGORITHM_NAMES[choice]
+        if generators:
+            sort_func = _count_alloc_events(get_algorithm_function(choice))
+        else:
+            sort_func = get_algorithm_function(choice, fast=True)
+        measured_sizes, measured_bytes = [], []
+        elapsed = 0.0
+        
+        for n in sizes:
+            if elapsed > max_seconds:
+                print(f"   {name}: skipping n={n} (previous size exceeded {max_seconds}s)")
+                continue
+            
+            start = time.perf_counter()
+            memory = measure_memory(sort_func, inputs[n])
+            elapsed = time.perf_counter() - start
+            measured_sizes.append(n)
+            measured_bytes.append(memory.aux_bytes)
+            row = {
+                'algorithm': name,
+                'n': n,
+                'peak_bytes': memory.peak_bytes,
+                'aux_bytes': memory.aux_bytes,
+                'bytes_per_element': memory.peak_bytes / n,
+            }
+            events = ''
+            if generators:
+                row['generator_alloc_events'] = sort_func.alloc_events
+                events = f"  {sort_func.alloc_events:,} alloc events (generator-reported)"
+            rows.append(row)
+            print(f"   {name:<15} n={n:<9} peak {format_bytes(memory.peak_bytes):>10}  "
+                  f"aux {format_bytes(memory.aux_bytes):>10}  {memory.peak_bytes / n:6.1f} B/element{events}")
+        
+        fits[name] = {
+            'space_exponent': fit_growth_exponent(measured_sizes, measured_bytes),
+            'readme_space': ALGORITHM_SPACE.get(choice, 'n/a'),
+        }
+    
+    results = {
+        'config': {'sizes': sizes, 'seed': seed, 'max_seconds': max_seconds, 'distribution': distribution,
+                   'generators': generators, 'memory': True},
+        'results': rows,
+        'fits': fits,
+    }
+    if baseline is not None:
+        results['regressions'] = find_memory_regressions(rows, baseline)
+    return results
+
+
+def find_memory_regressions(rows: List[dict], baseline: List[dict],
+                            tolerance: float = MEMORY_REGRESSION_TOLERANCE) -> List[dict]:
+    """Rows whose peak memory grew by more than ``tolerance`` over the same algorithm and size in ``baseline``."""
+    previous = {(row['algorithm'], int(row['n'])): int(float(row['peak_bytes']))
+                for row in baseline if row.get('peak_bytes') not in (None, '')}
+    regressions = []
+    for row in rows:
+        before = previous.get((row['algorithm'], row['n']))
+        if before is None:
+            continue
+        if row['peak_bytes'] > before * (1 + tolerance) + MEMORY_REGRESSION_SLACK:
+            regressions.append({'algorithm': row['algorithm'], 'n': row['n'],
+                                'baseline_peak_bytes': before, 'peak_bytes': row['peak_bytes']})
+    return regressions
+
+
+def read_benchmark_results(path: str) -> List[dict]:
+    """Rows of a results file written by ``write_benchmark_results`` (CSV or JSON)."""
+    with open(path, newline='') as handle:
+        if path.endswith('.json'):
+            return json.load(handle)['results']
+        return list(csv.DictReader(handle))
+
+
+def write_benchmark_results(results: dict, path: str, fmt: str) -> None:
+    """Write ``run_benchmark`` output as CSV (one row per algorithm and size) or JSON."""
+    if fmt == 'json':
+        with open(path, 'w') as handle:
+            json.dump(results, handle, indent=2)
+        return
+    
+    if 'worker_counts' in results['config']:
+        fieldnames = ['algorithm', 'n', 'workers', 'repeats', 'median_ns', 'p95_ns', 'stdev_ns',
+                      'sequential_median_ns', 'speedup']
+        with open(path, 'w', newline='') as handle:
+            writer = csv.DictWriter(handle, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(results['results'])
+        return
+    
+    if results['config'].get('auto'):
+        fieldnames = ['distribution', 'n', 'repeats', 'selected', 'reason', 'selector_ns', 'auto_median_ns',
+                      'fixed_median_ns', 'overhead', 'speedup']
+        with open(path, 'w', newline='') as handle:
+            writer = csv.DictWriter(handle, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(results['results'])
+        return
+    
+    if results['config'].get('depth'):
+        fieldnames = ['algorithm', 'n', 'repeats', 'max_depth', 'operations', 'median_ns', 'ns_per_operation',
+                      'depth_exponent']
+        with open(path, 'w', newline='') as handle:
+            writer = csv.DictWriter(handle, fieldnames=fieldnames)
+            writer.writeheader()
+            for row in results['results']:
+                writer.writerow({**row, **results['fits'][row['algorithm']]})
+        return
+    
+    if results['config'].get('memory'):
+        fieldnames = ['algorithm', 'n', 'peak_bytes', 'aux_bytes', 'bytes_per_element']
+        if results['config'].get('generators'):
+            fieldnames.append('generator_alloc_events')
+        fieldnames += ['space_exponent', 'readme_space']
+        with open(path, 'w', newline='') as handle:
+            writer = csv.DictWriter(handle, fieldnames=fieldnames)
+            writer.writeheader()
+            for row in results['results']:
+                writer.writerow({**row, **results['fits'][row['algorithm']]})
+        return
+    
+    fieldnames = ['algorithm', 'n', 'repeats', 'median_ns', 'p95_ns', 'stdev_ns',
+                  'fitted_exponent', 'readme_average']
+    if results['config'].get('with_counts'):
+        fieldnames += list(OperationCounts.FIELDS)
+    if results['config'].get('generators'):
+        fieldnames += ['operations', 'ns_per_operation']
+    if results['config'].get('records'):
+        fieldnames.append('key_calls')
+    if results['config'].get('numpy'):
+        fieldnames.append('speedup_vs_sorted')
+    with open(path, 'w', newline='') as handle:
+        writer = csv.DictWriter(handle, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in results['results']:
+            writer.writerow({**row, **results['fits'][row['algorithm']]})
+
+
+def print_growth_summary(results: dict) -> None:
+    """Print fitted exponents next to the README's average-case complexity."""
+    print("\n📐 Empirical growth (time ~ n^k):")
+    for name, fit in results['fits'].items():
+        exponent = fit['fitted_exponent']
+        fitted = f"{exponent:.2f}" if exponent is not None else "n/a"
+        print(f"   {name:<17} k = {fitted:<6} README average: {fit['readme_average']}")
+
+
+def print_depth_summary(results: dict) -> None:
+    """Print how each generator's cost per yield grows with recursion depth."""
+    print("\n📐 Cost per yield against recursion depth (ns ~ depth^k, k = 0 is flat):")
+    for name, fit in results['fits'].items():
+        exponent = fit['depth_exponent']
+        fitted = f"{exponent:.2f}" if exponent is not None else "n/a"
+        costs = [f"{row['max_depth']:,}→{row['ns_per_operation']:.0f}ns" for row in results['results']
+                 if row['algorithm'] == name]
+        print(f"   {name:<17} k = {fitted:<6} {'  '.join(costs)}")
+
+
+def print_speedup_summary(results: dict) -> None:
+    """Print each parallel sort's speedup curve against worker count, per input size."""
+    print(f"\n🚀 Speedup over sequential {results['config']['chunk_algorithm']} "
+          f"({results['config']['cpu_count']} CPUs available):")
+    curves = {}
+    for row in results['results']:
+        curves.setdefault((row['algorithm'], row['n']), []).append(f"{row['workers']}→{row['speedup']:.2f}x")
+    for (name, n), points in curves.items():
+        print(f"   {name:<20} n={n:<9} {'  '.join(points)}")
+
+
+def print_selector_summary(results: dict) -> None:
+    """Print Auto's geometric-mean speedup over the fixed algorithm and its median selector overhead."""
+    import statistics
+    
+    rows = results['results']
+    if not rows:
+        return
+    speedup = math.exp(statistics.fmean(math.log(row['speedup']) for row in rows))
+    overhead = statistics.median(row['overhead'] for row in rows)
+    print(f"\n🤖 Auto vs {results['config']['fixed_algorithm']}: {speedup:.2f}x geometric-mean speedup, "
+          f"selector {overhead:.1%} of the sort (median)")
+    for distribution in results['config']['distributions']:
+        picks = [f"n={row['n']}→{row['selected']}" for row in rows if row['distribution'] == distribution]
+        print(f"   {distribution:<13} {'  '.join(picks)}")
+
+
+def print_memory_summary(results: dict) -> None:
+    """Print fitted auxiliary-memory exponents next to the README's Space column, then any regressions."""
+    print("\n📐 Empirical auxiliary memory (bytes ~ n^k):")
+    for name, fit in results['fits'].items():
+        exponent = fit['space_exponent']
+        fitted = f"{exponent:.2f}" if exponent is not None else "n/a"
+        print(f"   {name:<17} k = {fitted:<6} README space: {fit['readme_space']}")
+    
+    if 'regressions' in results:
+        if not results['regressions']:
+            print("✅ No memory regressions against the baseline")
+        for regression in results['regressions']:
+            growth = regression['peak_bytes'] / max(regression['baseline_peak_bytes'], 1) - 1
+            print(f"⚠️ Regression: {regression['algorithm']} n={regression['n']} peak "
+                  f"{format_bytes(regression['baseline_peak_bytes'])} → {format_bytes(regression['peak_bytes'])} "
+                  f"(+{growth:.0%})")
+
+# --- Plotting Backend ---
+
+def _has_display() -> bool:
+    """Whether an interactive window can be opened on this machine."""
+    if sys.platform == 'darwin' or sys.platform.startswith('win'):
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def _load_pyplot():
+    """Import matplotlib on first use and return ``(pyplot, animation)``.
+
+    The sorting core never needs matplotlib, so it is only imported once a
+    visualization is requested. An explicit ``MPLBACKEND`` is respected;
+    otherwise the OS-appropriate GUI backend is used, falling back to the
+    non-interactive Agg backend when there is no display.
+    """
+    import matplotlib
+    
+    if not os.environ.get('MPLBACKEND'):
+        # Set appropriate backend based on operating system
+        if not _has_display():
+            matplotlib.use('Agg')
+        elif sys.platform == 'darwin':  # macOS
+            matplotlib.use('MacOSX')
+        elif sys.platform.startswith(('win', 'linux')):
+            matplotlib.use('TkAgg')
+        # Otherwise let matplotlib choose the best backend
+    
+    import matplotlib.pyplot as plt
+    import matplotlib.animation as animation
+    return plt, animation
+
+# --- Rendering ---
+
+class BarRenderer:
+    """Bar chart for one axes that only touches bars whose height or color changed.
+
+    Heights and colors of every bar are cached and each frame is diffed
+    against them. Without ``blit`` only the changed ``Rectangle`` artists get
+    ``set_height``/``set_color`` calls. With ``blit`` the bars and the label
+    are animated artists, so a full draw only paints the background, which is
+    cached; each frame then restores just the pixel columns of the changed
+    bars (plus the label box), repaints the bars inside them in a single
+    collection draw and blits those regions to the screen.
+    """
+    
+    MAX_REGIONS = 8  # Beyond this many dirty runs, repaint their bounding region once
+    
+    def __init__(self, ax: 'plt.Axes', bars, label, blit: bool):
+        self.ax = ax
+        self.bars = list(bars)
+        self.label = label
+        self.blit = blit
+        self.heights = [bar.get_height() for bar in self.bars]
+        self.colors = [BAR_COLOR_NORMAL] * len(self.bars)
+        for bar in self.bars:
+            bar.set_color(BAR_COLOR_NORMAL)
+        self.half_width = self.bars[0].get_width() / 2 if self.bars else 0.5
+        self.background = None
+        self._label_bbox = None
+        self._rgba = {}  # Color name -> RGBA tuple, converted once per color
+        
+        if blit:
+            for bar in self.bars:
+                bar.set_animated(True)
+            label.set_animated(True)
+            # Only the axes background is cached, so glyphs beyond it could never be erased
+            label.set_clip_box(ax.bbox)
+            label.set_clip_on(True)
+            ax.figure.canvas.mpl_connect('draw_event', self._on_draw)
+    
+    @property
+    def artists(self) -> list:
+        return self.bars + [self.label]
+    
+    def _on_draw(self, event) -> None:
+        """Re-cache the bar-free background after any full redraw and repaint everything."""
+        canvas = self.ax.figure.canvas
+        self.background = canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_bars(0, len(self.bars) - 1, self.ax.bbox)
+        self.ax.draw_artist(self.label)
+        self._label_bbox = self.label.get_window_extent()
+        canvas.blit(self.ax.bbox)
+    
+    def update(self, heights, base_color: str, highlighted: Tuple[int, ...] = (),
+               prefix_count: int = 0, prefix_color: Optional[str] = None) -> None:
+        """Show ``heights``; bars before ``prefix_count`` use ``prefix_color``
+        and ``highlighted`` bars use ``BAR_COLOR_SELECTED``."""
+        cached_heights = self.heights
+        cached_colors = self.colors
+        dirty = []
+        
+        for i in range(len(cached_heights)):
+            height = heights[i]
+            if i in highlighted:
+                color = BAR_COLOR_SELECTED
+            elif i < prefix_count:
+                color = prefix_color
+            else:
+                color = base_color
+            
+            old_height = cached_heights[i]
+            if height != old_height or color != cached_colors[i]:
+                cached_heights[i] = height
+                cached_colors[i] = color
+                dirty.append((i, max(height, old_height)))
+        
+        if not dirty:
+            return
+        if not self.blit:
+            bars = self.bars
+            for i, _ in dirty:
+                bars[i].set_height(cached_heights[i])
+                bars[i].set_color(cached_colors[i])
+        elif self.background is not None:
+            self._repaint_bars(dirty)
+    
+    def set_label(self, text: str) -> None:
+        """Change the status label, repainting only its box when blitting."""
+        if text == self.label.get_text():
+            return
+        self.label.set_text(text)
+        
+        if self.blit and self.background is not None:
+            from matplotlib.transforms import Bbox
+            
+            old_bbox = self._label_bbox
+            self._label_bbox = self.label.get_window_extent()
+            self._repaint(self._label_bbox if old_bbox is None
+                          else Bbox.union([old_bbox, self._label_bbox]))
+    
+    def _draw_bars(self, lo: int, hi: int, clip) -> None:
+        """Draw bars ``lo..hi`` from the cached state as one collection clipped to ``clip``."""
+        import numpy as np
+        from matplotlib.collections import PolyCollection
+        from matplotlib.colors import to_rgba
+        
+        if hi < lo:
+            return
+        centers = np.arange(lo, hi + 1, dtype=float)
+        verts = np.zeros((hi - lo + 1, 4, 2))
+        verts[:, 0, 0] = verts[:, 1, 0] = centers - self.half_width
+        verts[:, 2, 0] = verts[:, 3, 0] = centers + self.half_width
+        verts[:, 1, 1] = verts[:, 2, 1] = self.heights[lo:hi + 1]
+        
+        rgba = self._rgba
+        for color in set(self.colors[lo:hi + 1]) - rgba.keys():
+            rgba[color] = to_rgba(color)
+        colors = np.array([rgba[color] for color in self.colors[lo:hi + 1]])
+        # Fill only: stroking the hairline edges would double the raster work
+        collection = PolyCollection(verts, facecolors=colors, linewidths=0,
+                                    transform=self.ax.transData)
+        collection.set_snap(True)
+        collection.set_figure(self.ax.figure)
+        collection.set_clip_box(clip)
+        self.ax.draw_artist(collection)
+    
+    def _repaint_bars(self, dirty: List[Tuple[int, int]]) -> None:
+        """Repaint the pixel columns covering the changed bars."""
+        from matplotlib.transforms import Bbox
+        
+        # Merge neighbouring bars into runs so each run is one restore and one blit
+        runs = []
+        for index, top in dirty:
+            if runs and index - runs[-1][1] <= 2:
+                runs[-1][1] = index
+                runs[-1][2] = max(runs[-1][2], top)
+            else:
+                runs.append([index, index, top])
+        if len(runs) > self.MAX_REGIONS:
+            runs = [[runs[0][0], runs[-1][1], max(run[2] for run in runs)]]
+        
+        to_display = self.ax.transData.transform
+        for first, last, top in runs:
+            (x0, y0), (x1, y1) = to_display([(first - self.half_width, 0),
+                                             (last + self.half_width, top)])
+            self._repaint(Bbox.from_extents(x0, y0, x1, y1))
+    
+    def _repaint(self, region: 'Bbox') -> None:
+        """Restore the background inside ``region`` (display coordinates),
+        redraw every artist overlapping it, and blit it to the screen."""
+        from matplotlib.transforms import Bbox
+        
+        ax = self.ax
+        canvas = ax.figure.canvas
+        # Snap to whole pixels so the restored area and the clip box coincide
+        region = Bbox.from_extents(math.floor(region.x0) - 1, math.floor(region.y0) - 1,
+                                   math.ceil(region.x1) + 1, math.ceil(region.y1) + 1)
+        region = Bbox.intersection(region, ax.bbox)
+        if region is None:
+            return
+        
+        # Agg regions use a top-left origin
+        figure_height = canvas.figure.bbox.height
+        x1, y1, _, _ = self.background.get_extents()
+        canvas.restore_region(self.background,
+                              bbox=(region.x0, figure_height - region.y1,
+                                    region.x1, figure_height - region.y0),
+                              xy=(x1, y1))
+        
+        # Narrow bars share pixel columns with their neighbours, so redraw every
+        # bar reaching into the restored columns, clipped to them
+        (lo_x, bottom), (hi_x, _) = ax.transData.inverted().transform(
+            [(region.x0, region.y0), (region.x1, region.y1)])
+        lo = max(0, int(math.floor(lo_x - self.half_width)))
+        hi = min(len(self.bars) - 1, int(math.ceil(hi_x + self.half_width)))
+        if lo <= hi and max(self.heights[lo:hi + 1]) > bottom:
+            # Agg clips to [x0, x1) while the restore covers x1 as well
+            self._draw_bars(lo, hi, Bbox.from_extents(region.x0, region.y0, region.x1 + 1, region.y1))
+        
+        if self._label_bbox is not None and self._label_bbox.overlaps(region):
+            ax.draw_artist(self.label)
+        canvas.blit(region)
+
+
+class RasterRenderer:
+    """Whole array drawn as one image, for inputs far beyond one bar per pixel.
+
+    The array is bucketed into at most one column per horizontal pixel and
+    each column shows the min/max of its bucket: solid up to the minimum,
+    dimmed between minimum and maximum. Every frame is a handful of NumPy
+    operations (``reduceat`` plus two broadcast comparisons) writing a small
+    integer buffer that a ``ListedColormap`` turns into colors, so the cost
+    does not depend on per-element Python calls.
+    """
+    
+    def __init__(self, ax: 'plt.Axes', n: int, y_max: float, label, blit: bool):
+        import numpy as np
+        
+        self.ax = ax
+        self.label = label
+        self.blit = blit
+        self.n = n
+        self.background = None
+        
+        figure_width, figure_height = ax.figure.get_size_inches() * ax.figure.dpi
+        position = ax.get_position()
+        self.columns = max(1, min(n, int(figure_width * position.width)))
+        self.rows = max(1, int(figure_height * position.height))
+        self.starts = (np.arange(self.columns) * n) // self.columns
+        self.column_rows = self.rows / y_max  # Pixel rows per unit of height
+        self.row_index = np.arange(self.rows)[:, None]
+        self.buffer = np.zeros((self.rows, self.columns), dtype=np.uint8)
+        self._palette_key = None
+        
+        self.image = ax.imshow(self.buffer, origin='lower', aspect='auto', interpolation='nearest',
+                               extent=(-1, n, 0, y_max), vmin=-0.5, vmax=8.5)
+        self._set_palette(BAR_COLOR_NORMAL, BAR_COLOR_NORMAL)
+        
+        if blit:
+            self.image.set_animated(True)
+            label.set_animated(True)
+            # _blit restores only the axes, as BarRenderer does
+            label.set_clip_box(ax.bbox)
+            label.set_clip_on(True)
+            ax.figure.canvas.mpl_connect('draw_event', self._on_draw)
+    
+    @property
+    def artists(self) -> list:
+        return [self.image, self.label]
+    
+    def _set_palette(self, base_color: str, prefix_color: str) -> None:
+        """Palette index = 3 * color class + fill level (background, min..max band, solid)."""
+        from matplotlib.colors import ListedColormap, to_rgb
+        
+        key = (base_color, prefix_color)
+        if key == self._palette_key:
+            return
+        self._palette_key = key
+        
+        background = to_rgb(BACKGROUND_COLOR)
+        palette = []
+        for color in (base_color, prefix_color, BAR_COLOR_SELECTED):
+            solid = to_rgb(color)
+            dimmed = tuple((c + b) / 2 for c, b in zip(solid, background))
+            palette.extend([background, dimmed, solid])
+        self.image.set_cmap(ListedColormap(palette))
+    
+    def _on_draw(self, event) -> None:
+        canvas = self.ax.figure.canvas
+        self.background = canvas.copy_from_bbox(self.ax.bbox)
+        self._blit()
+    
+    def _blit(self) -> None:
+        canvas = self.ax.figure.canvas
+        canvas.restore_region(self.background)
+        self.ax.draw_artist(self.image)
+        self.ax.draw_artist(self.label)
+        canvas.blit(self.ax.bbox)
+    
+    def update(self, heights, base_color: str, highlighted: Tuple[int, ...] = (),
+               prefix_count: int = 0, prefix_color: Optional[str] = None) -> None:
+        """Show ``heights``; same color rules as ``BarRenderer.update``."""
+        import numpy as np
+        
+        values = np.asarray(heights)
+        column_max = np.maximum.reduceat(values, self.starts)
+        column_min = np.minimum.reduceat(values, self.starts)
+        max_rows = np.ceil(column_max * self.column_rows)
+        min_rows = np.ceil(column_min * self.column_rows)
+        
+        # Color class per column: 0 = base, 1 = prefix, 2 = highlighted
+        classes = np.zeros(self.columns, dtype=np.uint8)
+        if prefix_count:
+            classes[:(prefix_count * self.columns) // self.n] = 1
+        for index in highlighted:
+            if index >= 0:
+                classes[(index * self.columns) // self.n] = 2
+        
+        buffer = self.buffer
+        np.less(self.row_index, max_rows, out=buffer, casting='unsafe')
+        buffer += self.row_index < min_rows
+        buffer += 3 * classes
+        
+        self._set_palette(base_color, prefix_color or base_color)
+        self.image.set_data(buffer)
+        if self.blit and self.background is not None:
+            self._blit()
+    
+    def set_label(self, text: str) -> None:
+        """Change the status label; it is repainted with the image on the next update."""
+        self.label.set_text(text)
+
+
+class BlitAnimation:
+    """Timer-driven playback for renderers that blit their own regions.
+
+    ``FuncAnimation`` either redraws the whole figure or restores whole axes
+    backgrounds on every frame, which would undo the per-bar repainting; this
+    only calls ``update_func`` from a GUI timer and leaves drawing to it.
+    """
+    
+    def __init__(self, fig, update_func, frames: Iterable[int], interval: int):
+        self.update_func = update_func
+        self.frames = iter(frames)
+        self.timer = fig.canvas.new_timer(interval=interval)
+        self.timer.add_callback(self._step)
+        self._started = False
+        fig.canvas.mpl_connect('draw_event', self._start)
+        fig.canvas.mpl_connect('close_event', lambda event: self.stop())
+    
+    def _start(self, event) -> None:
+        if not self._started:
+            self._started = True
+            self.timer.start()
+    
+    def _step(self) -> None:
+        frame = next(self.frames, None)
+        if frame is None:
+            self.stop()
+            return
+        self.update_func(frame)
+    
+    def stop(self) -> None:
+        self.timer.stop()
+
+# --- Visualization Class ---
+
+class SortingVisualizer:
+    """Advanced sorting algorithm visualizer with customizable bar count."""
+    
+    def __init__(self, n_bars: int, keyframe_interval: Optional[int] = None, renderer: str = 'auto',
+                 workload: str = 'random', seed: Optional[int] = None,
+                 initial_array: Optional[List[int]] = None, trace_cache: Optional[TraceCache] = None):
+        if renderer not in ('auto', 'bars', 'raster'):
+            raise ValueError(f"Unknown renderer {renderer!r}; expected 'auto', 'bars' or 'raster'")
+        self.n_bars = n_bars
+        self.workload = workload
+        self.seed = seed
+        self.keyframe_interval = keyframe_interval
+        # An unseeded random input never comes back, so its traces would only evict reusable ones
+        reproducible = initial_array is not None or seed is not None or workload in SEEDLESS_WORKLOADS
+        self.trace_cache = trace_cache if reproducible else None
+        if trace_cache is not None and not reproducible:
+            print("💾 Not caching traces of an unseeded random input (pass --seed to reuse them)")
+        self.use_raster = renderer == 'raster' or (renderer == 'auto' and n_bars > RASTER_THRESHOLD)
+        # Stored as int64 rather than boxed ints; traces and workers receive it compactly
+        self.initial_array = array('q', self._generate_array() if initial_array is None else initial_array)
+        
+    def _generate_array(self) -> List[int]:
+        """Generate array with heights from 1 to n_bars in the selected workload distribution."""
+        array = generate_workload(self.workload, self.n_bars, random.Random(self.seed))
+        print(f"🎲 Generated {self.workload} array: {array[:10]}{'...' if len(array) > 10 else ''}")
+        return array
+    
+    def _setup_plot_style(self, ax: 'plt.Axes', title: str) -> None:
+        """Configure plot appearance with green bars on black background."""
+        ax.set_title(title, color='white', fontsize=14, fontweight='bold')
+        ax.set_facecolor(BACKGROUND_COLOR)
+        ax.set_xticks([])
+        ax.set_yticks([])
+        ax.set_xlim(-1, self.n_bars)
+        # Headroom above the tallest bar keeps the status label clear of the bars
+        ax.set_ylim(0, (self.n_bars + 1) * 1.08)
+        
+        # Remove spines for cleaner look
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+    
+    def _create_bars(self, ax: 'plt.Axes') -> List['plt.Rectangle']:
+        """Create initial bar chart with green bars."""
+        bar_width = 0.8 if self.n_bars <= 50 else 0.95  # Adjust width based on bar count
+        
+        bars = ax.bar(
+            range(self.n_bars), 
+            self.initial_array, 
+            color=BAR_COLOR_NORMAL,
+            edgecolor='darkgreen',
+            linewidth=0.1 if self.n_bars > 100 else 0.2,
+            width=bar_width
+        )
+        return bars
+    
+    def _validate_array(self, array: List[int], choice: Optional[str] = None,
+                        sortedness: Optional[SortednessTracker] = None) -> bool:
+        """Check if array is correctly sorted (or correctly selected, for a selection algorithm).
+        
+        A sort's verdict is read from ``sortedness`` in O(1) when its tracker is given.
+        """
+        if sortedness is not None and choice not in SELECTION_ALGORITHMS:
+            return sortedness.is_sorted
+        return result_is_valid(choice, array)
+    
+    def _update_animation_frame(self, frame_number: int, algorithms_data: List[dict], 
+                              standard_frames: int) -> List:
+        """Update animation frame for both algorithms."""
+        updated_artists = []
+        
+        for algo_data in algorithms_data:
+            renderer = algo_data['renderer']
+            trace = algo_data['trace']
+            replayer = algo_data['replayer']
+            algorithm_name = algo_data['name']
+            algorithm_finish_frame = algo_data['algorithm_finish_frame']
+            
+            # Check if this algorithm should still be running
+            if frame_number <= algorithm_finish_frame:
+                # Calculate which frame to rebuild from the recorded trace
+                progress_ratio = frame_number / algorithm_finish_frame
+                original_frame_index = int(progress_ratio * (len(trace) - 1))
+                original_frame_index = min(original_frame_index, len(trace) - 1)
+                
+                current_array, active_idx1, active_idx2 = replayer.seek(original_frame_index)
+                
+                # Selected bars are black, others are green
+                renderer.update(current_array, BAR_COLOR_NORMAL, (active_idx1, active_idx2))
+                
+                # Show how sorted the array is so far
+                sortedness = replayer.sortedness
+                renderer.set_label(f'{algorithm_name} - {sortedness.percent_sorted:.1f}% sorted, '
+                                   f'{sortedness.runs:,} runs')
+            else:
+                final_array, _, _ = replayer.seek(len(trace) - 1)
+                self._show_validation(algo_data, final_array, frame_number)
+            
+            if not renderer.blit:
+                updated_artists.extend(renderer.artists)
+        
+        return updated_artists
+    
+    def _show_validation(self, algo_data: dict, final_array: List[int], frame_number: int) -> None:
+        """Draw the validation sweep, then the final verdict, for a finished algorithm."""
+        renderer = algo_data['renderer']
+        algorithm_name = algo_data['name']
+        validation_start_frame = algo_data['validation_start_frame']
+        validation_duration = 60  # Validation takes 60 frames (1 second)
+        winner_prefix = 'WINNER - ' if algo_data.get('is_first_completed', False) else ''
+        
+        # The result no longer changes, so it is judged once
+        is_correct = algo_data.get('is_correct')
+        if is_correct is None:
+            is_correct = algo_data['is_correct'] = self._validate_array(
+                final_array, algo_data.get('choice'), algo_data['sortedness'])
+        
+        if frame_number <= validation_start_frame + validation_duration:
+            # Algorithm is in validation phase
+            # Calculate validation progress
+            validation_progress = (frame_number - validation_start_frame) / validation_duration
+            validation_progress = max(0, min(1, validation_progress))
+            
+            # How many bars to validate so far
+            bars_to_validate = int(validation_progress * self.n_bars)
+            
+            # Validated bars turn blue (or red on error), the rest stay dark green
+            renderer.update(final_array, '#00AA00', prefix_count=bars_to_validate,
+                            prefix_color='#0080FF' if is_correct else '#FF0000')
+            
+            # Show validation progress
+            validation_percent = validation_progress * 100
+            renderer.set_label(f'{winner_prefix}{algorithm_name} - Validating: {validation_percent:.0f}%')
+        else:
+            # Validation completed
+            renderer.update(final_array, '#0080FF' if is_correct else '#FF0000')
+            
+            # Show final status
+            outcome = 'SELECTION' if algo_data.get('choice') in SELECTION_ALGORITHMS else 'SORT'
+            if is_correct:
+                renderer.set_label(f'{winner_prefix}{algorithm_name} - VALID {outcome}!')
+            else:
+                renderer.set_label(f'{algorithm_name} - ❌ {outcome} ERROR!')
+    
+    def _plan_animation(self, algo1_choice: str, algo2_choice: str, algo_names: dict,
+                        should_cancel: Optional[Callable[[], bool]] = None) -> Tuple[List[dict], int, int]:
+        """Record both traces, time the algorithms and schedule their frames.
+        
+        Returns one plan dict per algorithm, the total frame count and the
+        frame interval in milliseconds. ``should_cancel`` is polled while
+        recording, as in ``record_traces``.
+        """
+        
+        # Get algorithm functions
+        algo1_name = algo_names[algo1_choice]
+        algo2_name = algo_names[algo2_choice]
+        fast_funcs = {
+            algo1_name: get_algorithm_function(algo1_choice, fast=True),
+            algo2_name: get_algorithm_function(algo2_choice, fast=True),
+        }
+        
+        # Reuse traces (and timings) recorded by an earlier run on the same input
+        choices = list(dict.fromkeys([algo1_choice, algo2_choice]))
+        cached = {}
+        if self.trace_cache is not None:
+            for choice in choices:
+                entry = self.trace_cache.load(choice, self.initial_array, self.keyframe_interval)
+                if entry is not None:
+                    cached[choice] = entry
+                    print(f"♻️ Loaded cached trace for {algo_names[choice]}")
+        traces = {choice: trace for choice, (trace, _) in cached.items()}
+        missing = [choice for choice in choices if choice not in cached]
+        
+        if missing:
+            print(f"🔄 Recording operation traces for {' and '.join(algo_names[c] for c in missing)}"
+                  f"{' in parallel' if len(missing) > 1 else ''}...")
+            
+            # Record operation traces for both algorithms concurrently
+            recording_start = time.perf_counter()
+            traces.update(record_traces(missing, self.initial_array, self.keyframe_interval,
+                                        should_cancel=should_cancel))
+            print(f"  📊 Recorded in {time.perf_counter() - recording_start:.1f}s")
+        algorithm_frames_data = {}
+        
+        for choice, name in [(algo1_choice, algo1_name), (algo2_choice, algo2_name)]:
+            trace = traces[choice]
+            algorithm_frames_data[name] = trace
+            print(f"     {name}: recorded {trace.operation_count} operations ({len(trace)} frames, "
+                  f"{trace.keyframe_count} keyframes, {trace.nbytes / 1024:.0f} KiB)")
+            print(f"     Counted {trace.counts.summary()}")
+        
+        # Calculate execution times for smart animation timing
+        execution_times = {}
+        fastest_time = float('inf')
+        fastest_algorithm = None
+        
+        print(f"⏱️ Measuring real execution times ({TIMING_WARMUP} warmup + {TIMING_REPEATS} timed runs)...")
+        for choice, name in [(algo1_choice, algo1_name), (algo2_choice, algo2_name)]:
+            if name in execution_times:
+                continue
+            median_ns = cached[choice][1] if choice in cached else None
+            if median_ns is not None:
+                print(f"   {name}: median {format_duration(median_ns)} (cached)")
+            else:
+                timing = time_algorithm(fast_funcs[name], self.initial_array)
+                median_ns = timing.median_ns
+                print(f"   {name}: median {format_duration(timing.median_ns)}, "
+                      f"p95 {format_duration(timing.p95_ns)}, stdev {format_duration(timing.stdev_ns)}")
+                if self.trace_cache is not None:
+                    self.trace_cache.store(choice, self.initial_array, self.keyframe_interval,
+                                           traces[choice], median_ns)
+            # Guard against a zero median on coarse clocks
+            exec_time = max(median_ns / 1e9, 1e-9)
+            execution_times[name] = exec_time
+            
+            if exec_time < fastest_time:
+                fastest_time = exec_time
+                fastest_algorithm = name
+        
+        print(f"🏆 Fastest: {fastest_algorithm} ({format_duration(fastest_time * 1e9)} median)")
+        
+        # Smart timing system - prevent long waits
+        MIN_ANIMATION_TIME = 3.0    # Minimum animation time (seconds)
+        MAX_ANIMATION_TIME = 12.0   # Maximum animation time (seconds) 
+        FAST_ALGO_FRAMES = 600      # Base frames for fastest algorithm
+        
+        # Smart timing calculation - prevent long waits
+        algorithms_data = []
+        first_to_complete = fastest_algorithm
+        
+        # Calculate time ratios with smart limits
+        time_ratios = {}
         for name in algorithm_frames_data.keys():
             ratio = execution_times[name] / fastest_time
             time_ratios[name] = ratio
@@ -687,24 +5285,7 @@ class SortingVisualizer:
         fastest_finish_time = MIN_ANIMATION_TIME  # Fastest algorithm gets minimum time
         slowest_finish_time = MAX_ANIMATION_TIME  # Slowest algorithm gets maximum time
         
-        for i, (name, frames) in enumerate(algorithm_frames_data.items()):
-            ax = axes[i]
-            
-            # Setup plot style
-            self._setup_plot_style(ax, name)
-            
-            # Create bars
-            bars = self._create_bars(ax)
-            
-            # Create text label
-            text_label = ax.text(
-                0.02, 0.95, f'{name} - Starting...', 
-                transform=ax.transAxes, 
-                color='white', 
-                fontsize=11,
-                fontweight='bold'
-            )
-            
+        for name, trace in algorithm_frames_data.items():
             # Smart frame calculation with time limits
             if name == fastest_algorithm:
                 animation_time = fastest_finish_time
@@ -726,10 +5307,9 @@ class SortingVisualizer:
             print(f"   {name}: {animation_time:.1f}s → {algorithm_finish_frame} frames")
             
             algorithms_data.append({
-                'bars': bars,
-                'original_frames': frames,
-                'text_label': text_label,
+                'trace': trace,
                 'name': name,
+                'choice': algo1_choice if name == algo1_name else algo2_choice,
                 'algorithm_finish_frame': algorithm_finish_frame,
                 'validation_start_frame': validation_start_frame,
                 'is_first_completed': is_first_completed
@@ -754,31 +5334,639 @@ class SortingVisualizer:
         print(f"💙 Valid sorts turn blue, ❤️ invalid sorts turn red")
         print(f"maximum animation time: {MAX_ANIMATION_TIME} seconds per algorithm!")
         
+        return algorithms_data, total_frames, interval
+    
+    def _create_figure(self, plt, plans: List[dict], dpi: Optional[int] = None) -> Tuple['plt.Figure', list]:
+        """Create the side-by-side figure with one styled axes per planned algorithm."""
+        fig, axes = plt.subplots(1, len(plans), figsize=FIGURE_SIZE, dpi=dpi, squeeze=False)
+        axes = axes[0]
+        fig.patch.set_facecolor(BACKGROUND_COLOR)
+        for ax, plan in zip(axes, plans):
+            self._setup_plot_style(ax, plan['name'])
+        plt.tight_layout()
+        return fig, axes
+    
+    def _create_renderers(self, axes, plans: List[dict], use_blit: bool) -> List[dict]:
+        """Attach a label, renderer and (for recorded plans) trace replayer to each planned algorithm."""
+        algorithms_data = []
+        for ax, plan in zip(axes, plans):
+            name = plan['name']
+            
+            # Create text label
+            text_label = ax.text(
+                0.02, 0.95, f'{name} - Starting...', 
+                transform=ax.transAxes, 
+                color='white', 
+                fontsize=11,
+                fontweight='bold'
+            )
+            
+            # Create bars, or a single image for large arrays
+            if self.use_raster:
+                renderer = RasterRenderer(ax, self.n_bars, ax.get_ylim()[1], text_label, use_blit)
+                renderer.update(self.initial_array, BAR_COLOR_NORMAL)
+            else:
+                renderer = BarRenderer(ax, self._create_bars(ax), text_label, use_blit)
+            
+            algo_data = dict(plan, renderer=renderer)
+            if 'trace' in plan:
+                algo_data['replayer'] = plan['trace'].replayer(track_sortedness=True)
+                algo_data['sortedness'] = algo_data['replayer'].sortedness
+            else:
+                algo_data['sortedness'] = plan['stream'].sortedness
+            algorithms_data.append(algo_data)
+        return algorithms_data
+    
+    def visualize_algorithms(self, algo1_choice: str, algo2_choice: str, algo_names: dict):
+        """Main visualization method for two algorithms.
+        
+        The window opens before recording starts, and closing it cancels the
+        recording with ``RecordingCancelled``.
+        """
+        # Setup figure
+        plt, animation = _load_pyplot()
+        titles = [{'name': name} for name in dict.fromkeys(algo_names[c] for c in (algo1_choice, algo2_choice))]
+        fig, axes = self._create_figure(plt, titles)
+        is_interactive = plt.get_backend().lower() != 'agg'
+        use_blit = is_interactive and fig.canvas.supports_blit
+        
+        closed = False
+        
+        def on_close(event) -> None:
+            nonlocal closed
+            closed = True
+        
+        def should_cancel() -> bool:
+            if is_interactive:
+                fig.canvas.flush_events()  # Deliver a close click while recording blocks the event loop
+            return closed
+        
+        fig.canvas.mpl_connect('close_event', on_close)
+        if is_interactive:
+            plt.show(block=False)
+        try:
+            plans, total_frames, interval = self._plan_animation(algo1_choice, algo2_choice, algo_names,
+                                                                 should_cancel)
+        except RecordingCancelled:
+            plt.close(fig)
+            raise
+        if closed:
+            raise RecordingCancelled('window closed')
+        algorithms_data = self._create_renderers(axes, plans, use_blit)
+        
         # Create and start animation
-        animation_obj = animation.FuncAnimation(
-            fig,
-            lambda frame: self._update_animation_frame(frame, algorithms_data, FAST_ALGO_FRAMES),
-            frames=range(total_frames),
-            blit=False,
-            interval=interval,
-            repeat=False,
-            cache_frame_data=False
-        )
+        update_frame = lambda frame: self._update_animation_frame(frame, algorithms_data, total_frames)
+        if use_blit:
+            # Renderers repaint only changed bars themselves
+            animation_obj = BlitAnimation(fig, update_frame, range(total_frames), interval)
+        else:
+            animation_obj = animation.FuncAnimation(
+                fig,
+                update_frame,
+                frames=range(total_frames),
+                blit=False,
+                interval=interval,
+                repeat=False,
+                cache_frame_data=False
+            )
         
-        plt.tight_layout()
-        plt.show()
+        if not is_interactive:
+            print("🖥️ No display available - animation prepared but not shown")
+        else:
+            plt.show()
+        
+        return animation_obj
+    
+    def _update_stream_frame(self, frame_number: int, algorithms_data: List[dict], pacing: dict) -> List:
+        """Advance every stream by the operations due since the last tick and redraw."""
+        now = time.perf_counter()
+        if pacing['last_tick'] is not None:
+            pacing['budget'] += (now - pacing['last_tick']) * pacing['ops_per_second']
+        pacing['last_tick'] = now
+        operations_due = int(pacing['budget'])
+        pacing['budget'] -= operations_due
+        updated_artists = []
+        
+        for algo_data in algorithms_data:
+            renderer = algo_data['renderer']
+            stream = algo_data['stream']
+            name = algo_data['name']
+            
+            if algo_data['algorithm_finish_frame'] is None:
+                current_array, active_idx1, active_idx2 = stream.advance(operations_due)
+                if stream.finished:
+                    # First stream to run dry used the fewest operations
+                    algo_data['algorithm_finish_frame'] = frame_number
+                    algo_data['validation_start_frame'] = frame_number + 30  # Half second delay
+                    algo_data['is_first_completed'] = len(algorithms_data) > 1 and not any(
+                        other.get('is_first_completed') for other in algorithms_data)
+                    print(f"   {name}: finished after {stream.operation_count:,} operations "
+                          f"({stream.counts.summary()})")
+                else:
+                    renderer.update(current_array, BAR_COLOR_NORMAL, (active_idx1, active_idx2))
+                    renderer.set_label(f'{name} - {stream.operation_count:,} operations, '
+                                       f'{stream.sortedness.percent_sorted:.1f}% sorted')
+            
+            if algo_data['algorithm_finish_frame'] is not None:
+                self._show_validation(algo_data, stream.array, frame_number)
+            
+            if not renderer.blit:
+                updated_artists.extend(renderer.artists)
+        
+        return updated_artists
+    
+    def _stream_frames(self, algorithms_data: List[dict]) -> Iterator[int]:
+        """Frame numbers until every stream has finished and shown its verdict."""
+        frame_number = 0
+        while not all(algo_data['algorithm_finish_frame'] is not None
+                      and frame_number > algo_data['validation_start_frame'] + 60 + 60
+                      for algo_data in algorithms_data):
+            yield frame_number
+            frame_number += 1
+    
+    def stream_algorithms(self, algo1_choice: str, algo2_choice: str, algo_names: dict,
+                          ops_per_second: Optional[float] = None):
+        """Race two algorithms live, replaying their operations as they are produced.
+        
+        Nothing is recorded up front: each sort runs on a background thread
+        feeding a bounded queue, and playback is paced in real time at
+        ``ops_per_second`` for both, so the total frame count is not known in
+        advance and the algorithm needing fewer operations finishes first.
+        """
+        ops_per_second = ops_per_second or STREAM_OPS_PER_BAR * self.n_bars
+        plans = []
+        for choice in (algo1_choice, algo2_choice):
+            plans.append({
+                'name': algo_names[choice],
+                'choice': choice,
+                'stream': OperationStream(get_algorithm_function(choice), self.initial_array),
+                'algorithm_finish_frame': None,
+                'validation_start_frame': None,
+                'is_first_completed': False,
+            })
+        
+        print(f"🌊 Streaming {plans[0]['name']} and {plans[1]['name']} at {ops_per_second:,.0f} operations/s")
+        return self._play_streams(plans, ops_per_second)
+    
+    def stream_external_sort(self, view: ExternalSortView, input_path: str, output_path: str,
+                             memory_budget: int = EXTERNAL_MEMORY_BUDGET, fmt: Optional[str] = None,
+                             temp_dir: Optional[str] = None, ops_per_second: Optional[float] = None):
+        """Run ``external_sort`` on a file while animating ``view`` of its runs and merge passes.
+        
+        The visualizer must have been created with ``view.initial_array``.
+        By default each full pass over the view takes ``EXTERNAL_SECONDS_PER_PASS``.
+        Raises ``RuntimeError`` if the window is closed before the sort ends.
+        """
+        ops_per_second = ops_per_second or self.n_bars / EXTERNAL_SECONDS_PER_PASS
+        plans = [{
+            'name': f'External Merge Sort ({view.total:,} values)',
+            'stream': OperationStream(
+                external_sort_generator(view, input_path, output_path, memory_budget, fmt, temp_dir),
+                self.initial_array, chunk_size=max(1, self.n_bars // 16)),
+            'algorithm_finish_frame': None,
+            'validation_start_frame': None,
+            'is_first_completed': False,
+        }]
+        
+        print(f"🌊 Streaming external sort of {input_path} at {ops_per_second:,.0f} operations/s")
+        animation_obj = self._play_streams(plans, ops_per_second)
+        if not plans[0]['stream'].finished:
+            raise RuntimeError(f"window closed before the sort finished; {output_path} is incomplete")
+        return animation_obj
+    
+    def _play_streams(self, plans: List[dict], ops_per_second: float):
+        """Animate planned operation streams side by side until each has shown its verdict."""
+        # Setup figure
+        plt, animation = _load_pyplot()
+        fig, axes = self._create_figure(plt, plans)
+        is_interactive = plt.get_backend().lower() != 'agg'
+        use_blit = is_interactive and fig.canvas.supports_blit
+        algorithms_data = self._create_renderers(axes, plans, use_blit)
+        fig.canvas.mpl_connect('close_event', lambda event: [plan['stream'].close() for plan in plans])
         
+        pacing = {'ops_per_second': ops_per_second, 'budget': 0.0, 'last_tick': None}
+        update_frame = lambda frame: self._update_stream_frame(frame, algorithms_data, pacing)
+        interval = max(8, int(1000 / 60))
+        if use_blit:
+            animation_obj = BlitAnimation(fig, update_frame, self._stream_frames(algorithms_data), interval)
+        else:
+            animation_obj = animation.FuncAnimation(
+                fig,
+                update_frame,
+                frames=self._stream_frames(algorithms_data),
+                blit=False,
+                interval=interval,
+                repeat=False,
+                cache_frame_data=False
+            )
+        
+        if not is_interactive:
+            print("🖥️ No display available - animation prepared but not shown")
+        else:
+            plt.show()
+        
+        for plan in plans:
+            plan['stream'].close()
         return animation_obj
 
-if __name__ == "__main__":
+# --- Offline Export ---
+
+EXPORT_FORMATS = ('mp4', 'gif', 'png')
+
+
+def _render_export_frames(visualizer: 'SortingVisualizer', plans: List[dict], frames: List[Tuple[int, int]],
+                          directory: str, dpi: int, palettize: bool = False) -> int:
+    """Worker: rasterize ``(output_index, animation_frame)`` pairs to PNG files.
+    
+    Each worker builds its own Agg figure and replays the traces forward from
+    the start of its chunk, so only the plans cross the process boundary.
+    ``palettize`` quantizes frames here, in parallel, so the GIF encoder
+    does not have to.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from PIL import Image
+    
+    fig, axes = visualizer._create_figure(plt, plans, dpi)
+    # Blitting works on the Agg buffer too: each frame repaints only what changed
+    algorithms_data = visualizer._create_renderers(axes, plans, use_blit=True)
+    fig.canvas.draw()
+    width, height = fig.canvas.get_width_height()
+    
+    for output_index, frame in frames:
+        visualizer._update_animation_frame(frame, algorithms_data, len(frames))
+        image = Image.frombuffer('RGBA', (width, height), fig.canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1)
+        image = image.convert('RGB')
+        if palettize:
+            image = image.quantize(colors=64, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+        image.save(os.path.join(directory, f'frame_{output_index:06d}.png'), compress_level=1)
+    
+    plt.close(fig)
+    return len(frames)
+
+
+def _encode_export(frame_directory: str, frame_count: int, output: str, fmt: str, fps: int) -> None:
+    """Stitch numbered PNG frames into ``output`` in order."""
+    frame_paths = [os.path.join(frame_directory, f'frame_{index:06d}.png') for index in range(frame_count)]
+    
+    if fmt == 'gif':
+        from PIL import Image
+        
+        frames = (Image.open(path) for path in frame_paths)
+        first = next(frames)
+        first.save(output, save_all=True, append_images=frames, duration=round(1000 / fps), loop=0,
+                   optimize=False)
+    elif fmt == 'mp4':
+        import subprocess
+        
+        subprocess.run([
+            'ffmpeg', '-y', '-loglevel', 'error',
+            '-framerate', str(fps), '-i', os.path.join(frame_directory, 'frame_%06d.png'),
+            '-c:v', 'libx264', '-pix_fmt', 'yuv420p',
+            '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',  # yuv420p needs even dimensions
+            output,
+        ], check=True)
+
+
+def export_animation(visualizer: 'SortingVisualizer', algo1_choice: str, algo2_choice: str, algo_names: dict,
+                     output: str, fmt: str, fps: int = 30, dpi: int = 100, jobs: Optional[int] = None) -> int:
+    """Render the comparison animation to an MP4, a GIF or a directory of PNG frames.
+    
+    Frames are split into contiguous chunks rendered by a process pool, so
+    export time scales with core count rather than playback duration.
+    Returns the number of frames written.
+    """
+    import shutil
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(EXPORT_FORMATS)}")
+    if fmt == 'mp4' and shutil.which('ffmpeg') is None:
+        raise RuntimeError("MP4 export needs ffmpeg on PATH; use gif or png instead")
+    # Fail before rendering, not after every frame has been drawn
+    if fmt == 'png':
+        try:
+            os.makedirs(output, exist_ok=True)
+        except OSError as exc:
+            raise RuntimeError(f"Cannot create output directory {output}: {exc.strerror}") from None
+    elif not os.path.isdir(os.path.dirname(os.path.abspath(output))):
+        raise RuntimeError(f"Output directory {os.path.dirname(os.path.abspath(output))} does not exist")
+    
+    plans, total_frames, _ = visualizer._plan_animation(algo1_choice, algo2_choice, algo_names)
+    
+    # The schedule runs at 60 FPS; sample it down to the requested rate
+    frame_count = max(1, total_frames * fps // 60)
+    frames = [(index, min(total_frames - 1, index * 60 // fps)) for index in range(frame_count)]
+    
+    jobs = max(1, min(jobs or os.cpu_count() or 1, frame_count))
+    chunk_size = -(-frame_count // (jobs * 4))  # A few chunks per worker keeps them all busy
+    chunks = [frames[start:start + chunk_size] for start in range(0, frame_count, chunk_size)]
+    
+    if fmt == 'png':
+        frame_directory = output
+    else:
+        frame_directory = tempfile.mkdtemp(prefix='sorting-export-')
+    
+    print(f"🎞️ Rendering {frame_count} frames at {fps} FPS with {jobs} worker(s)...")
+    try:
+        if jobs == 1:
+            for chunk in chunks:
+                _render_export_frames(visualizer, plans, chunk, frame_directory, dpi, fmt == 'gif')
+        else:
+            done = 0
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(_render_export_frames, visualizer, plans, chunk, frame_directory, dpi,
+                                       fmt == 'gif')
+                           for chunk in chunks]
+                try:
+                    for future in as_completed(futures):
+                        done += future.result()
+                        print(f"   {done}/{frame_count} frames", end='\r')
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+            print()
+        
+        if fmt != 'png':
+            print(f"📼 Encoding {fmt.upper()}...")
+            _encode_export(frame_directory, frame_count, output, fmt, fps)
+    finally:
+        if fmt != 'png':
+            shutil.rmtree(frame_directory, ignore_errors=True)
+    
+    return frame_count
+
+
+def _parse_size(text: str) -> int:
+    """Parse a size such as ``1000`` or ``1e5``."""
+    value = float(text)
+    if value < 1 or value != int(value):
+        raise ValueError(f"invalid size: {text!r}")
+    return int(value)
+
+
+def _parse_bytes(text: str) -> int:
+    """Parse a byte count such as ``1048576``, ``512M`` or ``2G``."""
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+    number = text.strip().upper().rstrip('B')
+    unit = units.get(number[-1:], 1)
+    value = float(number[:-1] if unit > 1 else number) * unit
+    if value < 1:
+        raise ValueError(f"invalid byte count: {text!r}")
+    return int(value)
+
+
+def run_interactive(stream: bool = False, ops_per_second: Optional[float] = None,
+                    trace_cache: Optional[TraceCache] = None, seed: Optional[int] = None) -> None:
+    """Prompt for a bar count and two algorithms, then open the visualizer.
+    
+    With ``stream`` the algorithms are replayed live instead of recorded first.
+    Recorded traces are reused from, and saved to, ``trace_cache`` if given
+    and the input is reproducible: a fixed ``seed`` regenerates the same
+    input, as does a workload in ``SEEDLESS_WORKLOADS``.
+    """
     # Get user input
     n_bars = get_user_input()
     algo1, algo2, algo_names = get_algorithm_selection()
+    workload = get_workload_selection()
     
-    print(f"🔧 Setting up visualization for {n_bars} bars...")
+    print(f"🔧 Setting up visualization for {n_bars} bars ({workload} input)...")
     print(f"📈 Algorithm 1: {algo_names[algo1]}")
     print(f"📈 Algorithm 2: {algo_names[algo2]}")
     
     # Create and run visualizer
-    visualizer = SortingVisualizer(n_bars)
-    visualizer.visualize_algorithms(algo1, algo2, algo_names)
+    visualizer = SortingVisualizer(n_bars, workload=workload, seed=seed, trace_cache=trace_cache)
+    picks = [resolve_auto_choice(choice, visualizer.initial_array) for choice in (algo1, algo2)]
+    algo_names = auto_panel_names([algo1, algo2], picks, algo_names)
+    if picks[0] == picks[1] and algo1 != algo2:
+        print(f"🤖 Auto picked {ALGORITHM_NAMES[picks[0]]} for both panels; showing it once")
+    algo1, algo2 = picks
+    try:
+        if stream:
+            visualizer.stream_algorithms(algo1, algo2, algo_names, ops_per_second)
+        else:
+            visualizer.visualize_algorithms(algo1, algo2, algo_names)
+    except RecordingCancelled:
+        print("👋 Recording cancelled. Goodbye!")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point; without a subcommand the interactive visualizer starts."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Sorting algorithm visualizer and benchmark")
+    parser.add_argument('--stream', action='store_true',
+                        help="Start playback immediately and replay operations as the sorts produce them")
+    parser.add_argument('--rate', type=float, default=None,
+                        help=f"Streaming speed in operations per second (default: {STREAM_OPS_PER_BAR} per bar)")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Seed for the input array, so a comparison can be replayed from the cache")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Record traces afresh instead of reusing ones saved by earlier runs")
+    parser.add_argument('--cache-dir', default=None,
+                        help="Trace cache directory (default: $SORTING_VISUALIZER_CACHE or "
+                             "~/.cache/sorting-visualizer/traces)")
+    parser.add_argument('--cache-size', type=_parse_bytes, default=TRACE_CACHE_MAX_BYTES,
+                        help="Disk space for cached traces, e.g. 500M (default: 1G)")
+    parser.add_argument('--clear-cache', action='store_true', help="Delete all cached traces and exit")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    bench = subparsers.add_parser('benchmark', help="Time algorithms over a size sweep without a GUI")
+    bench.add_argument('-a', '--algorithms', nargs='+', default=None,
+                       help="Menu numbers or names (e.g. 4 merge heap; default: 4 5 6 11, "
+                            "or 11 with --workers)")
+    bench.add_argument('-n', '--sizes', nargs='+', type=_parse_size, default=[100, 1000, 10000],
+                       help="Input sizes, e.g. 1e2 1e3 1e4")
+    bench.add_argument('-r', '--repeats', type=int, default=TIMING_REPEATS)
+    bench.add_argument('-w', '--warmup', type=int, default=TIMING_WARMUP)
+    bench.add_argument('-s', '--seed', type=int, default=None)
+    bench.add_argument('--max-seconds', type=float, default=10.0,
+                       help="Skip larger sizes once a median run exceeds this")
+    bench.add_argument('--counts', action='store_true',
+                       help="Also report comparisons, swaps, writes, aux memory and depth")
+    bench.add_argument('-d', '--distribution', choices=list(WORKLOAD_NAMES), default=None,
+                       help="Input distribution (default: random, or all but quick-killer with --auto)")
+    bench.add_argument('--generators', action='store_true',
+                       help="Time the instrumented generators and report the cost per yielded operation")
+    bench.add_argument('--depth', action='store_true',
+                       help="Fit the generators' cost per yield against recursion depth "
+                            "(default: Quick Sort on sorted input)")
+    bench.add_argument('--workers', nargs='+', type=int, default=None,
+                       help="Time the parallel merge and sample sorts with these worker counts, "
+                            "using the first algorithm on each chunk")
+    bench.add_argument('--numpy', action='store_true',
+                       help="Time the NumPy radix, counting and bucket sorts against sorted()")
+    bench.add_argument('--auto', action='store_true',
+                       help="Time the auto selector against the first algorithm (default: Intro Sort) "
+                            "and report its overhead")
+    bench.add_argument('--records', action='store_true',
+                       help="Sort dict records by a composite key and count key-function calls")
+    bench.add_argument('--radix', nargs='+', type=int, default=[NUMPY_RADIX, 1 << 16],
+                       help="Digit sizes for the NumPy radix sort (default: 256 65536)")
+    bench.add_argument('--memory', action='store_true',
+                       help="Measure peak and auxiliary memory with tracemalloc instead of time")
+    bench.add_argument('--baseline', default=None,
+                       help="Earlier --memory results file (CSV or JSON); flag peaks that grew "
+                            f"more than {MEMORY_REGRESSION_TOLERANCE:.0%}")
+    bench.add_argument('-o', '--output', default=None, help="Result file (CSV or JSON)")
+    bench.add_argument('-f', '--format', choices=['csv', 'json'], default=None,
+                       help="Output format (default: from --output extension, else csv)")
+    
+    export = subparsers.add_parser('export', help="Render the comparison animation to MP4, GIF or PNG frames")
+    export.add_argument('algorithms', nargs=2, help="Two menu numbers, names or auto (e.g. merge quick)")
+    export.add_argument('-o', '--output', required=True,
+                        help="Output file (.mp4 or .gif) or a directory for PNG frames")
+    export.add_argument('-f', '--format', choices=list(EXPORT_FORMATS), default=None,
+                        help="Output format (default: from --output extension, else png)")
+    export.add_argument('-n', '--bars', type=_parse_size, default=100)
+    export.add_argument('--fps', type=int, default=30)
+    export.add_argument('--dpi', type=int, default=100)
+    export.add_argument('-j', '--jobs', type=int, default=None, help="Worker processes (default: all cores)")
+    export.add_argument('-d', '--distribution', choices=list(WORKLOAD_NAMES), default='random',
+                        help="Input distribution (default: random)")
+    export.add_argument('-s', '--seed', type=int, default=None)
+    
+    external = subparsers.add_parser('external', help="Sort an integer file that may not fit in memory")
+    external.add_argument('input', help="Binary int64 file (.bin) or one integer per line")
+    external.add_argument('-o', '--output', required=True, help="Sorted output file, same format as the input")
+    external.add_argument('-m', '--memory', type=_parse_bytes, default=EXTERNAL_MEMORY_BUDGET,
+                          help="Memory budget, e.g. 64M or 2G (default: 256M)")
+    external.add_argument('-f', '--format', choices=list(EXTERNAL_FORMATS), default=None,
+                          help="Input format (default: binary for .bin, else text)")
+    external.add_argument('--temp-dir', default=None, help="Directory for run files (default: system temp)")
+    external.add_argument('--show', action='store_true',
+                          help="Animate a downsampled view of the runs and merge passes")
+    external.add_argument('-n', '--bars', type=_parse_size, default=500, help="Bars in the --show view")
+    
+    args = parser.parse_args(argv)
+    trace_cache = None if args.no_cache else TraceCache(args.cache_dir, args.cache_size)
+    
+    if args.clear_cache:
+        removed = TraceCache(args.cache_dir).clear()
+        print(f"🧹 Removed {removed} cached trace(s)")
+        return
+    
+    if args.command == 'benchmark':
+        tokens = args.algorithms or (['11'] if args.workers else ['4', '5', '6', '11'])
+        try:
+            choices = [resolve_algorithm_choice(token) for token in tokens]
+        except ValueError as exc:
+            parser.error(str(exc))
+        if args.records and (args.workers or args.numpy or args.memory or args.counts or args.generators
+                             or args.depth or args.auto):
+            parser.error("--records cannot be combined with --workers, --numpy, --memory, --counts, "
+                         "--generators, --depth or --auto")
+        distribution = args.distribution or 'random'
+        
+        if args.depth:
+            if args.algorithms is None:
+                choices = ['4']
+            depth_distribution = args.distribution or 'sorted'
+            print(f"⏱️ Timing {', '.join(ALGORITHM_NAMES[c] for c in choices)} generators on {depth_distribution} "
+                  f"input over n = {', '.join(str(n) for n in args.sizes)}")
+            results = run_depth_benchmark(choices, sorted(args.sizes), args.repeats, args.warmup, args.seed,
+                                          depth_distribution)
+            print_depth_summary(results)
+        elif args.auto:
+            fixed_choice = choices[0] if args.algorithms else AUTO_FIXED_CHOICE
+            if fixed_choice in SELECTION_ALGORITHMS:
+                parser.error("--auto needs a sorting algorithm to compare against, not a selection one")
+            distributions = [args.distribution] if args.distribution else list(SWEEP_WORKLOADS)
+            print(f"⏱️ Benchmarking the auto selector against {ALGORITHM_NAMES[fixed_choice]} "
+                  f"over n = {', '.join(str(n) for n in args.sizes)}")
+            results = run_selector_benchmark(sorted(args.sizes), fixed_choice, args.repeats, args.warmup,
+                                             args.seed, distributions)
+            print_selector_summary(results)
+        elif args.workers:
+            if min(args.workers) < 1:
+                parser.error("--workers counts must be at least 1")
+            print(f"⏱️ Benchmarking parallel sorts ({ALGORITHM_NAMES[choices[0]]} per chunk) "
+                  f"over n = {', '.join(str(n) for n in args.sizes)}, "
+                  f"workers = {', '.join(str(w) for w in args.workers)}")
+            results = run_parallel_benchmark(choices[0], sorted(args.sizes), args.workers, args.repeats,
+                                             args.warmup, args.seed, distribution)
+            print_speedup_summary(results)
+        elif args.numpy:
+            if any(radix < 2 or radix & (radix - 1) or radix > 1 << 16 for radix in args.radix):
+                parser.error("--radix values must be powers of two between 2 and 65536")
+            print(f"⏱️ Benchmarking NumPy sorts against sorted() over n = {', '.join(str(n) for n in args.sizes)}")
+            results = run_numpy_benchmark(sorted(args.sizes), args.radix, args.repeats, args.warmup,
+                                          args.seed, distribution)
+            print_growth_summary(results)
+        elif args.memory:
+            baseline = None
+            if args.baseline:
+                try:
+                    baseline = read_benchmark_results(args.baseline)
+                except (OSError, ValueError, KeyError) as exc:
+                    parser.error(f"cannot read baseline {args.baseline}: {exc}")
+            print(f"🧠 Measuring memory of {', '.join(ALGORITHM_NAMES[c] for c in choices)} "
+                  f"over n = {', '.join(str(n) for n in args.sizes)}")
+            results = run_memory_benchmark(choices, sorted(args.sizes), args.seed, args.max_seconds,
+                                           distribution, args.generators, baseline)
+            print_memory_summary(results)
+        else:
+            if args.records and any(choice in SELECTION_ALGORITHMS + BOUNDED_ALGORITHMS for choice in choices):
+                parser.error("--records needs full sorting algorithms, not selection ones or Bogo Sort")
+            print(f"⏱️ Benchmarking {', '.join(ALGORITHM_NAMES[c] for c in choices)} "
+                  f"over n = {', '.join(str(n) for n in args.sizes)}")
+            results = run_benchmark(choices, sorted(args.sizes), args.repeats, args.warmup,
+                                    args.seed, args.max_seconds, args.counts, distribution,
+                                    args.generators, args.records)
+            print_growth_summary(results)
+        
+        if args.output:
+            fmt = args.format or ('json' if args.output.endswith('.json') else 'csv')
+            write_benchmark_results(results, args.output, fmt)
+            print(f"💾 Results written to {args.output}")
+        if results.get('regressions'):
+            parser.exit(1)
+    elif args.command == 'export':
+        try:
+            choices = [AUTO_CHOICE if token.strip().lower() == AUTO_CHOICE else resolve_algorithm_choice(token)
+                       for token in args.algorithms]
+        except ValueError as exc:
+            parser.error(str(exc))
+        
+        extension = os.path.splitext(args.output)[1].lower().lstrip('.')
+        fmt = args.format or (extension if extension in ('mp4', 'gif') else 'png')
+        
+        if args.seed is not None:
+            random.seed(args.seed)
+        visualizer = SortingVisualizer(args.bars, workload=args.distribution, seed=args.seed,
+                                       trace_cache=trace_cache)
+        picks = [resolve_auto_choice(choice, visualizer.initial_array) for choice in choices]
+        try:
+            frame_count = export_animation(visualizer, picks[0], picks[1],
+                                           auto_panel_names(choices, picks, ALGORITHM_NAMES),
+                                           args.output, fmt, args.fps, args.dpi, args.jobs)
+        except RuntimeError as exc:
+            parser.error(str(exc))
+        print(f"💾 Wrote {frame_count} frames to {args.output}")
+    elif args.command == 'external':
+        show = args.show and _has_display()
+        if args.show and not show:
+            print("🖥️ No display available - sorting without the view")
+        start = time.perf_counter()
+        try:
+            if show:
+                view = ExternalSortView(args.input, args.bars, args.format)
+                if view.size < 2:
+                    parser.error(f"{args.input} has too few values to show")
+                visualizer = SortingVisualizer(view.size, initial_array=view.initial_array)
+                visualizer.stream_external_sort(view, args.input, args.output, args.memory, args.format,
+                                                args.temp_dir, args.rate)
+            else:
+                external_sort(args.input, args.output, args.memory, args.format, args.temp_dir)
+        except (OSError, ValueError, RuntimeError) as exc:
+            parser.error(str(exc))
+        print(f"💾 Sorted {args.input} into {args.output} in {time.perf_counter() - start:.2f}s")
+    else:
+        run_interactive(args.stream, args.rate, trace_cache, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The visualizer is a single module at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('MPLBACKEND', 'Agg')
@@ -0,0 +1,147 @@
+import random
+from array import array
+
+import numpy as np
+import pytest
+
+import SortingVisualizer as sv
+
+
+class CountingList(list):
+    """List that counts element reads, to check the selector only samples."""
+    
+    reads = 0
+    
+    def __getitem__(self, index):
+        self.reads += 1
+        return super().__getitem__(index)
+
+
+@pytest.mark.parametrize('kind', ['sorted', 'reversed', 'organ-pipe'])
+def test_few_runs_pick_timsort(kind):
+    assert sv.select_algorithm(sv.generate_workload(kind, 10000))[0] == '12'
+
+
+def test_duplicates_pick_pdqsort():
+    assert sv.select_algorithm(sv.generate_workload('few-unique', 10000, random.Random(23)))[0] == '14'
+
+
+def test_dense_integers_pick_bucket_sort():
+    assert sv.select_algorithm(sv.generate_workload('random', 10000, random.Random(24)))[0] == '9'
+
+
+def test_unstructured_input_picks_introsort():
+    sparse = random.Random(25).sample(range(10 ** 9), 10000)
+    assert sv.select_algorithm(sparse) == ('13', "no exploitable structure")
+    assert sv.select_algorithm([value / 7 for value in sparse])[0] == '13'
+
+
+def test_small_and_nearly_sorted_inputs_pick_insertion_sort():
+    assert sv.select_algorithm([3, 2, 1])[0] == '3'
+    assert sv.select_algorithm(list(range(sv.AUTO_NEARLY_SORTED_MAX)))[0] == '3'
+
+
+def test_features_of_simple_inputs():
+    ascending = sv.sample_input_features(list(range(1000)))
+    assert (ascending.runs, ascending.descent_fraction, ascending.inversion_fraction) == (1, 0, 0)
+    # The range comes from the sampled values only
+    assert 0 <= ascending.low < ascending.high <= 999 and ascending.duplicate_ratio == 0
+    
+    descending = sv.sample_input_features(list(range(1000, 0, -1)))
+    assert descending.descent_fraction == 1 and descending.inversion_fraction == 1
+    assert sv.sample_input_features([1.5, 2.5, 0.5, 4.0]).low is None
+
+
+def test_selection_is_deterministic_and_samples_a_bounded_number_of_elements():
+    values = CountingList(sv.generate_workload('random', 100000, random.Random(26)))
+    first = sv.select_algorithm(values)
+    assert values.reads <= 5 * sv.AUTO_SAMPLE_SIZE
+    assert sv.select_algorithm(values) == first
+
+
+@pytest.mark.parametrize('kind', list(sv.WORKLOAD_NAMES))
+def test_auto_sort_sorts_every_workload(kind):
+    values = sv.generate_workload(kind, 3000, random.Random(27))
+    assert list(sv.auto_sort(values)) == sorted(values)
+
+
+def test_auto_sort_handles_floats_negatives_and_typed_inputs():
+    rng = random.Random(28)
+    floats = [rng.uniform(-1, 1) for _ in range(500)]
+    assert sv.auto_sort(floats) == sorted(floats)
+    negatives = [rng.randint(-10 ** 12, 10 ** 12) for _ in range(500)]
+    assert sv.auto_sort(negatives) == sorted(negatives)
+    typed = array('q', sv.generate_workload('few-unique', 500, rng))
+    assert sv.auto_sort(typed) == array('q', sorted(typed))
+    assert list(sv.auto_sort(np.array(negatives))) == sorted(negatives)
+
+
+def test_resolve_auto_choice(capsys):
+    assert sv.resolve_auto_choice('4', [3, 2, 1]) == '4'
+    assert capsys.readouterr().out == ''
+    assert sv.resolve_auto_choice(sv.AUTO_CHOICE, list(range(10000))) == '12'
+    assert 'Auto picked Tim Sort' in capsys.readouterr().out
+
+
+def test_selector_benchmark_rows():
+    results = sv.run_selector_benchmark([1000], '13', repeats=1, warmup=0, seed=1,
+                                        distributions=['random', 'sorted'])
+    rows = results['results']
+    assert [(row['distribution'], row['selected']) for row in rows] == [
+        ('random', 'Bucket Sort'), ('sorted', 'Insertion Sort')]
+    assert all(row['selector_ns'] <= row['auto_median_ns'] for row in rows)
+    assert all(row['speedup'] > 0 for row in rows)
+
+
+def test_benchmark_sweep_leaves_out_quick_killer_unless_asked(monkeypatch):
+    built = []
+    real = sv.generate_workload
+    
+    def generate_workload(kind, n, rng=None):
+        built.append(kind)
+        return real(kind, n, rng)
+    monkeypatch.setattr(sv, 'generate_workload', generate_workload)
+    sv.main(['benchmark', '--auto', '-n', '100', '-r', '1', '-w', '0'])
+    assert built == list(sv.SWEEP_WORKLOADS) and 'quick-killer' not in built
+    
+    built.clear()
+    sv.main(['benchmark', '--auto', '-d', 'quick-killer', '-n', '100', '-r', '1', '-w', '0'])
+    assert built == ['quick-killer']
+
+
+def test_records_cannot_be_combined_with_auto(capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        sv.main(['benchmark', '--auto', '--records', '-n', '100'])
+    assert excinfo.value.code == 2
+    assert '--auto' in capsys.readouterr().err
+
+
+def test_auto_panel_names():
+    names = sv.auto_panel_names([sv.AUTO_CHOICE, '4'], ['12', '4'], sv.ALGORITHM_NAMES)
+    assert names['12'] == 'Auto → Tim Sort' and names['4'] == 'Quick Sort'
+    assert sv.ALGORITHM_NAMES['12'] == 'Tim Sort'
+    assert sv.auto_panel_names(['12', '4'], ['12', '4'], sv.ALGORITHM_NAMES) == sv.ALGORITHM_NAMES
+
+
+def test_interactive_auto_keeps_its_label_when_it_matches_the_other_panel(monkeypatch, capsys):
+    shown = []
+    algorithms = dict(sv.ALGORITHM_NAMES, auto='Auto')
+    monkeypatch.setattr(sv, 'get_user_input', lambda: 5000)
+    monkeypatch.setattr(sv, 'get_algorithm_selection', lambda: (sv.AUTO_CHOICE, '12', algorithms))
+    monkeypatch.setattr(sv, 'get_workload_selection', lambda: 'sorted')
+    monkeypatch.setattr(sv.SortingVisualizer, 'visualize_algorithms',
+                        lambda self, algo1, algo2, algo_names: shown.append((algo1, algo2, algo_names)))
+    sv.run_interactive()
+    
+    (algo1, algo2, algo_names), = shown
+    assert (algo1, algo2) == ('12', '12')
+    assert algo_names['12'] == 'Auto → Tim Sort'
+    assert 'for both panels' in capsys.readouterr().out
+
+
+def test_export_titles_the_auto_panel(tmp_path, monkeypatch):
+    exported = []
+    monkeypatch.setattr(sv, 'export_animation', lambda visualizer, algo1, algo2, algo_names, *args:
+                        exported.append([algo_names[algo1], algo_names[algo2]]) or 0)
+    sv.main(['--no-cache', 'export', 'auto', 'quick', '-d', 'sorted', '-n', '5000', '-o', str(tmp_path / 'x.gif')])
+    assert exported == [['Auto → Tim Sort', 'Quick Sort']]
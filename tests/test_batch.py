@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+import SortingVisualizer as sv
+
+
+@pytest.mark.parametrize('method', sv.BATCH_METHODS)
+@pytest.mark.parametrize('width', [1, 2, 5, 16, 33])
+def test_sort_rows_matches_np_sort(method, width):
+    rows = np.random.default_rng(width).integers(-50, 50, size=(5000, width))
+    assert np.array_equal(sv.sort_rows(rows, method), np.sort(rows, axis=1))
+
+
+def test_sort_rows_keeps_nested_lists():
+    assert sv.sort_rows([[3, 1, 2], [9, 7, 8]], method='shell') == [[1, 2, 3], [7, 8, 9]]
+
+
+@pytest.mark.parametrize('method', sv.BATCH_METHODS)
+def test_sort_rows_puts_nan_last_like_np_sort(method):
+    assert np.array_equal(sv.sort_rows(np.array([[3, np.nan, 1]]), method),
+                          [[1, 3, np.nan]], equal_nan=True)
+    
+    rng = np.random.default_rng(0)
+    rows = rng.random((3000, 12))
+    rows[rng.random(rows.shape) < 0.2] = np.nan
+    rows[rng.random(rows.shape) < 0.05] = np.inf
+    assert np.array_equal(sv.sort_rows(rows, method), np.sort(rows, axis=1), equal_nan=True)
+
+
+def test_sort_rows_rejects_bad_input():
+    with pytest.raises(ValueError):
+        sv.sort_rows([1, 2, 3])
+    with pytest.raises(ValueError):
+        sv.sort_rows([[1, 2]], method='bogo')
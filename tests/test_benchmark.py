@@ -0,0 +1,64 @@
+import csv
+import json
+
+import pytest
+
+import SortingVisualizer as sv
+
+
+@pytest.mark.parametrize('token, expected', [
+    ('4', '4'), ('quick', '4'), ('Quick Sort', '4'), ('pdq', '14'), ('heap-top-k', '16'), (' merge_sort ', '11'),
+])
+def test_resolve_algorithm_choice(token, expected):
+    assert sv.resolve_algorithm_choice(token) == expected
+
+
+def test_resolve_algorithm_choice_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        sv.resolve_algorithm_choice('sleep sort')
+
+
+def test_run_benchmark_rows_and_fits():
+    results = sv.run_benchmark(['4', '3'], [100, 400], repeats=2, warmup=0, seed=1)
+    
+    rows = results['results']
+    assert [(row['algorithm'], row['n']) for row in rows] == [
+        ('Quick Sort', 100), ('Quick Sort', 400), ('Insertion Sort', 100), ('Insertion Sort', 400)]
+    assert all(row['median_ns'] > 0 and row['repeats'] == 2 for row in rows)
+    assert results['fits']['Insertion Sort']['readme_average'] == 'O(n²)'
+    assert results['fits']['Insertion Sort']['fitted_exponent'] > results['fits']['Quick Sort']['fitted_exponent']
+
+
+def test_slow_algorithms_are_dropped_at_larger_sizes():
+    results = sv.run_benchmark(['1'], [50, 100, 200], repeats=1, warmup=0, seed=1, max_seconds=0)
+    assert [row['n'] for row in results['results']] == [50]
+
+
+def test_cli_writes_csv(tmp_path):
+    path = tmp_path / 'results.csv'
+    sv.main(['benchmark', '-a', 'quick', 'merge', '-n', '100', '1e3', '-r', '1', '-w', '0', '-s', '3',
+             '-o', str(path)])
+    
+    with open(path, newline='') as handle:
+        rows = list(csv.DictReader(handle))
+    assert [(row['algorithm'], row['n']) for row in rows] == [
+        ('Quick Sort', '100'), ('Quick Sort', '1000'), ('Merge Sort', '100'), ('Merge Sort', '1000')]
+    assert all(row['fitted_exponent'] and row['readme_average'] == 'O(n log n)' for row in rows)
+    assert sv.read_benchmark_results(str(path)) == rows
+
+
+def test_cli_writes_json(tmp_path):
+    path = tmp_path / 'results.json'
+    sv.main(['benchmark', '-a', '6', '-n', '64', '128', '-r', '1', '-w', '0', '--counts', '-o', str(path)])
+    
+    data = json.loads(path.read_text())
+    assert data['config']['sizes'] == [64, 128]
+    assert set(sv.OperationCounts.FIELDS) <= set(data['results'][0])
+    assert sv.read_benchmark_results(str(path)) == data['results']
+
+
+def test_cli_rejects_unknown_algorithm(capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        sv.main(['benchmark', '-a', 'nonsense', '-n', '10'])
+    assert excinfo.value.code == 2
+    assert 'Unknown algorithm' in capsys.readouterr().err
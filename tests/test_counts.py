@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+import SortingVisualizer as sv
+
+REVERSED = list(range(20, 0, -1))
+PAIRS = 20 * 19 // 2
+
+
+def counts_for(choice, values=REVERSED):
+    return sv.count_operations(sv.get_algorithm_function(choice), values)
+
+
+def test_bubble_sort_on_reversed_input_compares_and_swaps_every_pair():
+    counts = counts_for('1')
+    assert (counts.comparisons, counts.swaps, counts.writes) == (PAIRS, PAIRS, 0)
+    assert counts.aux_peak == counts.max_depth == 0
+
+
+def test_selection_sort_swaps_at_most_n_minus_one_times():
+    counts = counts_for('2')
+    assert counts.comparisons == PAIRS
+    assert counts.swaps <= 19
+
+
+def test_insertion_sort_shifts_once_per_inversion():
+    counts = counts_for('3')
+    # One shift per inverted pair plus one placement per inserted element
+    assert counts.writes == PAIRS + 19
+
+
+def test_quick_sort_depth_on_reversed_input():
+    assert counts_for('4').max_depth == 19
+
+
+def test_merge_sort_reports_linear_aux_memory():
+    counts = counts_for('11')
+    assert counts.aux_peak == len(REVERSED)
+    assert counts.aux_allocated >= counts.aux_peak
+    assert counts.max_depth == 5
+
+
+def test_meta_operations_are_tallied():
+    counts = sv.OperationCounts()
+    for op_code, arg1 in [(sv.OP_META_COMPARES, 4), (sv.OP_META_ALLOC, 10), (sv.OP_META_ALLOC, -10),
+                          (sv.OP_META_ALLOC, 3), (sv.OP_META_DEPTH, 2), (sv.OP_META_DEPTH, 1), (sv.OP_READ, 0)]:
+        counts.add(op_code, arg1)
+    assert counts.as_dict() == {'comparisons': 4, 'swaps': 0, 'writes': 0, 'aux_peak': 10,
+                                'aux_allocated': 13, 'max_depth': 2}
+
+
+@pytest.mark.parametrize('choice', ['4', '5', '6', '9', '11', '13'])
+def test_trace_counts_match_count_operations(choice):
+    values = sv.generate_workload('random', 100, random.Random(11))
+    trace = sv.record_trace(sv.get_algorithm_function(choice), values)
+    assert trace.counts.as_dict() == counts_for(choice, values).as_dict()
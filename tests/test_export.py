@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+import SortingVisualizer as sv
+
+
+@pytest.fixture
+def visualizer():
+    return sv.SortingVisualizer(12, seed=5)
+
+
+def test_png_export_writes_every_frame(tmp_path, visualizer):
+    output = tmp_path / 'frames'
+    count = sv.export_animation(visualizer, '4', '11', sv.ALGORITHM_NAMES, str(output), 'png', fps=2, dpi=20,
+                                jobs=1)
+    assert sorted(os.listdir(output)) == [f'frame_{index:06d}.png' for index in range(count)]
+
+
+def test_gif_export(tmp_path, visualizer):
+    from PIL import Image
+    
+    output = tmp_path / 'race.gif'
+    count = sv.export_animation(visualizer, '4', '11', sv.ALGORITHM_NAMES, str(output), 'gif', fps=2, dpi=20,
+                                jobs=2)
+    with Image.open(output) as image:
+        assert image.n_frames == count
+
+
+def test_missing_output_directory_fails_before_rendering(tmp_path, visualizer, monkeypatch):
+    def no_planning(*args, **kwargs):
+        raise AssertionError("frames were planned before the output was checked")
+    
+    monkeypatch.setattr(visualizer, '_plan_animation', no_planning)
+    with pytest.raises(RuntimeError, match='does not exist'):
+        sv.export_animation(visualizer, '4', '11', sv.ALGORITHM_NAMES, str(tmp_path / 'missing' / 'out.gif'),
+                            'gif')
+
+
+def test_cli_reports_missing_output_directory(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        sv.main(['--no-cache', 'export', 'merge', 'quick', '-n', '12', '-o', str(tmp_path / 'missing' / 'out.gif')])
+    assert exit_info.value.code == 2
+    assert 'does not exist' in capsys.readouterr().err
+
+
+def test_unknown_format_is_rejected(tmp_path, visualizer):
+    with pytest.raises(ValueError):
+        sv.export_animation(visualizer, '4', '11', sv.ALGORITHM_NAMES, str(tmp_path / 'out.avi'), 'avi')
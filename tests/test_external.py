@@ -0,0 +1,108 @@
+import os
+import random
+from array import array
+
+import pytest
+
+import SortingVisualizer as sv
+
+# Small enough for 100-value runs and a fan-in of two, so merges take several passes
+TINY_BUDGET = 100 * sv.EXTERNAL_BYTES_PER_VALUE
+
+
+def write_values(path, values, fmt):
+    if fmt == 'binary':
+        path.write_bytes(array('q', values).tobytes())
+    else:
+        path.write_text(''.join(f'{value}\n' for value in values))
+
+
+def read_values(path, fmt):
+    return [value for chunk in sv.read_integer_chunks(str(path), fmt, 1000) for value in chunk]
+
+
+@pytest.fixture
+def values():
+    rng = random.Random(13)
+    return [rng.randint(-2 ** 63, 2 ** 63 - 1) for _ in range(2000)] + [0] * 50
+
+
+@pytest.mark.parametrize('fmt, suffix', [('binary', '.bin'), ('text', '.txt')])
+@pytest.mark.parametrize('budget', [TINY_BUDGET, sv.EXTERNAL_MEMORY_BUDGET])
+def test_external_sort_matches_sorted(tmp_path, values, fmt, suffix, budget):
+    source = tmp_path / f'input{suffix}'
+    output = tmp_path / f'output{suffix}'
+    write_values(source, values, fmt)
+    
+    sv.external_sort(str(source), str(output), budget, temp_dir=str(tmp_path))
+    assert read_values(output, fmt) == sorted(values)
+    assert read_values(source, fmt) == values
+    # Run files live in a temporary directory that is removed afterwards
+    assert sorted(os.listdir(tmp_path)) == sorted([source.name, output.name])
+
+
+@pytest.mark.parametrize('choice', ['4', '11', '13'])
+def test_runs_can_use_a_menu_algorithm(tmp_path, values, choice):
+    source = tmp_path / 'input.bin'
+    write_values(source, values, 'binary')
+    sv.external_sort(str(source), str(tmp_path / 'output.bin'), TINY_BUDGET, choice=choice)
+    assert read_values(tmp_path / 'output.bin', 'binary') == sorted(values)
+
+
+def test_text_input_skips_blank_lines(tmp_path):
+    source = tmp_path / 'input.txt'
+    source.write_text('3\n\n-1\n 2 \n')
+    sv.external_sort(str(source), str(tmp_path / 'output.txt'))
+    assert (tmp_path / 'output.txt').read_text() == '-1\n2\n3\n'
+
+
+def test_empty_input(tmp_path):
+    source = tmp_path / 'input.bin'
+    source.write_bytes(b'')
+    sv.external_sort(str(source), str(tmp_path / 'output.bin'))
+    assert (tmp_path / 'output.bin').read_bytes() == b''
+
+
+def test_read_integer_chunks_sizes(tmp_path):
+    source = tmp_path / 'input.bin'
+    write_values(source, list(range(25)), 'binary')
+    chunks = list(sv.read_integer_chunks(str(source), 'binary', 10))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert all(isinstance(chunk, array) and chunk.typecode == 'q' for chunk in chunks)
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError, match='Unknown format'):
+        sv.external_sort(str(tmp_path / 'input.bin'), str(tmp_path / 'output.bin'), fmt='csv')
+
+
+def test_view_replays_to_sorted_bars(tmp_path, values):
+    source = tmp_path / 'input.bin'
+    output = tmp_path / 'output.bin'
+    write_values(source, values, 'binary')
+    view = sv.ExternalSortView(str(source), 64)
+    assert view.size == 64
+    
+    bars = list(view.initial_array)
+    generator = sv.external_sort_generator(view, str(source), str(output), TINY_BUDGET)
+    for op_code, index, value in generator(bars):
+        if op_code == sv.OP_WRITE:
+            bars[index] = value
+    
+    expected = sorted(values)
+    assert bars == [view.height(expected[mark]) for mark in view.marks]
+    assert bars == sorted(bars) and 1 <= bars[0] and bars[-1] <= view.size
+
+
+def test_cli(tmp_path, values, capsys):
+    source = tmp_path / 'input.txt'
+    write_values(source, values, 'text')
+    sv.main(['external', str(source), '-o', str(tmp_path / 'output.txt'), '-m', str(TINY_BUDGET)])
+    assert read_values(tmp_path / 'output.txt', 'text') == sorted(values)
+    assert 'Sorted' in capsys.readouterr().out
+
+
+def test_cli_reports_missing_input(tmp_path, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        sv.main(['external', str(tmp_path / 'missing.bin'), '-o', str(tmp_path / 'output.bin')])
+    assert excinfo.value.code == 2
@@ -0,0 +1,66 @@
+import sys
+import traceback
+
+import pytest
+
+import SortingVisualizer as sv
+
+
+@pytest.mark.parametrize('choice', ['4', '5', '11'])
+@pytest.mark.parametrize('distribution', ['sorted', 'reversed'])
+def test_explicit_stack_generators_handle_deep_ordered_input(choice, distribution):
+    values = sv.generate_workload(distribution, 3000)
+    trace = sv.record_trace(sv.get_algorithm_function(choice), values)
+    assert list(trace.final_array()) == sorted(values)
+
+
+def test_quick_sort_depth_reaches_n_on_sorted_input():
+    counts = sv.count_operations(sv.get_algorithm_function('4'), list(range(2000)))
+    assert counts.max_depth == 1999
+
+
+@pytest.mark.parametrize('choice', ['5', '11'])
+def test_merge_and_heap_generators_at_large_n(choice):
+    values = sv.generate_workload('reversed', 30000)
+    trace = sv.record_trace(sv.get_algorithm_function(choice), values)
+    assert list(trace.final_array()) == sorted(values)
+
+
+def yield_from_chain_length(generator):
+    """Generators suspended in the ``yield from`` chain starting at ``generator``."""
+    length = 0
+    while generator is not None:
+        length += 1
+        generator = getattr(generator, 'gi_yieldfrom', None)
+    return length
+
+
+@pytest.mark.parametrize('choice', ['4', '5', '11', '12', '13', '14'])
+def test_yield_chain_stays_constant_as_depth_grows(choice):
+    # Each nested ``yield from`` adds a frame every yield passes through, so the
+    # chain length is what made the cost per yield grow with recursion depth
+    longest = []
+    for n in (100, 500, 2000):
+        generator = sv.get_algorithm_function(choice)(sv.generate_workload('sorted', n))
+        longest.append(max(yield_from_chain_length(generator) for _ in generator))
+    assert longest[0] == longest[-1] <= 3
+
+
+def test_quick_sort_runs_far_below_the_recursion_limit():
+    limit = sys.getrecursionlimit()
+    # Room for the frames already on the stack plus a few dozen more
+    sys.setrecursionlimit(len(traceback.extract_stack()) + 50)
+    try:
+        values = sv.generate_workload('sorted', 2000)
+        trace = sv.record_trace(sv.get_algorithm_function('4'), values)
+    finally:
+        sys.setrecursionlimit(limit)
+    assert trace.counts.max_depth == 1999
+    assert list(trace.final_array()) == values
+
+
+def test_depth_benchmark_rows():
+    results = sv.run_depth_benchmark(['4'], [500, 1500], repeats=1, warmup=0)
+    assert [row['max_depth'] for row in results['results']] == [499, 1499]
+    assert all(row['ns_per_operation'] > 0 for row in results['results'])
+    assert 'depth_exponent' in results['fits']['Quick Sort']
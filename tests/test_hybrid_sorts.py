@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+import SortingVisualizer as sv
+
+HYBRIDS = ['12', '13', '14']
+SIZES = [0, 1, 2, 15, 16, 17, 23, 24, 25, 64, 127, 129, 1000]
+
+
+@pytest.mark.parametrize('choice', HYBRIDS)
+@pytest.mark.parametrize('kind', list(sv.WORKLOAD_NAMES))
+@pytest.mark.parametrize('n', SIZES)
+def test_fast_and_generator_variants_sort(choice, kind, n):
+    values = sv.generate_workload(kind, n, random.Random(n))
+    assert sv.get_algorithm_function(choice, fast=True)(list(values)) == sorted(values)
+    
+    trace = sv.record_trace(sv.get_algorithm_function(choice), values)
+    assert list(trace.final_array()) == sorted(values)
+
+
+@pytest.mark.parametrize('choice', HYBRIDS)
+def test_negative_and_duplicate_values(choice):
+    values = [random.Random(8).randint(-50, 50) for _ in range(500)]
+    assert sv.get_algorithm_function(choice, fast=True)(list(values)) == sorted(values)
+    assert list(sv.record_trace(sv.get_algorithm_function(choice), values).final_array()) == sorted(values)
+
+
+@pytest.mark.parametrize('kind', ['sorted', 'reversed'])
+def test_timsort_finds_a_single_run_in_linear_time(kind):
+    counts = sv.count_operations(sv.get_algorithm_function('12'), sv.generate_workload(kind, 1000))
+    assert counts.comparisons == 999
+
+
+def test_pdqsort_is_adaptive_on_ordered_input():
+    n = 1000
+    pdq = sv.get_algorithm_function('14')
+    assert sv.count_operations(pdq, sv.generate_workload('sorted', n)).comparisons < 3 * n
+    assert sv.count_operations(pdq, sv.generate_workload('reversed', n)).comparisons < 4 * n
+
+
+@pytest.mark.parametrize('choice', ['13', '14'])
+def test_quicksort_killer_stays_n_log_n(choice):
+    n = 2000
+    counts = sv.count_operations(sv.get_algorithm_function(choice), sv.generate_workload('quick-killer', n))
+    assert counts.comparisons < 4 * n * n.bit_length()
+    assert counts.max_depth <= 2 * n.bit_length() + 2
@@ -0,0 +1,75 @@
+import time
+import tracemalloc
+
+import pytest
+
+import SortingVisualizer as sv
+
+
+def test_merge_sort_needs_linear_aux_memory_and_heap_sort_does_not():
+    values = list(range(20000, 0, -1))
+    merge = sv.measure_memory(sv.SortingAlgorithms.merge_sort, values)
+    heap = sv.measure_memory(sv.SortingAlgorithms.heap_sort, values)
+    assert merge.aux_bytes > 8 * len(values)
+    assert heap.aux_bytes < merge.aux_bytes / 10
+
+
+def test_measure_memory_refuses_to_run_inside_another_trace():
+    tracemalloc.start()
+    try:
+        with pytest.raises(RuntimeError):
+            sv.measure_memory(sorted, [3, 1, 2])
+    finally:
+        tracemalloc.stop()
+
+
+def test_memory_benchmark_rows():
+    results = sv.run_memory_benchmark(['5', '11'], [500, 2000], seed=1)
+    rows = {(row['algorithm'], row['n']): row for row in results['results']}
+    assert rows[('Merge Sort', 2000)]['aux_bytes'] > rows[('Heap Sort', 2000)]['aux_bytes']
+    assert 'generator_alloc_events' not in rows[('Merge Sort', 2000)]
+    assert results['fits']['Merge Sort']['readme_space'] == sv.ALGORITHM_SPACE['11']
+
+
+def test_generators_report_alloc_events_from_the_measured_run(tmp_path):
+    results = sv.run_memory_benchmark(['5', '11'], [500, 2000], seed=1, generators=True)
+    rows = {(row['algorithm'], row['n']): row for row in results['results']}
+    assert rows[('Heap Sort', 2000)]['generator_alloc_events'] == 0
+    assert rows[('Merge Sort', 2000)]['generator_alloc_events'] > 0
+    
+    path = tmp_path / 'memory.csv'
+    sv.write_benchmark_results(results, str(path), 'csv')
+    assert 'generator_alloc_events' in path.read_text().splitlines()[0]
+
+
+def test_generators_run_only_once_per_size_and_within_the_budget(monkeypatch):
+    real = sv.get_algorithm_function
+    runs = []
+    
+    def slow_generator(values):
+        runs.append(len(values))
+        time.sleep(0.2)
+        yield sv.OP_META_ALLOC, len(values), 0
+    
+    monkeypatch.setattr(sv, 'get_algorithm_function',
+                        lambda choice, fast=False: real(choice, fast) if fast else slow_generator)
+    without = sv.run_memory_benchmark(['11'], [100, 200, 400], seed=2, max_seconds=0.1)
+    assert runs == []
+    assert [row['n'] for row in without['results']] == [100, 200, 400]
+    
+    results = sv.run_memory_benchmark(['11'], [100, 200, 400], seed=2, max_seconds=0.1, generators=True)
+    # One warmup and one traced run, after which the budget skips the larger sizes
+    assert runs == [100, 100]
+    assert [row['generator_alloc_events'] for row in results['results']] == [1]
+
+
+def test_regressions_against_a_saved_baseline(tmp_path):
+    results = sv.run_memory_benchmark(['11'], [1000], seed=3)
+    path = tmp_path / 'memory.csv'
+    sv.write_benchmark_results(results, str(path), 'csv')
+    baseline = sv.read_benchmark_results(str(path))
+    assert sv.find_memory_regressions(results['results'], baseline) == []
+    
+    grown = [dict(row, peak_bytes=row['peak_bytes'] * 2 + sv.MEMORY_REGRESSION_SLACK)
+             for row in results['results']]
+    assert len(sv.find_memory_regressions(grown, baseline)) == 1
@@ -0,0 +1,47 @@
+import random
+
+import numpy as np
+import pytest
+
+import SortingVisualizer as sv
+
+
+@pytest.mark.parametrize('radix', [2, 256, 2048, 1 << 16])
+def test_radix_sort_handles_negative_and_extreme_values(radix):
+    values = [random.Random(radix).randint(-2**63, 2**63 - 1) for _ in range(2000)] + [-2**63, 2**63 - 1, 0]
+    assert sv.numpy_radix_sort(values, radix) == sorted(values)
+
+
+@pytest.mark.parametrize('sort_func', [sv.numpy_radix_sort, sv.numpy_counting_sort, sv.numpy_bucket_sort])
+@pytest.mark.parametrize('distribution', ['random', 'few-unique', 'zipf', 'sorted'])
+def test_numpy_sorts_match_sorted(sort_func, distribution):
+    values = sv.generate_workload(distribution, 5000, random.Random(1))
+    assert sort_func(values) == sorted(values)
+    result = sort_func(np.array(values, dtype=np.int32))
+    assert isinstance(result, np.ndarray)
+    assert result.tolist() == sorted(values)
+
+
+def test_counting_sort_rejects_wide_ranges():
+    with pytest.raises(ValueError):
+        sv.numpy_counting_sort([0, 10**12])
+
+
+def test_float_arrays_are_rejected():
+    with pytest.raises(TypeError):
+        sv.numpy_radix_sort(np.array([1.5, 0.5]))
+
+
+@pytest.mark.parametrize('sort_func', [sv.numpy_radix_sort, sv.numpy_counting_sort, sv.numpy_bucket_sort])
+def test_uint64_beyond_int64_is_rejected_instead_of_wrapping(sort_func):
+    with pytest.raises(ValueError):
+        sort_func(np.array([1, 2**63, 3], dtype=np.uint64))
+
+
+def test_uint64_within_int64_range_sorts():
+    assert sv.numpy_radix_sort(np.array([5, 2**62, 1], dtype=np.uint64)).tolist() == [1, 5, 2**62]
+
+
+def test_bad_radix():
+    with pytest.raises(ValueError):
+        sv.numpy_radix_sort([3, 1], radix=3)
@@ -0,0 +1,67 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import SortingVisualizer as sv
+
+PARALLEL_SORTS = [sv.parallel_merge_sort, sv.parallel_sample_sort]
+
+
+@pytest.fixture(scope='module')
+def pool():
+    with ProcessPoolExecutor(max_workers=3) as executor:
+        yield executor
+
+
+@pytest.mark.parametrize('sort_func', PARALLEL_SORTS)
+@pytest.mark.parametrize('kind', ['random', 'sorted', 'reversed', 'few-unique', 'zipf'])
+@pytest.mark.parametrize('workers', [1, 2, 3])
+def test_parallel_sorts_match_sorted(pool, sort_func, kind, workers):
+    values = sv.generate_workload(kind, 5000, random.Random(workers))
+    assert sort_func(values, workers, executor=pool) == sorted(values)
+
+
+@pytest.mark.parametrize('sort_func', PARALLEL_SORTS)
+@pytest.mark.parametrize('values', [[], [7], [2, 1], [5, 5, 5, 5, 5, 5, 5], [3, 1, 2]])
+def test_tiny_inputs_and_more_workers_than_values(pool, sort_func, values):
+    assert sort_func(values, 3, executor=pool) == sorted(values)
+
+
+@pytest.mark.parametrize('sort_func', PARALLEL_SORTS)
+def test_negative_and_extreme_int64_values(pool, sort_func):
+    rng = random.Random(9)
+    values = [rng.randint(-2 ** 63, 2 ** 63 - 1) for _ in range(3000)] + [-2 ** 63, 2 ** 63 - 1, 0]
+    assert sort_func(values, 3, executor=pool) == sorted(values)
+
+
+@pytest.mark.parametrize('sort_func', PARALLEL_SORTS)
+@pytest.mark.parametrize('choice', ['4', '13', '14'])
+def test_chunk_algorithm_choice(pool, sort_func, choice):
+    values = sv.generate_workload('random', 2000, random.Random(10))
+    assert sort_func(values, 2, choice, executor=pool) == sorted(values)
+
+
+def test_input_is_left_untouched(pool):
+    values = sv.generate_workload('random', 1000, random.Random(11))
+    original = list(values)
+    sv.parallel_sample_sort(values, 2, executor=pool, seed=1)
+    assert values == original
+
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason="needs /dev/shm to list shared memory")
+def test_shared_memory_is_released():
+    before = set(os.listdir('/dev/shm'))
+    values = sv.generate_workload('random', 2000, random.Random(12))
+    assert sv.parallel_merge_sort(values, 2) == sorted(values)
+    assert sv.parallel_sample_sort(values, 2) == sorted(values)
+    assert set(os.listdir('/dev/shm')) <= before
+
+
+def test_parallel_benchmark_rows():
+    results = sv.run_parallel_benchmark('11', [2000], [1, 2], repeats=1, warmup=0, seed=1)
+    rows = results['results']
+    assert {(row['algorithm'], row['workers']) for row in rows} >= {
+        ('Parallel Merge Sort', 1), ('Parallel Merge Sort', 2)}
+    assert all(row['speedup'] > 0 for row in rows)
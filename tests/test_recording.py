@@ -0,0 +1,55 @@
+import multiprocessing
+import random
+import time
+
+import pytest
+
+import SortingVisualizer as sv
+
+
+def test_record_traces_matches_in_process_recording():
+    values = sv.generate_workload('random', 300, random.Random(1))
+    traces = sv.record_traces(['4', '11'], values, jobs=2)
+    for choice, trace in traces.items():
+        expected = sv.record_trace(sv.get_algorithm_function(choice), values)
+        assert trace.operation_count == expected.operation_count
+        assert list(trace.final_array()) == sorted(values)
+
+
+def test_should_cancel_stops_parallel_workers():
+    # Bubble and selection sort on 3000 elements take far longer than the test allows
+    values = sv.generate_workload('random', 3000, random.Random(2))
+    start = time.perf_counter()
+    deadline = start + 1.0
+    
+    with pytest.raises(sv.RecordingCancelled):
+        sv.record_traces(['1', '2'], values, should_cancel=lambda: time.perf_counter() > deadline)
+    
+    assert time.perf_counter() - start < 10
+    assert multiprocessing.active_children() == []
+
+
+def test_should_cancel_stops_in_process_recording():
+    values = sv.generate_workload('random', 3000, random.Random(3))
+    with pytest.raises(sv.RecordingCancelled):
+        sv.record_traces(['1'], values, should_cancel=lambda: True)
+
+
+def test_closing_the_window_cancels_recording(monkeypatch):
+    from matplotlib.backend_bases import CloseEvent
+    import matplotlib.pyplot as plt
+    
+    polled = []
+    
+    def fake_record_traces(choices, initial_array, keyframe_interval=None, jobs=None, should_cancel=None):
+        assert not should_cancel()
+        figure = plt.gcf()
+        figure.canvas.callbacks.process('close_event', CloseEvent('close_event', figure.canvas))
+        polled.append(should_cancel())
+        raise sv.RecordingCancelled('cancelled by caller')
+    
+    monkeypatch.setattr(sv, 'record_traces', fake_record_traces)
+    visualizer = sv.SortingVisualizer(300, seed=4)
+    with pytest.raises(sv.RecordingCancelled):
+        visualizer.visualize_algorithms('4', '11', sv.ALGORITHM_NAMES)
+    assert polled == [True]
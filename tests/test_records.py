@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+import SortingVisualizer as sv
+
+SORTS = [choice for choice in sv.ALGORITHM_NAMES
+         if choice not in sv.SELECTION_ALGORITHMS + sv.BOUNDED_ALGORITHMS]
+KEYS = {
+    'composite': sv.record_sort_key,
+    'int': lambda record: record['score'],
+    'str': lambda record: record['name'],
+    'mixed tuple': lambda record: (record['name'], -record['score']),
+}
+
+
+@pytest.mark.parametrize('choice', SORTS)
+@pytest.mark.parametrize('key_name', KEYS)
+@pytest.mark.parametrize('reverse', [False, True])
+def test_matches_sorted_and_is_stable(choice, key_name, reverse):
+    # Few distinct scores and names, so many records tie and only their order tells them apart
+    records = sv.generate_records('few-unique', 400, random.Random(1))
+    key = KEYS[key_name]
+    assert sv.sort_records(records, key, reverse, choice) == sorted(records, key=key, reverse=reverse)
+
+
+@pytest.mark.parametrize('choice', SORTS)
+def test_key_is_called_once_per_record(choice):
+    records = sv.generate_records('random', 300, random.Random(2))
+    sort_func = lambda values, key: sv.sort_records(values, key=key, choice=choice)
+    assert sv.count_key_calls(sort_func, records, sv.record_sort_key) == len(records)
+
+
+@pytest.mark.parametrize('choice', ['8', '9'])
+@pytest.mark.parametrize('reverse', [False, True])
+def test_byte_keys_order_strings_and_big_ints(choice, reverse):
+    words = ['a', 'a\0', '', 'ab', 'a\0c', 'é', 'z', 'ß', '日本', '日', '\0'] * 3
+    assert sv.sort_records(words, reverse=reverse, choice=choice) == sorted(words, reverse=reverse)
+    numbers = [random.Random(3).randint(-10**30, 10**30) for _ in range(200)] + [0, -1, 1]
+    assert sv.sort_records(numbers, reverse=reverse, choice=choice) == sorted(numbers, reverse=reverse)
+
+
+def test_byte_keys_reject_floats():
+    with pytest.raises(TypeError):
+        sv.sort_records([1.5, 0.5], choice='8')
+
+
+@pytest.mark.parametrize('choice', ['10', '15', '16', '17', '99'])
+def test_rejects_choices_that_do_not_fully_sort(choice):
+    with pytest.raises(ValueError):
+        sv.sort_records([3, 1, 2], choice=choice)
+
+
+def test_records_benchmark_counts_key_calls():
+    results = sv.run_benchmark(['4', '8'], [200], repeats=1, seed=4, records=True)
+    assert [row['key_calls'] for row in results['results']] == [200, 200]
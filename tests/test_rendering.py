@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+
+import SortingVisualizer as sv
+
+INITIAL = [5, 3, 8, 1, 9, 2, 7, 4, 6, 10]
+
+
+@pytest.fixture
+def plt():
+    pyplot, _ = sv._load_pyplot()
+    yield pyplot
+    pyplot.close('all')
+
+
+def make_bar_renderer(plt, blit, heights=INITIAL):
+    fig, ax = plt.subplots(figsize=(4, 3), dpi=50)
+    ax.set_xlim(-1, len(heights))
+    ax.set_ylim(0, max(heights) + 1)
+    bars = ax.bar(range(len(heights)), heights, width=0.8)
+    label = ax.text(0.02, 0.95, 'Starting...', transform=ax.transAxes)
+    renderer = sv.BarRenderer(ax, bars, label, blit)
+    fig.canvas.draw()
+    return fig, renderer
+
+
+def test_only_changed_bars_are_touched(plt, monkeypatch):
+    fig, renderer = make_bar_renderer(plt, blit=False)
+    touched = []
+    for i, bar in enumerate(renderer.bars):
+        monkeypatch.setattr(bar, 'set_height', lambda height, i=i: touched.append(i))
+    
+    renderer.update([3, 5] + INITIAL[2:], sv.BAR_COLOR_NORMAL)
+    assert touched == [0, 1]
+    
+    touched.clear()
+    renderer.update([3, 5] + INITIAL[2:], sv.BAR_COLOR_NORMAL, highlighted=(4,))
+    assert touched == [4]
+    
+    touched.clear()
+    renderer.update([3, 5] + INITIAL[2:], sv.BAR_COLOR_NORMAL, highlighted=(4,))
+    assert touched == []
+
+
+def test_prefix_and_highlight_colors(plt):
+    fig, renderer = make_bar_renderer(plt, blit=False)
+    renderer.update(INITIAL, 'red', highlighted=(5,), prefix_count=3, prefix_color='blue')
+    assert renderer.colors == ['blue'] * 3 + ['red'] * 2 + [sv.BAR_COLOR_SELECTED] + ['red'] * 4
+    assert [bar.get_height() for bar in renderer.bars] == INITIAL
+
+
+def test_blitted_updates_match_a_full_redraw(plt):
+    fig, renderer = make_bar_renderer(plt, blit=True)
+    renderer.update([3, 5] + INITIAL[2:], sv.BAR_COLOR_NORMAL, highlighted=(0, 1))
+    renderer.set_label('Bubble Sort - 2 operations')
+    renderer.update(sorted(INITIAL), 'yellow')
+    renderer.set_label('Done')
+    incremental = np.asarray(fig.canvas.buffer_rgba()).copy()
+    
+    fig.canvas.draw()
+    assert np.array_equal(incremental, np.asarray(fig.canvas.buffer_rgba()))
+
+
+def make_raster_renderer(plt, n, blit, y_max=None):
+    fig, ax = plt.subplots(figsize=(4, 3), dpi=50)
+    y_max = y_max or n + 1
+    ax.set_xlim(-1, n)
+    ax.set_ylim(0, y_max)
+    label = ax.text(0.02, 0.95, 'Starting...', transform=ax.transAxes)
+    renderer = sv.RasterRenderer(ax, n, y_max, label, blit)
+    fig.canvas.draw()
+    return fig, renderer
+
+
+def test_raster_columns_are_bounded_by_pixels(plt):
+    fig, renderer = make_raster_renderer(plt, 100000, blit=False)
+    assert renderer.columns <= 200
+    assert renderer.buffer.shape == (renderer.rows, renderer.columns)
+    
+    small_fig, small = make_raster_renderer(plt, 20, blit=False)
+    assert small.columns == 20
+
+
+def test_raster_shows_column_min_and_max(plt):
+    n = 1000
+    fig, renderer = make_raster_renderer(plt, n, blit=False, y_max=n)
+    values = np.arange(1, n + 1)[::-1].copy()
+    renderer.update(values, sv.BAR_COLOR_NORMAL)
+    
+    buffer = renderer.buffer
+    for column in (0, renderer.columns // 2, renderer.columns - 1):
+        bucket = values[renderer.starts[column]:(renderer.starts[column + 1] if column + 1 < renderer.columns
+                                                 else n)]
+        solid = np.count_nonzero(buffer[:, column] == 2)
+        filled = np.count_nonzero(buffer[:, column] > 0)
+        assert solid == np.ceil(bucket.min() * renderer.column_rows)
+        assert filled == min(renderer.rows, np.ceil(bucket.max() * renderer.column_rows))
+
+
+def test_raster_prefix_and_highlight_classes(plt):
+    n = 1000
+    fig, renderer = make_raster_renderer(plt, n, blit=False)
+    renderer.update(np.full(n, n), 'red', highlighted=(n - 1,), prefix_count=n // 2, prefix_color='blue')
+    
+    classes = renderer.buffer[0] // 3
+    assert (classes[:renderer.columns // 2] == 1).all()
+    assert classes[-1] == 2
+    assert (classes[renderer.columns // 2:-1] == 0).all()
+
+
+def test_raster_blitted_updates_match_a_full_redraw(plt):
+    n = 5000
+    fig, renderer = make_raster_renderer(plt, n, blit=True)
+    values = np.random.default_rng(1).permutation(n) + 1
+    renderer.set_label('Bubble Sort - 2 operations')
+    renderer.update(values, sv.BAR_COLOR_NORMAL, highlighted=(10,))
+    renderer.set_label('Done')
+    renderer.update(np.sort(values), 'yellow')
+    incremental = np.asarray(fig.canvas.buffer_rgba()).copy()
+    
+    fig.canvas.draw()
+    assert np.array_equal(incremental, np.asarray(fig.canvas.buffer_rgba()))
+
+
+def test_visualizer_switches_to_raster_above_threshold():
+    assert not sv.SortingVisualizer(n_bars=50, renderer='auto', trace_cache=None).use_raster
+    assert sv.SortingVisualizer(n_bars=sv.RASTER_THRESHOLD + 1, renderer='auto', trace_cache=None).use_raster
+    assert sv.SortingVisualizer(n_bars=50, renderer='raster', trace_cache=None).use_raster
@@ -0,0 +1,73 @@
+import random
+from functools import partial
+
+import pytest
+
+import SortingVisualizer as sv
+
+
+def check_selection(choice, values, result, k):
+    assert sorted(result) == sorted(values)
+    if choice == '15':
+        assert result[k] == sorted(values)[k]
+        assert max(result[:k], default=result[k]) <= result[k] <= min(result[k + 1:], default=result[k])
+        return
+    assert sorted(result[:k]) == sorted(values)[:k]
+    if choice == '17':
+        assert result[:k] == sorted(values)[:k]
+
+
+@pytest.mark.parametrize('choice', sv.SELECTION_ALGORITHMS)
+@pytest.mark.parametrize('kind', ['random', 'sorted', 'reversed', 'few-unique', 'quick-killer'])
+@pytest.mark.parametrize('n', [1, 2, 17, 300])
+def test_every_k(choice, kind, n):
+    values = sv.generate_workload(kind, n, random.Random(n))
+    fast = sv.get_algorithm_function(choice, fast=True)
+    generator = sv.get_algorithm_function(choice)
+    ks = range(n) if choice == '15' else range(n + 1)
+    for k in (ks if n <= 17 else [0, 1, n // 3, n // 2, n - 1]):
+        check_selection(choice, values, fast(list(values), k), k)
+        trace = sv.record_trace(partial(generator, k=k), values)
+        check_selection(choice, values, list(trace.final_array()), k)
+
+
+@pytest.mark.parametrize('choice', sv.SELECTION_ALGORITHMS)
+def test_default_k_results_are_valid(choice):
+    values = sv.generate_workload('random', 500, random.Random(14))
+    assert sv.result_is_valid(choice, sv.get_algorithm_function(choice, fast=True)(values))
+    assert sv.result_is_valid(choice, list(sv.record_trace(sv.get_algorithm_function(choice), values)
+                                           .final_array()))
+
+
+def test_selection_k_defaults():
+    assert sv.selection_k('15', 101) == 50
+    assert sv.selection_k('16', 3) == 1
+    assert sv.selection_k('17', 1000) == 1000 // sv.SELECTION_K_DIVISOR
+    assert sv.selection_k('17', 0) == 0
+
+
+def test_result_is_valid_rejects_wrong_results():
+    assert sv.result_is_valid(None, [1, 2, 2, 3])
+    assert not sv.result_is_valid('4', [2, 1, 3])
+    # Median of five at index 2
+    assert sv.result_is_valid('15', [2, 1, 3, 5, 4])
+    assert not sv.result_is_valid('15', [1, 4, 3, 5, 2])
+    n = 4 * sv.SELECTION_K_DIVISOR
+    k = sv.selection_k('17', n)
+    unsorted_front = list(range(k, 0, -1)) + list(range(k + 1, n + 1))
+    assert sv.result_is_valid('16', unsorted_front)
+    assert not sv.result_is_valid('17', unsorted_front)
+    assert not sv.result_is_valid('16', [n] + list(range(1, n)))
+
+
+def test_quickselect_stays_linearithmic_on_adversarial_input():
+    n = 2000
+    counts = sv.count_operations(sv.get_algorithm_function('15'), sv.generate_workload('quick-killer', n))
+    assert counts.comparisons < 4 * n * n.bit_length()
+
+
+def test_heap_top_k_does_less_work_than_a_full_sort():
+    values = sv.generate_workload('random', 5000, random.Random(15))
+    top_k = sv.count_operations(sv.get_algorithm_function('16'), values)
+    heap_sort = sv.count_operations(sv.get_algorithm_function('5'), values)
+    assert top_k.comparisons < heap_sort.comparisons / 2
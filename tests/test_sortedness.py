@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+import SortingVisualizer as sv
+
+
+def exact_inversions(values):
+    return sum(values[i] > values[j] for i in range(len(values)) for j in range(i + 1, len(values)))
+
+
+def descents(values):
+    return sum(a > b for a, b in zip(values, values[1:]))
+
+
+def mutate(tracker, rng, steps):
+    n = len(tracker.array)
+    for _ in range(steps):
+        if rng.random() < 0.5:
+            tracker.swap(rng.randrange(n), rng.randrange(n))
+        else:
+            tracker.write(rng.randrange(n), rng.randint(1, max(1, n // 2)))
+
+
+@pytest.mark.parametrize('n', [1, 2, 5, sv.SORTEDNESS_EXACT_MAX])
+def test_small_arrays_are_tracked_exactly(n):
+    rng = random.Random(n)
+    tracker = sv.SortednessTracker(sv.generate_workload('random', n, rng))
+    for _ in range(50):
+        mutate(tracker, rng, 5)
+        values = list(tracker.array)
+        assert tracker.inversions == exact_inversions(values)
+        assert tracker.adjacent_inversions == descents(values)
+        assert tracker.runs == descents(values) + 1
+        assert tracker.is_sorted == (values == sorted(values))
+
+
+@pytest.mark.parametrize('n', [sv.SORTEDNESS_EXACT_MAX + 1, 97, 1000])
+def test_large_arrays_keep_incremental_counts_consistent(n):
+    rng = random.Random(n)
+    tracker = sv.SortednessTracker(sv.generate_workload('random', n, rng))
+    mutate(tracker, rng, 2000)
+    
+    fresh = sv.SortednessTracker(list(tracker.array))
+    assert tracker.sampled_inversions == fresh.sampled_inversions
+    assert tracker.adjacent_inversions == descents(list(tracker.array))
+
+
+def test_sampled_estimate_is_close_to_the_exact_share():
+    rng = random.Random(19)
+    values = sv.generate_workload('k-sorted', 2000, rng)
+    tracker = sv.SortednessTracker(list(values))
+    exact = exact_inversions(values) / (len(values) * (len(values) - 1) / 2)
+    assert abs(tracker.inversion_fraction - exact) < 0.01
+
+
+@pytest.mark.parametrize('n', [10, 1000])
+def test_sorted_and_reversed_extremes(n):
+    ascending = sv.SortednessTracker(list(range(n)))
+    assert ascending.is_sorted and ascending.percent_sorted == 100.0 and ascending.kendall_tau == 1.0
+    
+    descending = sv.SortednessTracker(list(range(n, 0, -1)))
+    assert descending.inversion_fraction == 1.0 and descending.kendall_tau == -1.0
+    assert descending.runs == n
+    assert descending.percent_sorted == 0.0
+
+
+def test_percent_sorted_stays_below_100_until_sorted():
+    values = list(range(1000))
+    values[10], values[11] = values[11], values[10]
+    tracker = sv.SortednessTracker(values)
+    assert not tracker.is_sorted
+    assert tracker.percent_sorted < 100
+    tracker.swap(10, 11)
+    assert tracker.percent_sorted == 100.0
+
+
+def test_replayer_tracks_sortedness_across_seeks():
+    values = sv.generate_workload('random', 300, random.Random(20))
+    trace = sv.record_trace(sv.get_algorithm_function('6'), values, keyframe_interval=100)
+    replayer = trace.replayer(track_sortedness=True)
+    
+    for index in [5, 900, 50, len(trace) // 2, 10, len(trace) - 1]:
+        frame, _, _ = replayer.seek(index)
+        fresh = sv.SortednessTracker(list(frame))
+        assert replayer.sortedness.sampled_inversions == fresh.sampled_inversions
+        assert replayer.sortedness.adjacent_inversions == fresh.adjacent_inversions
+    assert replayer.sortedness.is_sorted
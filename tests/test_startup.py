@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+
+import SortingVisualizer as sv
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code, **env):
+    environment = {key: value for key, value in os.environ.items()
+                   if key not in ('MPLBACKEND', 'DISPLAY', 'WAYLAND_DISPLAY')}
+    environment.update(env)
+    completed = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, env=environment,
+                               capture_output=True, text=True, timeout=120)
+    assert completed.returncode == 0, completed.stderr
+    return completed.stdout.strip()
+
+
+def test_import_and_headless_benchmark_do_not_load_matplotlib():
+    output = run_python(
+        "import sys, SortingVisualizer as sv\n"
+        "sv.main(['benchmark', '-a', 'quick', '-n', '50', '-r', '1', '-w', '0'])\n"
+        "print('matplotlib' in sys.modules)")
+    assert output.splitlines()[-1] == 'False'
+
+
+def test_load_pyplot_falls_back_to_agg_without_a_display():
+    output = run_python(
+        "import SortingVisualizer as sv\n"
+        "plt, animation = sv._load_pyplot()\n"
+        "print(plt.get_backend().lower())")
+    assert output == 'agg'
+
+
+def test_load_pyplot_respects_mplbackend():
+    output = run_python(
+        "import SortingVisualizer as sv\n"
+        "plt, animation = sv._load_pyplot()\n"
+        "print(plt.get_backend().lower())", MPLBACKEND='svg')
+    assert output == 'svg'
+
+
+def test_has_display_reads_the_environment(monkeypatch):
+    monkeypatch.setattr(sv.sys, 'platform', 'linux')
+    monkeypatch.delenv('DISPLAY', raising=False)
+    monkeypatch.delenv('WAYLAND_DISPLAY', raising=False)
+    assert not sv._has_display()
+    
+    monkeypatch.setenv('WAYLAND_DISPLAY', 'wayland-0')
+    assert sv._has_display()
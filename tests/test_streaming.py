@@ -0,0 +1,77 @@
+import random
+import threading
+import time
+
+import SortingVisualizer as sv
+
+
+def drain(stream, step=50, timeout=30):
+    """Advance ``stream`` until the producer has finished and every operation is applied."""
+    deadline = time.monotonic() + timeout
+    while not stream.finished:
+        assert time.monotonic() < deadline, "stream never finished"
+        applied = stream.operation_count
+        stream.advance(step)
+        if stream.operation_count == applied:
+            time.sleep(0.001)
+
+
+def test_stream_replays_to_the_recorded_result():
+    values = sv.generate_workload('random', 200, random.Random(12))
+    stream = sv.OperationStream(sv.get_algorithm_function('11'), values, chunk_size=64, max_chunks=2)
+    drain(stream)
+    trace = sv.record_trace(sv.get_algorithm_function('11'), values)
+    
+    assert list(stream.array) == sorted(values)
+    assert stream.operation_count == trace.operation_count
+    assert stream.counts.as_dict() == trace.counts.as_dict()
+    assert stream.sortedness.is_sorted
+    assert stream.highlight == (-1, -1)
+
+
+def test_advance_highlights_the_last_applied_operation():
+    stream = sv.OperationStream(sv.get_algorithm_function('1'), [2, 1, 3])
+    stream._producer.join(5)
+    
+    # Bubble sort first compares elements 0 and 1, then swaps them
+    assert stream.advance(1) == (stream.array, 0, 1)
+    assert stream.advance(1)[0].tolist() == [1, 2, 3]
+    assert stream.operation_count == 2
+
+
+def test_advance_never_waits_for_the_producer():
+    gate = threading.Event()
+    
+    def slow_sort(arr):
+        yield (sv.OP_COMPARE, 0, 1)
+        gate.wait(5)
+        yield (sv.OP_SWAP, 0, 1)
+    
+    stream = sv.OperationStream(slow_sort, [2, 1], chunk_size=1)
+    time.sleep(0.1)
+    start = time.perf_counter()
+    stream.advance(10)
+    assert time.perf_counter() - start < 0.05
+    assert stream.operation_count == 1 and not stream.finished
+    
+    gate.set()
+    drain(stream)
+    assert stream.array.tolist() == [1, 2]
+
+
+def test_producer_blocks_on_a_full_queue_and_stops_on_close():
+    produced = []
+    
+    def endless(arr):
+        while True:
+            produced.append(1)
+            yield (sv.OP_COMPARE, 0, 1)
+    
+    stream = sv.OperationStream(endless, [1, 2], chunk_size=10, max_chunks=3)
+    time.sleep(0.2)
+    # Three queued chunks plus one the producer is trying to hand off
+    assert len(produced) <= 4 * 10 + 1
+    
+    stream.close()
+    stream._producer.join(5)
+    assert not stream._producer.is_alive()
@@ -0,0 +1,42 @@
+import inspect
+
+import pytest
+
+import SortingVisualizer as sv
+
+
+def test_defaults_come_from_the_timing_constants():
+    parameters = inspect.signature(sv.time_algorithm).parameters
+    assert parameters['repeats'].default == sv.TIMING_REPEATS
+    assert parameters['warmup'].default == sv.TIMING_WARMUP
+
+
+def test_each_run_sorts_a_fresh_copy():
+    seen = []
+    
+    def sort_func(values):
+        seen.append(list(values))
+        values.sort()
+    
+    values = [3, 1, 2]
+    result = sv.time_algorithm(sort_func, values, repeats=3, warmup=2)
+    assert seen == [[3, 1, 2]] * 5
+    assert values == [3, 1, 2]
+    assert len(result.samples_ns) == 3
+    assert min(result.samples_ns) <= result.median_ns <= result.p95_ns <= max(result.samples_ns)
+
+
+def test_repeats_must_be_positive():
+    with pytest.raises(ValueError):
+        sv.time_algorithm(sorted, [1], repeats=0)
+
+
+def test_fit_growth_exponent():
+    sizes = [1000, 2000, 4000, 8000]
+    assert sv.fit_growth_exponent(sizes, [n ** 2 for n in sizes]) == pytest.approx(2)
+    assert sv.fit_growth_exponent([10], [1.0]) is None
+
+
+def test_format_duration():
+    assert sv.format_duration(1500) == '1.5µs'
+    assert sv.format_duration(2.5e9) == '2.500s'
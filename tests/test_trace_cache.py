@@ -0,0 +1,139 @@
+import os
+import random
+
+import pytest
+
+import SortingVisualizer as sv
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return sv.TraceCache(str(tmp_path / 'traces'))
+
+
+def record(choice, values):
+    return sv.record_trace(sv.get_algorithm_function(choice), values)
+
+
+def test_store_and_load_round_trip(cache):
+    values = sv.generate_workload('random', 100, random.Random(16))
+    trace = record('4', values)
+    
+    assert cache.load('4', values) is None
+    assert cache.store('4', values, None, trace, median_ns=250.0)
+    loaded, median_ns = cache.load('4', values)
+    assert median_ns == 250.0
+    assert loaded.operation_count == trace.operation_count
+    assert list(loaded.final_array()) == sorted(values)
+    assert loaded.frame(len(trace) // 2) == trace.frame(len(trace) // 2)
+
+
+def test_key_covers_algorithm_input_and_keyframe_interval(cache):
+    values = [3, 1, 2]
+    paths = {cache.path('4', values), cache.path('5', values), cache.path('4', [3, 2, 1]),
+             cache.path('4', values, 64), cache.path('4', values + [0])}
+    assert len(paths) == 5
+    assert cache.path('4', values) == cache.path('4', list(values))
+
+
+def test_least_recently_used_traces_are_evicted(cache):
+    inputs = [sv.generate_workload('random', 200, random.Random(seed)) for seed in range(3)]
+    for values in inputs[:2]:
+        assert cache.store('11', values, None, record('11', values))
+    entry_size = cache.size // 2
+    cache.max_bytes = 2 * entry_size + entry_size // 2
+    
+    # Touch the older entry so the newer one becomes the least recently used
+    first_path = cache.path('11', inputs[0])
+    os.utime(cache.path('11', inputs[1]), (1, 1))
+    assert cache.load('11', inputs[0]) is not None
+    
+    assert cache.store('11', inputs[2], None, record('11', inputs[2]))
+    assert os.path.exists(first_path)
+    assert cache.load('11', inputs[1]) is None
+    assert cache.load('11', inputs[2]) is not None
+    assert cache.size <= cache.max_bytes
+
+
+def test_traces_larger_than_the_cache_are_not_stored(cache):
+    values = sv.generate_workload('random', 100, random.Random(17))
+    cache.max_bytes = 10
+    assert not cache.store('1', values, None, record('1', values))
+    assert cache.size == 0
+
+
+@pytest.mark.parametrize('damage', [lambda data: data[:-3], lambda data: b'junk' + data[4:], lambda data: b''])
+def test_damaged_entries_are_misses_and_removed(cache, damage):
+    values = [5, 4, 3, 2, 1]
+    cache.store('3', values, None, record('3', values))
+    path = cache.path('3', values)
+    with open(path, 'rb') as handle:
+        data = handle.read()
+    with open(path, 'wb') as handle:
+        handle.write(damage(data))
+    
+    assert cache.load('3', values) is None
+    assert not os.path.exists(path)
+
+
+def test_clear(cache):
+    for choice in ('1', '2', '3'):
+        cache.store(choice, [2, 1], None, record(choice, [2, 1]))
+    assert cache.clear() == 3
+    assert cache.size == 0
+
+
+def test_default_directory_honours_the_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv('SORTING_VISUALIZER_CACHE', str(tmp_path / 'custom'))
+    assert sv.TraceCache().directory == str(tmp_path / 'custom')
+    
+    monkeypatch.delenv('SORTING_VISUALIZER_CACHE')
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'xdg'))
+    assert sv.default_trace_cache_directory() == str(tmp_path / 'xdg' / 'sorting-visualizer' / 'traces')
+
+
+def test_visualizer_reuses_cached_traces(cache, monkeypatch):
+    first = sv.SortingVisualizer(40, seed=18, trace_cache=cache)
+    first._plan_animation('4', '11', sv.ALGORITHM_NAMES)
+    
+    def fail(*args, **kwargs):
+        raise AssertionError("cached traces should not be recorded again")
+    monkeypatch.setattr(sv, 'record_traces', fail)
+    monkeypatch.setattr(sv, 'time_algorithm', fail)
+    second = sv.SortingVisualizer(40, seed=18, trace_cache=cache)
+    plans, frame_count, _ = second._plan_animation('4', '11', sv.ALGORITHM_NAMES)
+    assert [plan['name'] for plan in plans] == ['Quick Sort', 'Merge Sort']
+
+
+def test_cli_clear_cache(tmp_path, capsys):
+    cache = sv.TraceCache(str(tmp_path))
+    cache.store('1', [2, 1], None, record('1', [2, 1]))
+    sv.main(['--cache-dir', str(tmp_path), '--clear-cache'])
+    assert cache.size == 0
+    assert 'Removed 1 cached trace' in capsys.readouterr().out
+
+
+def test_unseeded_random_input_writes_nothing(cache):
+    visualizer = sv.SortingVisualizer(40, trace_cache=cache)
+    assert visualizer.trace_cache is None
+    visualizer._plan_animation('4', '11', sv.ALGORITHM_NAMES)
+    assert cache.size == 0
+
+
+@pytest.mark.parametrize('workload', sv.SEEDLESS_WORKLOADS)
+def test_seedless_workloads_are_cached(cache, workload):
+    sv.SortingVisualizer(40, workload=workload, trace_cache=cache)._plan_animation('4', '4', sv.ALGORITHM_NAMES)
+    assert cache.size > 0
+    assert sv.generate_workload(workload, 40, random.Random(1)) == sv.generate_workload(workload, 40,
+                                                                                        random.Random(2))
+
+
+def test_export_caches_only_seeded_runs(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    command = ['--cache-dir', str(cache_dir), 'export', 'merge', 'quick', '-n', '12', '-f', 'png',
+               '--fps', '2', '--dpi', '20', '-j', '1']
+    sv.main(command + ['-o', str(tmp_path / 'unseeded')])
+    assert sv.TraceCache(str(cache_dir)).size == 0
+    
+    sv.main(command + ['-o', str(tmp_path / 'seeded'), '-s', '4'])
+    assert sv.TraceCache(str(cache_dir)).size > 0
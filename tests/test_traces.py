@@ -0,0 +1,147 @@
+import random
+from array import array
+
+import pytest
+
+import SortingVisualizer as sv
+
+FULL_SORTS = [choice for choice in sv.ALGORITHM_NAMES
+              if choice not in sv.SELECTION_ALGORITHMS + sv.BOUNDED_ALGORITHMS]
+
+
+def replay_naively(trace):
+    """Apply every operation to a plain list, one frame at a time."""
+    current = list(trace.initial_array)
+    frames = []
+    for k in range(trace.operation_count):
+        op_code, arg1, arg2 = trace.op_codes[k], trace.op_args1[k], trace.op_args2[k]
+        if op_code == sv.OP_SWAP:
+            current[arg1], current[arg2] = current[arg2], current[arg1]
+        elif op_code == sv.OP_WRITE:
+            current[arg1] = arg2
+        frames.append(list(current))
+    frames.append(list(current))
+    return frames
+
+
+@pytest.mark.parametrize('choice', FULL_SORTS)
+def test_trace_replays_to_sorted_array(choice):
+    values = sv.generate_workload('random', 60, random.Random(3))
+    trace = sv.record_trace(sv.get_algorithm_function(choice), values)
+    
+    assert list(trace.initial_array) == values
+    assert list(trace.final_array()) == sorted(values)
+    assert len(trace) == trace.operation_count + 1
+
+
+def test_trace_stores_operations_not_snapshots():
+    values = sv.generate_workload('random', 200, random.Random(4))
+    trace = sv.record_trace(sv.get_algorithm_function('1'), values, keyframe_interval=10 ** 9)
+    
+    # Three parallel buffers of one entry per operation, plus the single initial array
+    assert trace.nbytes == 17 * trace.operation_count + 2 * 8 * len(values)
+    assert isinstance(trace.op_codes, array)
+
+
+def test_frame_highlights_the_operation_indices():
+    trace = sv.OperationTrace([3, 1, 2])
+    trace.append(sv.OP_COMPARE, 0, 1)
+    trace.append(sv.OP_SWAP, 0, 1)
+    trace.append(sv.OP_WRITE, 2, 9)
+    trace.append(sv.OP_META_COMPARES, 5, 0)
+    
+    assert len(trace) == 4
+    assert trace.frame(0) == (array('q', [3, 1, 2]), 0, 1)
+    assert trace.frame(1) == (array('q', [1, 3, 2]), 0, 1)
+    assert trace.frame(2) == (array('q', [1, 3, 9]), 2, -1)
+    assert trace.frame(3) == (array('q', [1, 3, 9]), -1, -1)
+    assert trace.counts.comparisons == 6
+
+
+def test_iter_frames_matches_naive_replay():
+    values = sv.generate_workload('random', 40, random.Random(5))
+    trace = sv.record_trace(sv.get_algorithm_function('11'), values)
+    
+    frames = [list(frame) for frame, _, _ in trace.replayer().iter_frames()]
+    assert frames == replay_naively(trace)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    values = sv.generate_workload('random', 80, random.Random(6))
+    trace = sv.record_trace(sv.get_algorithm_function('4'), values, keyframe_interval=16)
+    path = str(tmp_path / 'quick.trace')
+    trace.save(path, median_ns=1234.5)
+    
+    loaded, median_ns = sv.OperationTrace.load(path)
+    assert median_ns == 1234.5
+    assert loaded.operation_count == trace.operation_count
+    assert list(loaded.final_array()) == sorted(values)
+    for field in sv.OperationCounts.__slots__:
+        assert getattr(loaded.counts, field) == getattr(trace.counts, field)
+
+
+def test_load_rejects_truncated_file(tmp_path):
+    trace = sv.record_trace(sv.get_algorithm_function('3'), [3, 2, 1])
+    path = tmp_path / 'short.trace'
+    trace.save(str(path))
+    path.write_bytes(path.read_bytes()[:-1])
+    
+    with pytest.raises(ValueError):
+        sv.OperationTrace.load(str(path))
+
+
+@pytest.mark.parametrize('interval', [1, 7, 64])
+def test_random_seeks_match_sequential_replay(interval):
+    values = sv.generate_workload('random', 50, random.Random(7))
+    trace = sv.record_trace(sv.get_algorithm_function('5'), values, keyframe_interval=interval)
+    expected = replay_naively(trace)
+    replayer = trace.replayer()
+    
+    order = list(range(len(trace)))
+    random.Random(8).shuffle(order)
+    for index in order:
+        frame, _, _ = replayer.seek(index)
+        assert list(frame) == expected[index]
+
+
+def test_keyframes_snapshot_every_interval():
+    values = sv.generate_workload('reversed', 30, random.Random(9))
+    trace = sv.record_trace(sv.get_algorithm_function('3'), values, keyframe_interval=25)
+    trace.build_keyframes()
+    expected = replay_naively(trace)
+    
+    assert trace.keyframe_count == trace.operation_count // 25 + 1
+    assert list(trace.keyframe(0)) == values
+    for index in range(1, trace.keyframe_count):
+        assert list(trace.keyframe(index)) == expected[index * 25 - 1]
+
+
+def test_keyframes_extend_as_a_trace_grows():
+    trace = sv.OperationTrace([2, 1, 0], keyframe_interval=2)
+    trace.append(sv.OP_SWAP, 0, 2)
+    trace.append(sv.OP_COMPARE, 0, 1)
+    trace.build_keyframes()
+    trace.append(sv.OP_SWAP, 0, 1)
+    trace.append(sv.OP_SWAP, 0, 1)
+    
+    assert trace.frame(3)[0] == array('q', [0, 1, 2])
+    assert trace.keyframe_count == 3
+
+
+def test_seek_clamps_out_of_range_indices():
+    trace = sv.record_trace(sv.get_algorithm_function('1'), [2, 1])
+    replayer = trace.replayer()
+    
+    assert replayer.seek(10 ** 6) == (array('q', [1, 2]), -1, -1)
+    assert list(replayer.seek(-5)[0]) == [2, 1]
+
+
+def test_auto_keyframe_interval_bounds_snapshot_memory():
+    assert sv.auto_keyframe_interval(100, 10) == sv.DEFAULT_KEYFRAME_INTERVAL
+    interval = sv.auto_keyframe_interval(10 ** 9, 10 ** 5)
+    assert (10 ** 9 // interval) * 8 * 10 ** 5 <= sv.KEYFRAME_MEMORY_BUDGET
+
+
+def test_invalid_keyframe_interval_is_rejected():
+    with pytest.raises(ValueError):
+        sv.OperationTrace([1, 2], keyframe_interval=0)
@@ -0,0 +1,64 @@
+import random
+from array import array
+
+import numpy as np
+import pytest
+
+import SortingVisualizer as sv
+
+CHOICES = [choice for choice in sv.ALGORITHM_NAMES if choice not in sv.BOUNDED_ALGORITHMS]
+VALUES = sv.generate_workload('random', 90, random.Random(21))
+
+
+def typed_inputs():
+    return {
+        "array('q')": array('q', VALUES),
+        "array('i')": array('i', VALUES),
+        'int64': np.array(VALUES, dtype=np.int64),
+        'int32': np.array(VALUES, dtype=np.int32),
+        'strided': np.array([value for value in VALUES for _ in range(2)], dtype=np.int64)[::2],
+    }
+
+
+@pytest.mark.parametrize('choice', CHOICES)
+@pytest.mark.parametrize('kind', list(typed_inputs()))
+def test_fast_sorts_return_the_input_type(choice, kind):
+    typed = typed_inputs()[kind]
+    before = list(typed)
+    expected = sv.get_algorithm_function(choice, fast=True)(list(VALUES))
+    result = sv.get_algorithm_function(choice, fast=True)(typed)
+    
+    assert list(result) == list(expected)
+    assert list(typed) == before
+    if isinstance(typed, array):
+        assert isinstance(result, array) and result.typecode == typed.typecode
+    else:
+        assert isinstance(result, np.ndarray) and result.dtype == typed.dtype
+
+
+@pytest.mark.parametrize('choice', CHOICES)
+@pytest.mark.parametrize('kind', ["array('i')", 'strided'])
+def test_generators_yield_the_same_operations(choice, kind):
+    generator = sv.get_algorithm_function(choice)
+    assert list(generator(typed_inputs()[kind])) == list(generator(list(VALUES)))
+
+
+def test_working_copy_keeps_buffers_unboxed():
+    assert sv._working_copy(array('h', [3, 1])).typecode == 'h'
+    assert sv._working_copy(np.array([3, 1], dtype=np.uint8)).typecode == 'B'
+    assert isinstance(sv._working_copy((3, 1)), list)
+    # Floats and 2-D buffers fall back to lists
+    assert isinstance(sv._working_copy(np.array([1.5, 0.5])), list)
+    assert sv._buffer_typecode(np.zeros((2, 2), dtype=np.int64)) is None
+
+
+def test_visualizer_and_frames_use_int64_buffers():
+    visualizer = sv.SortingVisualizer(30, seed=22, trace_cache=None)
+    assert isinstance(visualizer.initial_array, array) and visualizer.initial_array.typecode == 'q'
+    
+    trace = sv.record_trace(sv.get_algorithm_function('4'), visualizer.initial_array)
+    replayer = trace.replayer()
+    frame, _, _ = replayer.seek(len(trace) // 2)
+    assert frame is replayer.array and frame.typecode == 'q'
+    assert trace.frame(0)[0].typecode == 'q'
+    assert list(trace.final_array()) == sorted(visualizer.initial_array)
@@ -0,0 +1,72 @@
+import math
+import random
+from collections import Counter
+
+import pytest
+
+import SortingVisualizer as sv
+
+PERMUTATIONS = ['random', 'sorted', 'reversed', 'k-sorted', 'organ-pipe', 'quick-killer']
+
+
+@pytest.mark.parametrize('kind', list(sv.WORKLOAD_NAMES))
+@pytest.mark.parametrize('n', [0, 1, 2, 100])
+def test_every_workload_has_n_values_in_range(kind, n):
+    values = sv.generate_workload(kind, n, random.Random(1))
+    assert len(values) == n
+    assert all(1 <= value <= n for value in values)
+
+
+@pytest.mark.parametrize('kind', PERMUTATIONS)
+def test_permutation_workloads(kind):
+    assert sorted(sv.generate_workload(kind, 257, random.Random(2))) == list(range(1, 258))
+
+
+@pytest.mark.parametrize('kind', list(sv.WORKLOAD_NAMES))
+def test_workloads_are_reproducible_from_a_seed(kind):
+    assert sv.generate_workload(kind, 300, random.Random(3)) == sv.generate_workload(kind, 300, random.Random(3))
+
+
+def test_shapes():
+    assert sv.generate_workload('sorted', 5) == [1, 2, 3, 4, 5]
+    assert sv.generate_workload('reversed', 5) == [5, 4, 3, 2, 1]
+    assert sv.generate_workload('organ-pipe', 6) == [1, 3, 5, 6, 4, 2]
+    assert sv.generate_workload('sawtooth', 16) == [4, 8, 12, 16] * 4
+
+
+def test_k_sorted_elements_stay_near_their_place():
+    n = 400
+    values = sv.generate_workload('k-sorted', n, random.Random(4))
+    assert max(abs(value - 1 - index) for index, value in enumerate(values)) < math.isqrt(n)
+    assert values != sorted(values)
+
+
+def test_duplicate_heavy_workloads():
+    few = sv.generate_workload('few-unique', 1000, random.Random(5))
+    assert len(set(few)) <= 8
+    
+    zipf = Counter(sv.generate_workload('zipf', 1000, random.Random(6)))
+    assert zipf.most_common(1)[0][0] == 1
+    assert len(zipf) < 1000 / 2
+
+
+def test_quicksort_killer_makes_quick_sort_quadratic():
+    n = 400
+    killer = sv.generate_workload('quick-killer', n)
+    shuffled = sv.generate_workload('random', n, random.Random(7))
+    quick = sv.get_algorithm_function('4')
+    
+    assert sv.count_operations(quick, killer).comparisons >= 0.9 * n * n / 2
+    assert sv.count_operations(quick, shuffled).comparisons < 0.1 * n * n / 2
+
+
+def test_introsort_survives_its_own_killer():
+    n = 300
+    killer = sv.quicksort_killer(n, sv.SortingAlgorithms.intro_sort)
+    assert sorted(killer) == list(range(1, n + 1))
+    assert sv.count_operations(sv.get_algorithm_function('13'), killer).comparisons < 0.25 * n * n / 2
+
+
+def test_unknown_workload():
+    with pytest.raises(ValueError, match='Unknown workload'):
+        sv.generate_workload('bitonic', 10)